@@ -24,6 +24,7 @@ from contextlib import asynccontextmanager
 from datetime import timedelta, datetime
 from typing import AsyncIterator, Any
 
+import anyio
 import httpx
 import psutil
 from acp_sdk.client import Client
@@ -140,15 +141,18 @@ async def resolve_connection_error():
 
 async def wait_for_agents(initial_delay_seconds=5, wait_seconds=180):
     time.sleep(initial_delay_seconds)
-    for i in range(wait_seconds):
-        time.sleep(1)
-        if all(
-            item["status"] in ["ready", "installing", "not_installed", "running"]
-            for item in (await api_request("get", "providers"))["items"]
-        ):
-            return True
-    else:
-        return False
+    statuses = {}
+    with anyio.move_on_after(wait_seconds):
+        # the first event contains all providers, following events only the changed ones
+        async for delta in api_stream("get", "providers/watch"):
+            if delta["reset"]:
+                statuses = {}
+            statuses.update({item["id"]: item["status"] for item in delta["updated"]})
+            for provider_id in delta["removed"]:
+                statuses.pop(provider_id, None)
+            if all(status in ["ready", "installing", "not_installed", "running"] for status in statuses.values()):
+                return True
+    return False
 
 
 async def wait_for_api(initial_delay_seconds=5, wait_seconds=300):
@@ -200,7 +204,7 @@ async def api_stream(
                     response.raise_for_status()
                 raise HTTPStatusError(message=error, request=response.request, response=response)
             async for line in response.aiter_lines():
-                if line:
+                if line and not line.startswith(("id:", "event:", "retry:", ":")):
                     yield jsonlib.loads(re.sub("^data:", "", line).strip())
 
 
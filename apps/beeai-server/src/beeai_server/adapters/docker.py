@@ -14,40 +14,340 @@
 
 import asyncio
 import base64
+import hashlib
+import heapq
+import io
+import itertools
+import json
 import logging
+import shutil
+import struct
+import time
 import uuid
 from contextlib import asynccontextmanager, suppress, AsyncExitStack
 from datetime import timedelta
-from typing import Iterable, AsyncGenerator
+from typing import AsyncIterator, Awaitable, Callable, Iterable, AsyncGenerator
 
 import aiohttp
 import anyio
 import anyio.to_thread
-from httpx import HTTPError as HttpxHTTPError
 from aiodocker import Docker, DockerError
-from aiohttp.web_exceptions import HTTPError as AioHTTPError
+from aiodocker.events import DockerEvents
+from aiodocker.jsonstream import json_stream_stream
+from aiodocker.utils import mktar_from_dockerfile
 from httpx import AsyncClient
-from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_fixed, stop_after_delay
+from opentelemetry.metrics import get_meter
+from tenacity import AsyncRetrying, retry_if_exception, retry_if_exception_type, stop_after_attempt, wait_fixed
 
-from beeai_server.adapters.interface import IContainerBackend
-from beeai_server.configuration import Configuration, OCIRegistryConfiguration
+from beeai_server.adapters.interface import ContainerUsage, IContainerBackend
+from beeai_server.configuration import (
+    Configuration,
+    ContainerLifecycleMode,
+    ContainerResources,
+    OCIRegistryConfiguration,
+)
 from beeai_server.custom_types import ID
 from beeai_server.domain.constants import DOCKER_MANIFEST_LABEL_NAME
-from beeai_server.exceptions import retry_if_exception_grp_type
-from beeai_server.utils.docker import DockerImageID, replace_localhost_url
-from beeai_server.utils.github import ResolvedGithubUrl
-from beeai_server.utils.logs_container import LogsContainer
+from beeai_server.exceptions import ContainerNotReadyError
+from beeai_server.telemetry import INSTRUMENTATION_NAME
+from beeai_server.utils.docker import DockerImageID, PullPriority, pull_priority, replace_localhost_url
+from beeai_server.utils.github import ResolvedGithubUrl, create_tar_reproducible, download_repo
+from beeai_server.utils.logs_container import LogRecord, LogsContainer, ProcessLogType
 from beeai_server.utils.process import find_free_port
 from beeai_server.utils.utils import cancel_task, extract_messages
 
 logger = logging.getLogger(__name__)
 
+meter = get_meter(INSTRUMENTATION_NAME)
+container_startup_time = meter.create_histogram(
+    "container_startup_time", unit="s", description="Time from container start until it serves its port"
+)
+
+container_open_time = meter.create_histogram(
+    "container_open_time",
+    unit="s",
+    description="Time from opening a provider container until it serves its port, by lifecycle action",
+)
+
+_CONFIG_HASH_LABEL = "beeai.config-hash"
+
+_EXIT_EVENTS = {"die", "oom", "destroy"}
+_CONNECTION_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, ConnectionError)
+
+
+def is_connection_error(ex: BaseException) -> bool:
+    # aiodocker wraps connection errors into DockerError with status 900
+    return isinstance(ex, _CONNECTION_ERRORS) or (isinstance(ex, DockerError) and ex.status == 900)
+
+
+@asynccontextmanager
+async def _stream_api(docker: Docker, path: str, params: dict[str, str]) -> AsyncIterator[aiohttp.ClientResponse]:
+    """
+    Raw streaming response of a docker API endpoint.
+
+    The public aiodocker streams do not fit: DockerEvents does not tell when the stream is connected and
+    DockerContainer.log decodes and splits the output line by line. Docker._query is private API, aiodocker is
+    pinned to 0.24.x in pyproject.toml, check this helper when upgrading it.
+    """
+    async with docker._query(path, method="GET", params=params, timeout=0) as response:
+        yield response
+
+
+async def probe_http_port(port: int, timeout: float = 1, host: str = "localhost") -> bool:
+    """
+    Check that a server listens on the published port and responds.
+
+    Docker userland proxy accepts connections on published ports even before the process inside the container
+    listens, so an accepted connection is not enough. The connection is closed by the proxy without any data in
+    that case.
+    """
+    with anyio.move_on_after(timeout):
+        try:
+            async with await anyio.connect_tcp(host, port) as stream:
+                await stream.send(f"GET /agents HTTP/1.0\r\nHost: {host}\r\n\r\n".encode())
+                return bool(await stream.receive(1))
+        except (OSError, anyio.EndOfStream, anyio.BrokenResourceError):
+            return False
+    return False
+
+
+class DockerLogDecoder:
+    """
+    Incremental decoder of the docker logs stream.
+
+    Non-tty containers multiplex stdout and stderr into frames with an 8-byte header (stream type and payload
+    length). Payloads are split into lines in bulk and incomplete lines are kept until the next chunk arrives.
+    """
+
+    _HEADER = struct.Struct(">BxxxL")
+    _STREAMS = {1: ProcessLogType.stdout, 2: ProcessLogType.stderr}
+    MAX_LINE_BYTES = 64 * 1024
+
+    def __init__(self, multiplexed: bool = True):
+        self._multiplexed = multiplexed
+        self._buffer = bytearray()
+        self._partial: dict[ProcessLogType, bytes] = {}
+
+    def feed(self, data: bytes) -> list[LogRecord]:
+        now = time.time()
+        if not self._multiplexed:
+            return self._split(ProcessLogType.stdout, data, now)
+        records = []
+        buffer = self._buffer
+        buffer += data
+        offset, header_size = 0, self._HEADER.size
+        while len(buffer) - offset >= header_size:
+            stream_type, length = self._HEADER.unpack_from(buffer, offset)
+            end = offset + header_size + length
+            if len(buffer) < end:
+                break
+            stream = self._STREAMS.get(stream_type, ProcessLogType.stdout)
+            records += self._split(stream, bytes(buffer[offset + header_size : end]), now)
+            offset = end
+        del buffer[:offset]
+        return records
+
+    def flush(self) -> list[LogRecord]:
+        now = time.time()
+        records = [self._record(stream, line, now) for stream, line in self._partial.items() if line.strip()]
+        self._partial.clear()
+        return records
+
+    def _split(self, stream: ProcessLogType, data: bytes, now: float) -> list[LogRecord]:
+        if partial := self._partial.pop(stream, None):
+            data = partial + data
+        *lines, rest = data.split(b"\n")
+        if len(rest) > self.MAX_LINE_BYTES:
+            lines.append(rest)
+        elif rest:
+            self._partial[stream] = rest
+        return [self._record(stream, line, now) for line in lines if line.strip()]
+
+    @staticmethod
+    def _record(stream: ProcessLogType, line: bytes, now: float) -> LogRecord:
+        return LogRecord(stream=stream, message=line.decode(errors="replace").rstrip("\r"), time=now)
+
+
+class ImageMetadataCache:
+    """
+    Image inspection results keyed by image id, image references (name:tag) are resolved to ids separately.
+
+    Image content behind an id never changes, so only the reference mapping needs invalidation: references are
+    dropped on any image event which may move a tag (pull, tag, load, import) and images with their references
+    on untag and delete. The cache must only be used while the image event stream is connected.
+    """
+
+    _RETAG_ACTIONS = {"pull", "tag", "load", "import"}
+    _REMOVE_ACTIONS = {"untag", "delete"}
+
+    def __init__(self):
+        self.connected = False
+        self.generation = 0
+        self._refs: dict[str, str | None] = {}  # reference -> image id, None for missing images
+        self._images: dict[str, dict] = {}  # image id -> inspect result
+
+    def get(self, ref: str) -> tuple[bool, dict | None]:
+        """:return: (hit, image info or None if the image is known to be missing)"""
+        if not self.connected or ref not in self._refs:
+            return False, None
+        image_id = self._refs[ref]
+        if image_id is None:
+            return True, None
+        if image := self._images.get(image_id, None):
+            return True, image
+        return False, None
+
+    def put(self, ref: str, image: dict | None, generation: int) -> None:
+        if not self.connected or generation != self.generation:
+            return  # an event arrived during the inspection, the result may be stale
+        if image is None:
+            self._refs[ref] = None
+        else:
+            self._images[image["Id"]] = image
+            self._refs[ref] = image["Id"]
+
+    def forget(self, ref: str) -> None:
+        self.generation += 1
+        self._refs.pop(ref, None)
+
+    def invalidate(self, event: dict) -> None:
+        self.generation += 1
+        action = event.get("Action", "")
+        if action in self._RETAG_ACTIONS:
+            self._refs.clear()
+        elif action in self._REMOVE_ACTIONS:
+            image_id = event.get("id", None) or event.get("Actor", {}).get("ID", None)
+            self._refs = {ref: id for ref, id in self._refs.items() if id and id != image_id}
+            if action == "delete":
+                self._images.pop(image_id, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._refs.clear()
+        self._images.clear()
+
+
+class PullJob:
+    def __init__(self, image: DockerImageID, priority: PullPriority):
+        self.image = image
+        self.priority = priority
+        self.task: asyncio.Task | None = None
+        self.slot: asyncio.Future[None] | None = None
+        self.progress: list[str] = []
+        self.logs_containers: set[LogsContainer] = set()
+
+    def add_progress(self, message: str):
+        self.progress.append(message)
+        for logs_container in list(self.logs_containers):
+            logs_container.add_stdout(message)
+
+    def subscribe(self, logs_container: LogsContainer | None):
+        if logs_container and logs_container not in self.logs_containers:
+            for message in self.progress:  # replay progress for late joiners
+                logs_container.add_stdout(message)
+            self.logs_containers.add(logs_container)
+
+
+class PullScheduler:
+    """
+    Runs image pulls with a global concurrency cap:
+      - concurrent pulls of the same image share one pull and its progress (single-flight)
+      - queued pulls start in priority order, user installs before background preinstall
+    """
+
+    def __init__(
+        self, pull: Callable[[DockerImageID, Callable[[str], None]], Awaitable[None]], max_concurrent_pulls: int
+    ):
+        self._pull = pull
+        self.max_concurrent_pulls = max_concurrent_pulls
+        self.active = 0
+        self.jobs: dict[str, PullJob] = {}
+        self._queue: list[tuple[PullPriority, int, PullJob]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for job in self.jobs.values() if job.slot and not job.slot.done())
+
+    def _enqueue(self, job: PullJob):
+        heapq.heappush(self._queue, (job.priority, next(self._sequence), job))
+
+    async def _acquire_slot(self, job: PullJob):
+        if self.active < self.max_concurrent_pulls and not self._queue:
+            self.active += 1
+            return
+        job.slot = asyncio.get_running_loop().create_future()
+        self._enqueue(job)
+        await job.slot
+
+    def _release_slot(self):
+        while self._queue:
+            priority, _, job = heapq.heappop(self._queue)
+            if priority == job.priority and not job.slot.done():  # skip entries superseded by a priority change
+                job.slot.set_result(None)  # the slot moves to the next job
+                return
+        self.active -= 1
+
+    async def _run(self, job: PullJob):
+        try:
+            await self._acquire_slot(job)
+        except asyncio.CancelledError:
+            if job.slot and job.slot.done() and not job.slot.cancelled():
+                self._release_slot()
+            raise
+        try:
+            await self._pull(job.image, job.add_progress)
+        finally:
+            self._release_slot()
+
+    async def pull(self, image: DockerImageID, logs_container: LogsContainer | None = None) -> None:
+        priority = pull_priority.get()
+        if job := self.jobs.get(str(image), None):
+            logger.info(f"Joining pull of {image} in progress")
+            if priority < job.priority:
+                job.priority = priority
+                if job.slot and not job.slot.done():
+                    self._enqueue(job)  # requeue with the higher priority, the old entry is skipped
+        else:
+            job = self.jobs[str(image)] = PullJob(image, priority)
+            job.task = asyncio.create_task(self._run(job))
+            job.task.add_done_callback(lambda _: self.jobs.pop(str(image), None))
+        job.subscribe(logs_container)
+        try:
+            # Waiters share the pull, a cancelled waiter does not cancel it for the others
+            await asyncio.shield(job.task)
+        finally:
+            if logs_container:
+                job.logs_containers.discard(logs_container)
+
 
 class DockerContainerBackend(IContainerBackend):
     def __init__(self, *, docker_host: str, configuration: Configuration) -> None:
         self.configuration = configuration
         self._docker_host = docker_host
         self._extra_hosts = []
+        self._client: Docker | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._image_cache = ImageMetadataCache()
+        self._pull_scheduler = PullScheduler(
+            pull=self._pull_image, max_concurrent_pulls=configuration.image_pull.max_concurrent_pulls
+        )
+        self._image_events_task: asyncio.Task | None = None
+        self._opened_containers: dict[ID, tuple[float, str]] = {}  # container id -> (open start, action)
+        self._build_context_locks: dict[str, anyio.Lock] = {}
+
+    async def __aenter__(self) -> "DockerContainerBackend":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        await cancel_task(self._image_events_task)
+        self._image_events_task = None
+        if client := self._client:
+            self._client = self._client_loop = None
+            await client.close()
 
     def _get_auth_header(self, destination: DockerImageID) -> dict | None:
         config: OCIRegistryConfiguration = self.configuration.oci_registry[destination.registry]
@@ -56,7 +356,7 @@ class DockerContainerBackend(IContainerBackend):
     async def configure_host_docker_internal(self):
         """Set extra_hosts if `host.docker.internal` is not configured for containers."""
 
-        async with self._docker as docker:
+        async with self._docker() as docker:
             alpine = "alpine:3.21.3"
             try:
                 await docker.images.inspect(alpine)
@@ -81,20 +381,22 @@ class DockerContainerBackend(IContainerBackend):
         logs_container: LogsContainer | None = None,
     ) -> DockerImageID:
         logs_container = logs_container or LogsContainer()
-        path = f":{github_url.path}" if github_url.path else ""
         tag = (
             str(destination)
             if destination
             else f"{github_url.org}/{github_url.repo}/{github_url.path}:{github_url.version}"
         )
-        remote = f"https://github.com/{github_url.org}/{github_url.repo}.git#{github_url.version}{path}"
         tmp_image = uuid.uuid4().hex
-        async with self._docker as docker:
+        logs_container.add_stdout(f"ℹ️ Preparing build context for commit {github_url.commit_hash}")
+        context_path = await self._prepare_build_context(github_url)
+        async with self._docker() as docker:
             logs_container.add_stdout("ℹ️ Building image")
-            async for message in docker.images.build(remote=remote, tag=tmp_image, stream=True):
-                text = message["stream"] if "stream" in message else str(message)
-                if text.strip():
-                    logs_container.add_stdout(text)
+            async with await context_path.open("rb") as context:
+                build = docker.images.build(fileobj=context.wrapped, encoding="identity", tag=tmp_image, stream=True)
+                async for message in build:
+                    text = message["stream"] if "stream" in message else str(message)
+                    if text.strip():
+                        logs_container.add_stdout(text)
             logs_container.add_stdout("ℹ️ Extracting agents")
             host_port = await find_free_port()
             container = await docker.containers.create_or_replace(
@@ -111,18 +413,13 @@ class DockerContainerBackend(IContainerBackend):
             )
             try:
                 await container.start()
-                async for attempt in AsyncRetrying(
-                    stop=stop_after_delay(timedelta(seconds=30)),
-                    wait=wait_fixed(timedelta(seconds=0.5)),
-                    retry=retry_if_exception_grp_type(HttpxHTTPError),
-                    reraise=True,
-                ):
-                    with attempt:
-                        async with AsyncClient() as client:
-                            resp = await client.get(f"http://localhost:{host_port}/agents", timeout=1)
+                await self.wait_for_ready(container_id=container.id, host_port=host_port, image=tag)
+                async with AsyncClient() as client:
+                    resp = await client.get(f"http://localhost:{host_port}/agents", timeout=5)
+                    resp.raise_for_status()
                 labels = {DOCKER_MANIFEST_LABEL_NAME: base64.b64encode(resp.content).decode()}
                 logs_container.add_stdout("ℹ️ Adding extracted labels to image")
-                await docker.images.build(remote=remote, tag=tag, labels=labels)
+                await self._label_image(docker, image=tmp_image, tag=tag, labels=labels)
                 logs_container.add_stdout(f"✅ Successfully built image: {tag}")
             except Exception as e:
                 message = f"Error when extracting labels out of image: {extract_messages(e)}"
@@ -132,63 +429,303 @@ class DockerContainerBackend(IContainerBackend):
             finally:
                 with suppress(DockerError):
                     await container.delete(force=True)
+                with suppress(DockerError):
+                    # Only the temporary tag is removed, parent layers stay as build cache for the next version
+                    await docker.images.delete(tmp_image, noprune=True)
 
         return DockerImageID(root=tag)
 
+    @asynccontextmanager
+    async def _build_context_lock(self, context_id: str) -> AsyncIterator[None]:
+        lock = self._build_context_locks.setdefault(context_id, anyio.Lock())
+        try:
+            async with lock:
+                yield
+        finally:
+            # release hands the lock over to the next waiter, drop it only when nobody holds or waits for it
+            if not lock.locked() and not lock.statistics().tasks_waiting:
+                self._build_context_locks.pop(context_id, None)
+
+    async def _prepare_build_context(self, github_url: ResolvedGithubUrl) -> anyio.Path:
+        """
+        Return a cached tar of the build context of a resolved GitHub url.
+
+        Sources are downloaded once per commit and the context is archived once per commit and path, both are kept
+        in the cache directory across restarts. The archive is reproducible, so docker reuses cached layers for
+        all build steps whose inputs did not change between two versions of the agent.
+        """
+        cache_dir = anyio.Path(self.configuration.cache_dir) / "github"
+        context_id = f"{github_url.org}_{github_url.repo}_{github_url.commit_hash}"
+        if github_url.path:
+            context_id += f"_{github_url.path.replace('/', '_')}"
+        context_path = cache_dir / "contexts" / f"{context_id}.tar"
+        async with self._build_context_lock(context_id):
+            if not await context_path.is_file():
+                repo_path = await download_repo(cache_dir / "repos", github_url)
+                source_dir = await (repo_path / (github_url.path or "")).resolve()
+                if not source_dir.is_relative_to(await repo_path.resolve()) or not await source_dir.is_dir():
+                    raise ValueError(f"Path {github_url.path} is not a directory in {github_url}")
+                await context_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = context_path.with_suffix(".tmp")
+                await anyio.to_thread.run_sync(create_tar_reproducible, source_dir, tmp_path)
+                await tmp_path.rename(context_path)
+            await context_path.touch()
+        await self._evict_build_cache(cache_dir)
+        return context_path
+
+    async def _evict_build_cache(self, cache_dir: anyio.Path):
+        max_entries = self.configuration.github_build_cache.max_cached_commits
+        for directory in (cache_dir / "repos", cache_dir / "contexts"):
+            if not await directory.is_dir():
+                continue
+            entries = {
+                entry: (await entry.stat()).st_mtime
+                async for entry in directory.iterdir()
+                if not entry.name.endswith(("_tmp", ".tmp"))
+            }
+            for entry in sorted(entries, key=entries.get, reverse=True)[max_entries:]:
+                with suppress(OSError):
+                    if await entry.is_dir():
+                        await anyio.to_thread.run_sync(shutil.rmtree, str(entry))
+                    else:
+                        await entry.unlink()
+
+    async def _label_image(self, docker: Docker, *, image: str, tag: str, labels: dict[str, str]):
+        """Tag an existing image with additional labels, without fetching or building the source again."""
+        context = mktar_from_dockerfile(io.BytesIO(f"FROM {image}\n".encode()))
+        try:
+            await docker.images.build(fileobj=context, encoding="gzip", tag=tag, labels=labels)
+        finally:
+            context.close()
+            self._image_cache.forget(tag)
+
+    async def _watch_image_events(self):
+        """Single subscriber of image events keeping the image metadata cache consistent."""
+        while True:
+            try:
+                async with self._docker() as docker:
+                    # DockerEvents does not tell when the stream is connected, the cache is enabled only after that
+                    params = {"filters": json.dumps({"type": ["image"]})}
+                    async with _stream_api(docker, "events", params) as response:
+                        self._image_cache.clear()
+                        self._image_cache.connected = True
+                        async for event in json_stream_stream(response):
+                            self._image_cache.invalidate(event)
+            except Exception as ex:
+                logger.warning(f"Docker image event stream failed: {extract_messages(ex)}")
+            finally:
+                self._image_cache.connected = False
+                self._image_cache.clear()
+            await asyncio.sleep(1)
+
+    def _ensure_image_events(self):
+        task = self._image_events_task
+        if not task or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._image_events_task = asyncio.create_task(self._watch_image_events())
+
+    async def _inspect_image(self, image: DockerImageID) -> dict | None:
+        self._ensure_image_events()
+        hit, image_info = self._image_cache.get(str(image))
+        if hit:
+            return image_info
+        generation = self._image_cache.generation
+        async with self._docker() as docker:
+            try:
+                image_info = await docker.images.inspect(str(image))
+            except DockerError as ex:
+                if ex.status != 404:
+                    raise
+                image_info = None
+        self._image_cache.put(str(image), image_info, generation)
+        return image_info
+
     async def check_image(self, *, image: DockerImageID) -> bool:
-        async with self._docker as docker:
-            with suppress(DockerError):
-                await docker.images.inspect(str(image))
-                return True
-            return False
+        with suppress(DockerError):
+            return await self._inspect_image(image) is not None
+        return False
 
     async def extract_labels(self, *, image: DockerImageID) -> dict[str, str]:
-        async with self._docker as docker:
-            image_info = await docker.images.inspect(str(image))
-            return image_info["Config"]["Labels"]
+        if not (image_info := await self._inspect_image(image)):
+            raise DockerError(404, {"message": f"No such image: {image}"})
+        return image_info["Config"]["Labels"]
 
     async def delete_image(self, *, image: DockerImageID):
-        async with self._docker as docker:
-            await docker.images.delete(str(image), force=True)
+        async with self._docker() as docker:
+            # containers retained by the stop or pause lifecycle mode would keep the image in use
+            filters = json.dumps({"ancestor": [str(image)], "label": [_CONFIG_HASH_LABEL]})
+            for container in await docker.containers.list(all=True, filters=filters):
+                with suppress(DockerError):
+                    await container.delete(force=True)
+            try:
+                await docker.images.delete(str(image), force=True)
+            finally:
+                self._image_cache.forget(str(image))
 
     async def pull_image(
         self, *, image: DockerImageID, logs_container: LogsContainer | None = None, force: bool = False
     ):
-        async with self._docker as docker:
-            with suppress(DockerError):
-                await docker.images.inspect(str(image))
+        with suppress(DockerError):
+            if await self._inspect_image(image):
                 return  # image already exists
-            if logs_container:
-                progress = {}
+        await self._pull_scheduler.pull(image, logs_container=logs_container)
+
+    async def _pull_image(self, image: DockerImageID, add_progress: Callable[[str], None]):
+        try:
+            async with self._docker() as docker:
+                progress = set()
                 async for message in docker.pull(str(image), auth=self._get_auth_header(image), stream=True):
                     status = message["status"]
-                    if progress_detail := message.get("progressDetail", None):
+                    if message.get("progressDetail", None):
                         id = message["id"]
                         if (id, status) not in progress:
-                            logs_container.add_stdout(f"{id}: {status}")
-                        progress[(id, status)] = progress_detail
+                            add_progress(f"{id}: {status}")
+                        progress.add((id, status))
                     else:
                         id_msg = f"{message['id']}: " if "id" in message else ""
-                        logs_container.add_stdout(f"{id_msg}{status}")
-            else:
-                await docker.pull(str(image), auth=self._get_auth_header(image))
+                        add_progress(f"{id_msg}{status}")
+        finally:
+            self._image_cache.forget(str(image))  # the pull event may arrive after the next installation check
 
-    @property
-    def _docker(self) -> Docker:
-        docker = Docker(self._docker_host, session=AsyncExitStack())
+    def _create_client(self) -> Docker:
+        configuration = self.configuration.docker_client
+        if self._docker_host.startswith("unix://"):
+            connector = aiohttp.UnixConnector(
+                self._docker_host.removeprefix("unix://"),
+                limit=configuration.max_connections,
+                keepalive_timeout=configuration.keepalive_timeout_sec,
+            )
+        else:
+            connector = Docker(self._docker_host, session=AsyncExitStack()).connector
         return Docker(
             url=self._docker_host,
-            session=aiohttp.ClientSession(connector=docker.connector, timeout=aiohttp.ClientTimeout(sock_connect=30)),
+            session=aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(sock_connect=configuration.sock_connect_timeout_sec),
+            ),
         )
 
-    async def stream_logs(self, container_id: ID, logs_container: LogsContainer):
-        async for attempt in AsyncRetrying(retry=retry_if_exception_type(AioHTTPError), reraise=True):
+    async def _get_client(self) -> Docker:
+        # The session is bound to the event loop, bootstrap runs in a different loop than the application
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.session.closed or self._client_loop is not loop:
+            self._client, self._client_loop = self._create_client(), loop
+        return self._client
+
+    async def _reconnect(self, client: Docker):
+        if self._client is client:
+            logger.warning("Connection to the docker daemon failed, reconnecting")
+            self._client = self._client_loop = None
+            with suppress(Exception):
+                await client.close()
+
+    @asynccontextmanager
+    async def _docker(self) -> AsyncIterator[Docker]:
+        """Shared docker client, the client is recreated after connection errors."""
+        client = await self._get_client()
+        try:
+            yield client
+        except Exception as ex:
+            if is_connection_error(ex):
+                await self._reconnect(client)
+            raise
+
+    async def stream_logs(self, container_id: ID, logs_container: LogsContainer, since: int | None = None):
+        """Stream container logs, each chunk read from the socket is ingested as a single batch of lines."""
+        params = {"stdout": "true", "stderr": "true", "follow": "true"}
+        if since:
+            params["since"] = str(since)
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception(is_connection_error), wait=wait_fixed(1), stop=stop_after_attempt(10), reraise=True
+        ):
             with attempt:
-                async with self._docker as docker:
-                    container = await docker.containers.get(container_id)
-                    async for log_message in container.log(stdout=True, stderr=True, follow=True):
-                        if log_message.strip():
-                            logs_container.add_stdout(log_message)
+                try:
+                    async with self._docker() as docker:
+                        container = await docker.containers.get(container_id)
+                        decoder = DockerLogDecoder(multiplexed=not container["Config"]["Tty"])
+                        async with _stream_api(docker, f"containers/{container_id}/logs", params) as response:
+                            async for chunk in response.content.iter_any():
+                                logs_container.ingest(decoder.feed(chunk))
+                        logs_container.ingest(decoder.flush())
+                except Exception:
+                    params["since"] = str(int(time.time()))  # do not repeat logs on reconnect
+                    raise
+
+    async def wait_for_ready(
+        self, *, container_id: ID, host_port: int, image: str, timeout: timedelta | None = None
+    ) -> timedelta:
+        """
+        Wait until the container serves the published host_port.
+
+        Readiness is detected by fast TCP probes of the port. Docker events and the container logs are watched at
+        the same time: the container start or a readiness marker in the logs triggers an immediate probe, a healthy
+        healthcheck status is accepted right away and the container exiting fails the wait without waiting for
+        the timeout.
+
+        :raises ContainerNotReadyError: the container exited or did not become ready within the timeout
+        """
+        configuration = self.configuration.container_readiness
+        timeout = timeout or timedelta(seconds=configuration.timeout_sec)
+        start = time.perf_counter()
+        wake = asyncio.Event()
+        signal = "probe"
+
+        def trigger(reason: str):
+            nonlocal signal
+            signal = reason
+            wake.set()
+
+        async def watch_events(docker: Docker) -> str:
+            subscriber = events.subscribe(filters=json.dumps({"container": [container_id]}))
+            state = (await docker.containers.container(container_id).show())["State"]
+            if not state["Running"]:
+                raise ContainerNotReadyError(f"Container exited with code {state['ExitCode']}")
+            while event := await subscriber.get():
+                action = event.get("Action", "")
+                if action in _EXIT_EVENTS:
+                    raise ContainerNotReadyError(f"Container exited before becoming ready ({action})")
+                if action == "health_status: healthy":
+                    return "health"
+                if action == "start":
+                    trigger("event")
+            raise ContainerNotReadyError("Docker event stream ended")
+
+        async def watch_logs(docker: Docker) -> str:
+            container = docker.containers.container(container_id)
+            async for line in container.log(stdout=True, stderr=True, follow=True):
+                if any(marker in line for marker in configuration.log_markers):
+                    trigger("log")
+            raise ContainerNotReadyError("Container exited before becoming ready")
+
+        async def probe() -> str:
+            while not await probe_http_port(host_port):
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(wake.wait(), timeout=configuration.probe_interval_sec)
+                wake.clear()
+            return signal
+
+        async with self._docker() as docker:
+            events = DockerEvents(docker)  # the shared client events channel would mix streams of concurrent waits
+            tasks = [asyncio.create_task(coro) for coro in (probe(), watch_events(docker), watch_logs(docker))]
+            try:
+                done, _ = await asyncio.wait(
+                    tasks, timeout=timeout.total_seconds(), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise ContainerNotReadyError(f"Container did not become ready within {timeout}")
+                ready_signal = done.pop().result()
+            finally:
+                opened = self._opened_containers.pop(container_id, None)
+                for task in tasks:
+                    await cancel_task(task)
+                await events.stop()
+
+        elapsed = time.perf_counter() - start
+        container_startup_time.record(elapsed, {"image": image, "signal": ready_signal})
+        if opened:
+            opened_at, action = opened
+            container_open_time.record(time.perf_counter() - opened_at, {"image": image, "action": action})
+        logger.info(f"Container {container_id[:12]} of {image} ready in {elapsed * 1000:.0f}ms ({ready_signal})")
+        return timedelta(seconds=elapsed)
 
     @asynccontextmanager
     async def open_container(
@@ -202,16 +739,27 @@ class DockerContainerBackend(IContainerBackend):
         port_mappings: dict[str, str] | None = None,
         logs_container: LogsContainer | None = None,
         restart: str | None = None,
+        lifecycle_mode: ContainerLifecycleMode = ContainerLifecycleMode.remove,
+        resources: ContainerResources | None = None,
     ) -> AsyncGenerator[ID, None]:
+        """
+        Run a container for the duration of the context.
+
+        With the stop or pause lifecycle mode, the container is stopped or paused on exit instead of being removed.
+        The next open with the same name and configuration resumes it instead of creating a new container.
+        """
         # Dirty networking fix
         env = env or {}
         env = {key: replace_localhost_url(val) for key, val in env.items()}
+        retain = lifecycle_mode != ContainerLifecycleMode.remove
 
+        opened_at = time.perf_counter()
         container_id = None
         logs_streaming_task = None
+        failed = False
 
         try:
-            async with self._docker as docker:
+            async with self._docker() as docker:
                 name = name or image.repository.replace("/", "-")
                 config = {"Image": str(image), "HostConfig": {}}
                 if self._extra_hosts:
@@ -221,8 +769,10 @@ class DockerContainerBackend(IContainerBackend):
                 if restart:
                     restart_type, count = (restart if ":" in restart else f"{restart}:0").split(":")
                     config["HostConfig"]["RestartPolicy"] = {"Name": restart_type, "MaximumRetryCount": int(count)}
-                else:
+                elif not retain:
                     config["HostConfig"]["AutoRemove"] = True
+                if resources:
+                    config["HostConfig"].update(self._resource_limits(resources))
                 if env:
                     config["Env"] = [f"{var}={value}" for var, value in env.items()]
                 if command:
@@ -233,24 +783,98 @@ class DockerContainerBackend(IContainerBackend):
                         f"{container_port}/tcp": [{"HostIp": "0.0.0.0", "HostPort": str(host_port)}]
                         for host_port, container_port in port_mappings.items()
                     }
-                async for attempt in AsyncRetrying(
-                    stop=stop_after_attempt(5),
-                    wait=wait_fixed(1),
-                    retry=retry_if_exception_type(DockerError),
-                    reraise=True,
-                ):
-                    with attempt:
-                        container = await docker.containers.create_or_replace(name=name, config=config)
-                        await container.start()
-                        container_id = container.id
+                action, logs_since = "create", None
+                if retain:
+                    config_hash = hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+                    config["Labels"] = {_CONFIG_HASH_LABEL: config_hash}
+                    logs_since = int(time.time())  # do not repeat logs of the previous runs
+                    container_id, action = await self._resume_container(docker, name=name, config_hash=config_hash)
+                if not container_id:
+                    action = "create"
+                    async for attempt in AsyncRetrying(
+                        stop=stop_after_attempt(5),
+                        wait=wait_fixed(1),
+                        retry=retry_if_exception_type(DockerError),
+                        reraise=True,
+                    ):
+                        with attempt:
+                            container = await docker.containers.create_or_replace(name=name, config=config)
+                            await container.start()
+                            container_id = container.id
+                self._opened_containers[container_id] = (opened_at, action)
                 if logs_container:
-                    logs_streaming_task = asyncio.create_task(self.stream_logs(container_id, logs_container))
-                yield container_id
+                    logs_streaming_task = asyncio.create_task(
+                        self.stream_logs(container_id, logs_container, since=logs_since)
+                    )
+                try:
+                    yield container_id
+                except BaseException:
+                    failed = True
+                    raise
         finally:
             with anyio.CancelScope(shield=True):
                 if container_id:
+                    self._opened_containers.pop(container_id, None)
                     await cancel_task(logs_streaming_task)
-                    async with self._docker as docker:
+                    async with self._docker() as docker:
                         with suppress(DockerError):
                             container = await docker.containers.get(container_id)
-                            await container.delete(force=True)
+                            if not retain or failed:
+                                await container.delete(force=True)
+                            elif lifecycle_mode == ContainerLifecycleMode.pause:
+                                await container.pause()
+                            else:
+                                await container.stop()
+
+    @staticmethod
+    def _resource_limits(resources: ContainerResources) -> dict[str, int | str]:
+        limits = {}
+        if resources.memory_limit_mb:
+            limits["Memory"] = resources.memory_limit_mb * 2**20
+        if resources.memory_request_mb:
+            limits["MemoryReservation"] = resources.memory_request_mb * 2**20
+        if resources.cpus_limit:
+            limits["NanoCpus"] = int(resources.cpus_limit * 1e9)
+        if resources.cpus_request:
+            limits["CpuShares"] = max(2, int(resources.cpus_request * 1024))  # relative weight under contention
+        if resources.cpuset_cpus:
+            limits["CpusetCpus"] = resources.cpuset_cpus
+        if resources.pids_limit:
+            limits["PidsLimit"] = resources.pids_limit
+        return limits
+
+    async def get_container_usage(self, *, container_id: ID) -> ContainerUsage | None:
+        async with self._docker() as docker:
+            try:
+                [stats] = await docker.containers.container(container_id).stats(stream=False)
+            except DockerError as ex:
+                if ex.status != 404:
+                    raise
+                return None
+        cpu, precpu = stats.get("cpu_stats", {}), stats.get("precpu_stats", {})
+        cpu_delta = cpu.get("cpu_usage", {}).get("total_usage", 0) - precpu.get("cpu_usage", {}).get("total_usage", 0)
+        system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+        cpus = cpu_delta / system_delta * cpu.get("online_cpus", 1) if cpu_delta > 0 and system_delta > 0 else 0.0
+        memory = stats.get("memory_stats", {})
+        # page cache is reclaimable, docker cli excludes it from the reported usage as well
+        cache = memory.get("stats", {}).get("inactive_file", memory.get("stats", {}).get("cache", 0))
+        return ContainerUsage(cpus=cpus, memory_bytes=max(0, memory.get("usage", 0) - cache))
+
+    async def _resume_container(self, docker: Docker, *, name: str, config_hash: str) -> tuple[ID | None, str]:
+        """Resume a retained container with the same configuration, return its id and the action taken."""
+        try:
+            container = await docker.containers.get(name)
+            if container["Config"]["Labels"].get(_CONFIG_HASH_LABEL) != config_hash:
+                return None, "create"
+            state = container["State"]
+            if state["Paused"]:
+                await container.unpause()
+                return container.id, "unpause"
+            if not state["Running"]:
+                await container.start()
+                return container.id, "start"
+            return container.id, "reuse"
+        except DockerError as ex:
+            if ex.status != 404:
+                logger.warning(f"Unable to resume container {name}, creating a new one: {extract_messages(ex)}")
+            return None, "create"
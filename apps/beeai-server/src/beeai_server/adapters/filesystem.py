@@ -12,13 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import json
 import logging
+import os
 from pathlib import Path
 from uuid import uuid4
 
+import anyio.to_thread
 import yaml
 from anyio import Path as AsyncPath
-from pydantic import BaseModel, ValidationError, RootModel
+from pydantic import BaseModel, TypeAdapter, ValidationError, RootModel
 
 from beeai_server.adapters.interface import (
     IProviderRepository,
@@ -30,63 +34,153 @@ from beeai_server.adapters.interface import (
 from beeai_server.domain.provider.model import Provider
 from beeai_server.utils.utils import filter_dict
 
+# libyaml parses several times faster, the pure python implementation is used only when it is not available
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ProviderConfigFile(BaseModel):
     providers: list[Provider]
 
 
+ProviderAdapter = TypeAdapter(Provider)
+
+
+def write_atomic(path: Path, data: str) -> None:
+    """Replace the file with new content, readers and crashes see either the old or the new content."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid4().hex[:6]}.tmp")
+    try:
+        with open(tmp_path, "w") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    directory = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+
 class FilesystemProviderRepository(IProviderRepository):
+    """
+    Providers are stored in a snapshot at provider_config_path and an append-only change log next to it
+    (`providers.yaml.log`, one JSON change per line). A mutation is appended to the log and fsynced before it
+    returns, mutations arriving while a write is in progress are written together in the next one. Once the log
+    has more changes than the snapshot has providers, it is compacted into a new snapshot written atomically.
+
+    Snapshots are written as JSON, which is valid YAML and loads much faster, YAML written by older versions or
+    edited by hand is still accepted.
+    """
+
+    LOG_SUFFIX = ".log"
+    MIN_COMPACTION_CHANGES = 100
+
     def __init__(self, provider_config_path: Path):
-        self._config_path = AsyncPath(provider_config_path)
-        self._repository_providers: list[Provider] | None = None
+        self._config_path = provider_config_path
+        self._log_path = provider_config_path.with_name(provider_config_path.name + self.LOG_SUFFIX)
+        # providers indexed by id, the dict keeps the order of the config file
+        self._repository_providers: dict[str, Provider] | None = None
+        self._pending_changes: list[str] = []
+        self._log_changes = 0
+        self._write_lock = asyncio.Lock()
 
-    async def _write_config(self, providers: list[Provider]) -> None:
-        # Ensure that path exists
-        await self._config_path.parent.mkdir(parents=True, exist_ok=True)
-        config = yaml.dump(ProviderConfigFile(providers=providers).model_dump(mode="json"), indent=2)
-        # We do not handle conflicts - if the file was updated in the meantime, we override it with new values
-        await self._config_path.write_text(config)
-        self._repository_providers = providers
+    def _load(self) -> tuple[dict[str, Provider], int]:
+        providers = {}
+        if self._config_path.exists():
+            try:
+                config = self._config_path.read_text()
+                try:
+                    config = json.loads(config)
+                except ValueError:
+                    config = yaml.load(config, Loader=YamlLoader)
+                providers = {p.id: p for p in ProviderConfigFile.model_validate(config).providers}
+            except ValidationError as ex:
+                backup = self._config_path.parent / f"{self._config_path.name}.bak.{uuid4().hex[:6]}"
+                logging.error(f"Invalid config file, renaming to {backup}. {ex!r}")
+                self._config_path.rename(backup)
+        log_changes = 0
+        if self._log_path.exists():
+            with open(self._log_path) as log:
+                for line in log:
+                    try:
+                        change = json.loads(line)
+                        if change["op"] == "delete":
+                            providers.pop(change["id"], None)
+                        else:
+                            provider = ProviderAdapter.validate_python(change["provider"])
+                            providers[provider.id] = provider
+                        log_changes += 1
+                    except (ValueError, KeyError) as ex:
+                        logging.error(f"Skipping invalid change in {self._log_path}: {ex!r}")
+        return providers, log_changes
 
-    async def sync(self) -> None:
-        if not await self._config_path.exists():
-            self._repository_providers = []
-            return
+    def _append_changes(self, changes: list[str]) -> None:
+        self._log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._log_path, "a") as log:
+            log.write("".join(changes))
+            log.flush()
+            os.fsync(log.fileno())
 
-        config = await self._config_path.read_text()
+    def _compact(self, providers: list[Provider]) -> None:
+        write_atomic(self._config_path, ProviderConfigFile(providers=providers).model_dump_json(indent=2))
+        # changes in the log are idempotent, replaying them over the new snapshot after a crash here is harmless
+        write_atomic(self._log_path, "")
+
+    async def _flush(self) -> None:
+        changes, self._pending_changes = self._pending_changes, []
+        if not changes:
+            return  # written together with changes of a concurrent mutation
         try:
-            self._repository_providers = ProviderConfigFile.model_validate(yaml.safe_load(config)).providers
-        except ValidationError as ex:
-            backup = self._config_path.parent / f"{self._config_path.name}.bak.{uuid4().hex[:6]}"
-            logging.error(f"Invalid config file, renaming to {backup}. {ex!r}")
-            await self._config_path.rename(backup)
-            self._repository_providers = []
+            await anyio.to_thread.run_sync(self._append_changes, changes)
+        except BaseException:
+            self._pending_changes[:0] = changes
+            raise
+        self._log_changes += len(changes)
+        if self._log_changes > max(self.MIN_COMPACTION_CHANGES, len(self._repository_providers)):
+            await anyio.to_thread.run_sync(self._compact, list(self._repository_providers.values()))
+            self._log_changes = 0
 
-    async def list(self) -> list[Provider]:
+    async def _commit(self) -> None:
+        async with self._write_lock:
+            await self._flush()
+
+    async def sync(self) -> None:
+        async with self._write_lock:
+            await self._flush()
+            self._repository_providers, self._log_changes = await anyio.to_thread.run_sync(self._load)
+
+    async def _get_index(self) -> dict[str, Provider]:
         if self._repository_providers is None:
             await self.sync()
         return self._repository_providers
 
+    async def list(self) -> list[Provider]:
+        return list((await self._get_index()).values())
+
     async def create(self, *, provider: Provider) -> None:
-        repository_providers = await self.list()
-        if provider.id in {p.id for p in repository_providers}:
+        repository_providers = await self._get_index()
+        if provider.id in repository_providers:
             raise ValueError(f"Provider with ID {provider.id} already exists")
-        repository_providers.append(provider)
-        await self._write_config(repository_providers)
+        repository_providers[provider.id] = provider
+        self._pending_changes.append(json.dumps({"op": "create", "provider": provider.model_dump(mode="json")}) + "\n")
+        await self._commit()
 
     async def get(self, *, provider_id: str) -> Provider:
-        repository_providers = {provider.id: provider for provider in await self.list()}
+        repository_providers = await self._get_index()
         if provider_id in repository_providers:
             return repository_providers[provider_id]
         raise ValueError(f"Provider with ID {provider_id} not found")
 
     async def delete(self, *, provider_id: str) -> None:
-        repository_providers = await self.list()
-        new_providers = [p for p in repository_providers if p.id != provider_id]
-        if len(new_providers) < len(repository_providers):
-            await self._write_config(new_providers)
-            return
-        raise ValueError(f"Provider with ID {provider_id} not found")
+        repository_providers = await self._get_index()
+        if provider_id not in repository_providers:
+            raise ValueError(f"Provider with ID {provider_id} not found")
+        del repository_providers[provider_id]
+        self._pending_changes.append(json.dumps({"op": "delete", "id": provider_id}) + "\n")
+        await self._commit()
 
 
 EnvConfigFile = RootModel[dict[str, str]]
@@ -13,8 +13,10 @@
 # limitations under the License.
 
 from contextlib import asynccontextmanager
-from typing import TYPE_CHECKING, Iterable, Protocol, runtime_checkable
+from datetime import timedelta
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Protocol, runtime_checkable
 
+from beeai_server.configuration import ContainerLifecycleMode, ContainerResources
 from beeai_server.utils.docker import DockerImageID
 from beeai_server.utils.github import ResolvedGithubUrl
 from beeai_server.utils.logs_container import LogsContainer
@@ -42,6 +44,11 @@ class IEnvVariableRepository(Protocol):
     async def update(self, update: dict[str, str | None]) -> None: ...
 
 
+class ContainerUsage(NamedTuple):
+    cpus: float
+    memory_bytes: int
+
+
 class IContainerBackend(Protocol):
     async def build_from_github(
         self, *, github_url: ResolvedGithubUrl, destination: DockerImageID | None = None, logs_container: LogsContainer
@@ -65,7 +72,13 @@ class IContainerBackend(Protocol):
         port_mappings: dict[str, str] | None = None,
         logs_container: LogsContainer | None = None,
         restart: str | None = None,
+        lifecycle_mode: ContainerLifecycleMode = ContainerLifecycleMode.remove,
+        resources: ContainerResources | None = None,
     ): ...
+    async def wait_for_ready(
+        self, *, container_id: str, host_port: int, image: str, timeout: timedelta | None = None
+    ) -> timedelta: ...
+    async def get_container_usage(self, *, container_id: str) -> ContainerUsage | None: ...
 
 
 class TelemetryConfig(BaseModel):
@@ -0,0 +1,201 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+import anyio.to_thread
+from pydantic import TypeAdapter
+
+from beeai_server.adapters.interface import (
+    IEnvVariableRepository,
+    IProviderRepository,
+    ITelemetryRepository,
+    NOT_SET,
+    TelemetryConfig,
+)
+from beeai_server.domain.provider.model import Provider
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Applied in order, the database stores the number of applied migrations in PRAGMA user_version
+MIGRATIONS = [
+    """
+    CREATE TABLE providers (id TEXT PRIMARY KEY, registry TEXT, data TEXT NOT NULL);
+    CREATE TABLE env (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    CREATE TABLE telemetry (id INTEGER PRIMARY KEY CHECK (id = 1), data TEXT NOT NULL);
+    """,
+]
+
+ProviderAdapter = TypeAdapter(Provider)
+
+
+def _split_statements(script: str) -> Iterator[str]:
+    # executescript would commit the migration transaction first (python < 3.12), a ";" may be part of a literal
+    statement = ""
+    for part in script.split(";"):
+        statement += part + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.rstrip(";").strip():
+                yield statement
+            statement = ""
+
+
+class SqliteDatabase:
+    """
+    SQLite database shared by the repositories. The database runs in WAL mode, so several server processes can use
+    it at once: readers do not block the writer and writers wait for each other up to busy_timeout_sec.
+    Queries run in a worker thread, one at a time on a single connection.
+    """
+
+    def __init__(self, path: Path, busy_timeout_sec: float = 30):
+        self.path = path
+        self._busy_timeout_sec = busy_timeout_sec
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=self._busy_timeout_sec)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        self._migrate(db)
+        return db
+
+    def _migrate(self, db: sqlite3.Connection) -> None:
+        # the write lock is taken before reading the version, processes starting at once do not migrate twice
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            [version] = db.execute("PRAGMA user_version").fetchone()
+            for index, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+                logger.info(f"Migrating {self.path} to version {index}")
+                for statement in _split_statements(migration):
+                    db.execute(statement)
+                db.execute(f"PRAGMA user_version = {index}")
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def _run(self, query: Callable[[sqlite3.Connection], T], transaction: bool) -> T:
+        with self._lock:
+            if not self._db:
+                self._db = self._connect()
+            if not transaction:
+                return query(self._db)
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = query(self._db)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return result
+
+    async def run(self, query: Callable[[sqlite3.Connection], T], transaction: bool = False) -> T:
+        return await anyio.to_thread.run_sync(self._run, query, transaction)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db:
+                self._db.close()
+                self._db = None
+
+
+class SqliteProviderRepository(IProviderRepository):
+    def __init__(self, database: SqliteDatabase):
+        self._database = database
+
+    async def sync(self) -> None:
+        pass  # every read goes to the database
+
+    async def list(self) -> list[Provider]:
+        rows = await self._database.run(lambda db: db.execute("SELECT data FROM providers ORDER BY rowid").fetchall())
+        return [ProviderAdapter.validate_json(data) for (data,) in rows]
+
+    async def create(self, *, provider: Provider) -> None:
+        registry = str(provider.registry.root) if provider.registry else None
+        data = provider.model_dump_json()
+        try:
+            await self._database.run(
+                lambda db: db.execute(
+                    "INSERT INTO providers (id, registry, data) VALUES (?, ?, ?)", (provider.id, registry, data)
+                )
+            )
+        except sqlite3.IntegrityError as ex:
+            raise ValueError(f"Provider with ID {provider.id} already exists") from ex
+
+    async def get(self, *, provider_id: str) -> Provider:
+        row = await self._database.run(
+            lambda db: db.execute("SELECT data FROM providers WHERE id = ?", (provider_id,)).fetchone()
+        )
+        if not row:
+            raise ValueError(f"Provider with ID {provider_id} not found")
+        return ProviderAdapter.validate_json(row[0])
+
+    async def delete(self, *, provider_id: str) -> None:
+        cursor = await self._database.run(lambda db: db.execute("DELETE FROM providers WHERE id = ?", (provider_id,)))
+        if not cursor.rowcount:
+            raise ValueError(f"Provider with ID {provider_id} not found")
+
+
+class SqliteEnvVariableRepository(IEnvVariableRepository):
+    def __init__(self, database: SqliteDatabase):
+        self._database = database
+
+    async def sync(self) -> None:
+        pass  # every read goes to the database
+
+    async def get_all(self) -> dict[str, str]:
+        return dict(await self._database.run(lambda db: db.execute("SELECT key, value FROM env").fetchall()))
+
+    async def get(self, key: str, default: str | None = NOT_SET) -> str:
+        row = await self._database.run(lambda db: db.execute("SELECT value FROM env WHERE key = ?", (key,)).fetchone())
+        return row[0] if row else (None if default is NOT_SET else default)
+
+    async def update(self, update: dict[str, str | None]) -> None:
+        def query(db: sqlite3.Connection):
+            db.executemany(
+                "INSERT INTO env (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                [(key, value) for key, value in update.items() if value is not None],
+            )
+            db.executemany("DELETE FROM env WHERE key = ?", [(key,) for key, value in update.items() if value is None])
+
+        await self._database.run(query, transaction=True)
+
+
+class SqliteTelemetryRepository(ITelemetryRepository):
+    def __init__(self, database: SqliteDatabase):
+        self._database = database
+
+    async def sync(self) -> None:
+        pass  # every read goes to the database
+
+    async def set(self, *, config: TelemetryConfig) -> None:
+        data = config.model_dump_json()
+        await self._database.run(
+            lambda db: db.execute(
+                "INSERT INTO telemetry (id, data) VALUES (1, ?) ON CONFLICT (id) DO UPDATE SET data = excluded.data",
+                (data,),
+            )
+        )
+
+    async def get(self) -> TelemetryConfig:
+        row = await self._database.run(lambda db: db.execute("SELECT data FROM telemetry WHERE id = 1").fetchone())
+        return TelemetryConfig.model_validate_json(row[0]) if row else TelemetryConfig()
@@ -14,7 +14,7 @@
 
 import logging
 import pathlib
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Iterable
 
 from acp_sdk import ACPError
@@ -26,7 +26,8 @@ from acp_sdk.server.errors import (
 )
 from starlette.requests import Request
 
-from beeai_server.adapters.interface import IProviderRepository
+from beeai_server.adapters.interface import IContainerBackend, IProviderRepository
+from beeai_server.adapters.sqlite import SqliteDatabase
 from beeai_server.domain.provider.container import ProviderContainer
 from beeai_server.domain.provider.model import ProviderStatus
 from beeai_server.utils.fastapi import NoCacheStaticFiles
@@ -45,7 +46,12 @@ from beeai_server.telemetry import INSTRUMENTATION_NAME, shutdown_telemetry
 from beeai_server.domain.telemetry import TelemetryCollectorManager
 from beeai_server.bootstrap import bootstrap_dependencies_sync
 from beeai_server.configuration import Configuration
-from beeai_server.exceptions import ManifestLoadError, ProviderNotInstalledError
+from beeai_server.exceptions import (
+    AdmissionRejectedError,
+    ManifestLoadError,
+    ProviderNotInstalledError,
+    ProviderUnavailableError,
+)
 from beeai_server.routes.provider import router as provider_router
 from beeai_server.routes.acp import router as acp_router
 from beeai_server.routes.env import router as env_router
@@ -66,6 +72,21 @@ def register_global_exception_handlers(app: FastAPI):
     async def entity_not_found_exception_handler(request, exc: ManifestLoadError):
         return await http_exception_handler(request, HTTPException(status_code=exc.status_code, detail=str(exc)))
 
+    # handlers of Exception run in ServerErrorMiddleware which re-raises, expected errors need their own handlers
+    async def error_response(request: Request, status_code: int, detail: str):
+        handler = acp_http_exception_handler if request.url.path.startswith("/api/v1/acp") else http_exception_handler
+        return await handler(request, HTTPException(status_code=status_code, detail=detail))
+
+    @app.exception_handler(AdmissionRejectedError)
+    async def admission_rejected_exception_handler(request: Request, exc: AdmissionRejectedError):
+        response = await error_response(request, exc.status_code, str(exc))
+        response.headers["Retry-After"] = str(exc.retry_after)
+        return response
+
+    @app.exception_handler(ProviderUnavailableError)
+    async def provider_unavailable_exception_handler(request: Request, exc: ProviderUnavailableError):
+        return await error_response(request, exc.status_code, str(exc))
+
     @app.exception_handler(Exception)
     @app.exception_handler(HTTPException)
     async def custom_http_exception_handler(request: Request, exc):
@@ -148,6 +169,67 @@ def register_telemetry(provider_container: ProviderContainer):
 
     meter.create_observable_gauge("providers_by_status", callbacks=[scrape_providers_by_status])
 
+    def scrape_provider_replicas(options: CallbackOptions) -> Iterable[Observation]:
+        for provider in list(provider_container.loaded_providers.values()):
+            yield Observation(value=len(provider.replicas), attributes={"provider": provider.id})
+
+    meter.create_observable_gauge("provider_replicas", callbacks=[scrape_provider_replicas])
+
+    def scrape_resources_requested(options: CallbackOptions) -> Iterable[Observation]:
+        scheduler = provider_container.resource_scheduler
+        yield Observation(value=scheduler.requested_cpus, attributes={"resource": "cpus"})
+        yield Observation(value=scheduler.requested_memory_mb * 2**20, attributes={"resource": "memory_bytes"})
+
+    def scrape_resources_capacity(options: CallbackOptions) -> Iterable[Observation]:
+        scheduler = provider_container.resource_scheduler
+        yield Observation(value=scheduler.capacity_cpus, attributes={"resource": "cpus"})
+        yield Observation(value=scheduler.capacity_memory_mb * 2**20, attributes={"resource": "memory_bytes"})
+
+    def scrape_provider_resource_usage(options: CallbackOptions) -> Iterable[Observation]:
+        for provider in list(provider_container.loaded_providers.values()):
+            if usage := provider.resource_usage:
+                yield Observation(value=usage.cpus, attributes={"provider": provider.id, "resource": "cpus"})
+                yield Observation(
+                    value=usage.memory_bytes, attributes={"provider": provider.id, "resource": "memory_bytes"}
+                )
+
+    meter.create_observable_gauge("provider_resources_requested", callbacks=[scrape_resources_requested])
+    meter.create_observable_gauge("provider_resources_capacity", callbacks=[scrape_resources_capacity])
+    meter.create_observable_gauge("provider_resource_usage", callbacks=[scrape_provider_resource_usage])
+
+    def scrape_admission_queued(options: CallbackOptions) -> Iterable[Observation]:
+        admission = provider_container.admission
+        yield Observation(value=admission.global_limiter.queued, attributes={"scope": "global"})
+        for provider_id, limiter in list(admission.provider_limiters.items()):
+            yield Observation(value=limiter.queued, attributes={"scope": "provider", "provider": provider_id})
+
+    def scrape_admission_active(options: CallbackOptions) -> Iterable[Observation]:
+        admission = provider_container.admission
+        yield Observation(value=admission.global_limiter.active, attributes={"scope": "global"})
+        for provider_id, limiter in list(admission.provider_limiters.items()):
+            yield Observation(value=limiter.active, attributes={"scope": "provider", "provider": provider_id})
+
+    meter.create_observable_gauge("admission_queued_requests", callbacks=[scrape_admission_queued])
+    meter.create_observable_gauge("admission_active_runs", callbacks=[scrape_admission_active])
+
+    def scrape_run_registry_size(options: CallbackOptions) -> Iterable[Observation]:
+        yield Observation(value=len(provider_container.run_registry))
+
+    def scrape_run_registry_memory(options: CallbackOptions) -> Iterable[Observation]:
+        yield Observation(value=provider_container.run_registry.memory_bytes)
+
+    def scrape_run_registry_occupancy(options: CallbackOptions) -> Iterable[Observation]:
+        yield Observation(value=provider_container.run_registry.occupancy)
+
+    def scrape_run_registry_evictions(options: CallbackOptions) -> Iterable[Observation]:
+        yield Observation(value=provider_container.run_registry.evictions, attributes={"reason": "size"})
+        yield Observation(value=provider_container.run_registry.expirations, attributes={"reason": "ttl"})
+
+    meter.create_observable_gauge("run_registry_size", callbacks=[scrape_run_registry_size])
+    meter.create_observable_gauge("run_registry_memory_bytes", callbacks=[scrape_run_registry_memory], unit="By")
+    meter.create_observable_gauge("run_registry_occupancy", callbacks=[scrape_run_registry_occupancy])
+    meter.create_observable_counter("run_registry_evictions", callbacks=[scrape_run_registry_evictions])
+
 
 @asynccontextmanager
 @inject
@@ -156,22 +238,30 @@ async def lifespan(
     provider_container: ProviderContainer,
     telemetry_collector_manager: TelemetryCollectorManager,
     provider_repository: IProviderRepository,
+    container_backend: IContainerBackend,
 ):
     from beeai_server.crons.sync_registry_providers import preinstall_background_tasks
     from beeai_server.utils.periodic import run_all_crons
 
-    register_telemetry()
-    for provider in await provider_repository.list():
-        await provider_container.add(provider)
-
-    async with provider_container, telemetry_collector_manager, run_all_crons():
-        try:
-            yield
-        finally:
-            # Cancel unfinished installation tasks
-            for task in preinstall_background_tasks.values():
-                task.cancel()
-            shutdown_telemetry()
+    async with AsyncExitStack() as exit_stack:
+        if SqliteDatabase in di:
+            # closed last, closing the connection checkpoints the WAL into the database file
+            exit_stack.callback(di[SqliteDatabase].close)
+
+        register_telemetry()
+        for provider in await provider_repository.list():
+            await provider_container.add(provider)
+
+        # Providers stop their containers on exit, the container backend must outlive them
+        container_backend = container_backend if container_backend is not NotImplemented else AsyncExitStack()
+        async with container_backend, provider_container, telemetry_collector_manager, run_all_crons():
+            try:
+                yield
+            finally:
+                # Cancel unfinished installation tasks
+                for task in preinstall_background_tasks.values():
+                    task.cancel()
+                shutdown_telemetry()
 
 
 def app() -> FastAPI:
@@ -21,6 +21,7 @@ import shutil
 import subprocess
 import time
 from contextlib import suppress, AsyncExitStack
+from datetime import timedelta
 from pathlib import Path
 import socket
 import http.client
@@ -41,9 +42,17 @@ from beeai_server.adapters.interface import (
     IProviderRepository,
     ITelemetryRepository,
 )
-from beeai_server.configuration import Configuration, get_configuration
+from beeai_server.adapters.sqlite import (
+    SqliteDatabase,
+    SqliteEnvVariableRepository,
+    SqliteProviderRepository,
+    SqliteTelemetryRepository,
+)
+from beeai_server.configuration import Configuration, StorageBackend, get_configuration
 from beeai_server.domain.collector.constants import TELEMETRY_BASE_CONFIG_PATH, TELEMETRY_BEEAI_CONFIG_PATH
 from beeai_server.domain.provider.container import ProviderContainer
+from beeai_server.domain.provider.log_store import ProviderLogStore
+from beeai_server.domain.provider.runs import RunRegistry
 from beeai_server.domain.telemetry import TelemetryCollectorManager
 from beeai_server.utils.periodic import register_all_crons
 from kink import di
@@ -172,6 +181,7 @@ async def resolve_container_runtime_cmd(configuration: Configuration) -> IContai
     backend = DockerContainerBackend(docker_host=docker_host, configuration=configuration)
     if not docker_host.endswith("lima/beeai/sock/docker.sock"):
         await backend.configure_host_docker_internal()
+        await backend.close()  # the client is bound to the bootstrap event loop
     return backend
 
 
@@ -195,17 +205,44 @@ async def bootstrap_dependencies():
 
     copy_telemetry_config(config)
 
-    di[IProviderRepository] = FilesystemProviderRepository(provider_config_path=config.provider_config_path)
-    di[IEnvVariableRepository] = FilesystemEnvVariableRepository(env_variable_path=config.env_path)
-    di[ITelemetryRepository] = FilesystemTelemetryRepository(
-        telemetry_config_path=config.telemetry_config_dir / "telemetry.yaml"
-    )
+    if config.storage.backend == StorageBackend.sqlite:
+        database = SqliteDatabase(config.storage.sqlite_path, busy_timeout_sec=config.storage.sqlite_busy_timeout_sec)
+        di[SqliteDatabase] = database
+        di[IProviderRepository] = SqliteProviderRepository(database)
+        di[IEnvVariableRepository] = SqliteEnvVariableRepository(database)
+        di[ITelemetryRepository] = SqliteTelemetryRepository(database)
+    else:
+        di[IProviderRepository] = FilesystemProviderRepository(provider_config_path=config.provider_config_path)
+        di[IEnvVariableRepository] = FilesystemEnvVariableRepository(env_variable_path=config.env_path)
+        di[ITelemetryRepository] = FilesystemTelemetryRepository(
+            telemetry_config_path=config.telemetry_config_dir / "telemetry.yaml"
+        )
 
     di[IContainerBackend] = NotImplemented if config.disable_docker else await resolve_container_runtime_cmd(config)
     di[TelemetryCollectorManager] = AsyncExitStack() if not config.collector_managed else TelemetryCollectorManager()
 
     di[ProviderContainer] = ProviderContainer(
-        env_repository=di[IEnvVariableRepository], autostart_providers=config.autostart_providers
+        env_repository=di[IEnvVariableRepository],
+        autostart_providers=config.autostart_providers,
+        proxy_configuration=config.provider_proxy,
+        run_registry=RunRegistry(
+            max_size=config.run_registry.max_size,
+            ttl=timedelta(seconds=config.run_registry.ttl_sec),
+            persistence_path=config.run_registry.persistence_path,
+        ),
+        warm_pool_configuration=config.warm_pool,
+        scaling_configuration=config.scaling,
+        admission_configuration=config.admission_control,
+        logs_configuration=config.provider_logs,
+        log_store=(
+            ProviderLogStore(
+                directory=config.provider_logs.store.directory or config.cache_dir / "logs",
+                configuration=config.provider_logs.store,
+            )
+            if config.provider_logs.store.enabled
+            else None
+        ),
+        resources_configuration=config.resources,
     )
 
     # Ensure cache directory
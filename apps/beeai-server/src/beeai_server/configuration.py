@@ -16,6 +16,7 @@ import base64
 import logging
 from collections import defaultdict
 from datetime import timedelta
+from enum import StrEnum
 from functools import cache
 from pathlib import Path
 
@@ -66,6 +67,179 @@ class AgentRegistryConfiguration(BaseModel):
     sync_period_sec: int = Field(default=timedelta(minutes=10).total_seconds())
 
 
+class ProviderProxyConfiguration(BaseModel):
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_sec: float = 30
+
+
+class ProviderHealthConfiguration(BaseModel):
+    check_period_sec: int = 10
+
+
+class StorageBackend(StrEnum):
+    filesystem = "filesystem"  # yaml files in ~/.beeai, owned by a single server process
+    sqlite = "sqlite"  # sqlite database in WAL mode, can be shared by multiple server processes
+
+
+class StorageConfiguration(BaseModel):
+    backend: StorageBackend = StorageBackend.filesystem
+    sqlite_path: Path = Path.home() / ".beeai" / "beeai.db"
+    sqlite_busy_timeout_sec: float = Field(default=30, gt=0, description="How long to wait for a locked database")
+
+
+class RunRegistryConfiguration(BaseModel):
+    max_size: int = 100_000
+    ttl_sec: int = Field(default=timedelta(minutes=30).total_seconds())
+    persistence_path: Path | None = None
+    flush_period_sec: float = Field(default=1, gt=0, description="How often changes are written to persistence")
+
+
+class DockerClientConfiguration(BaseModel):
+    max_connections: int = Field(default=100, ge=1, description="Includes long-lived log and event streams")
+    keepalive_timeout_sec: float = 30
+    sock_connect_timeout_sec: float = 30
+
+
+class ImagePullConfiguration(BaseModel):
+    max_concurrent_pulls: int = Field(default=2, ge=1)
+
+
+class GithubBuildCacheConfiguration(BaseModel):
+    max_cached_commits: int = Field(
+        default=20, ge=1, description="Number of downloaded source trees and build contexts kept in cache_dir"
+    )
+
+
+class LogStoreConfiguration(BaseModel):
+    enabled: bool = True
+    directory: Path | None = Field(default=None, description="Defaults to logs directory in cache_dir")
+    flush_interval_sec: float = Field(default=1, gt=0)
+    segment_max_bytes: int = Field(default=16 * 1024 * 1024, ge=1024)
+    max_bytes_per_provider: int = Field(default=256 * 1024 * 1024, ge=1024)
+    index_interval_bytes: int = Field(default=64 * 1024, ge=1)
+
+
+class ProviderLogsConfiguration(BaseModel):
+    max_lines_per_sec: float | None = Field(
+        default=1000, gt=0, description="Rate limit of log lines ingested per provider, None means unlimited"
+    )
+    burst_lines: int = Field(default=5000, ge=1)
+    store: LogStoreConfiguration = LogStoreConfiguration()
+
+
+class ContainerResources(BaseModel):
+    cpus_request: float | None = Field(default=None, gt=0, description="CPUs reserved on the host for a replica")
+    cpus_limit: float | None = Field(default=None, gt=0)
+    memory_request_mb: int | None = Field(default=None, gt=0, description="Memory reserved on the host for a replica")
+    memory_limit_mb: int | None = Field(default=None, gt=0)
+    cpuset_cpus: str | None = Field(default=None, description="CPUs the container can run on, e.g. 0-3 or 1,3")
+    pids_limit: int | None = Field(default=None, gt=0)
+
+    @property
+    def requested_cpus(self) -> float:
+        return self.cpus_request or self.cpus_limit or 0
+
+    @property
+    def requested_memory_mb(self) -> int:
+        return self.memory_request_mb or self.memory_limit_mb or 0
+
+    def merge(self, other: "ContainerResources | None") -> "ContainerResources":
+        """Return a copy with values set in other taking precedence."""
+        return self.model_copy(update=other.model_dump(exclude_none=True)) if other else self
+
+
+class ResourcesConfiguration(BaseModel):
+    default: ContainerResources = ContainerResources(pids_limit=4096)
+    providers: dict[str, ContainerResources] = Field(
+        default_factory=dict, description="Overrides of resources declared in the manifest by provider id or agent"
+    )
+    check_capacity: bool = True
+    capacity_cpus: float | None = Field(
+        default=None, gt=0, description="CPUs available to containers, defaults to the CPU count of this host"
+    )
+    capacity_memory_mb: int | None = Field(
+        default=None, gt=0, description="Memory available to containers, defaults to the memory of this host"
+    )
+    reserved_cpus: float = Field(default=1, ge=0, description="CPUs kept free for the server and other processes")
+    reserved_memory_mb: int = Field(default=1024, ge=0)
+    usage_period_sec: int = Field(default=30, ge=1)
+
+
+class ContainerLifecycleMode(StrEnum):
+    remove = "remove"  # remove the container when the provider stops
+    stop = "stop"  # stop the container and start it again on the next provider start
+    pause = "pause"  # pause the container and unpause it on the next provider start
+
+
+class ContainerLifecycleConfiguration(BaseModel):
+    mode: ContainerLifecycleMode = Field(
+        default=ContainerLifecycleMode.remove, description="What happens to a provider container when it stops"
+    )
+
+
+class ContainerReadinessConfiguration(BaseModel):
+    timeout_sec: float = 30
+    probe_interval_sec: float = 0.025
+    log_markers: list[str] = Field(
+        default_factory=lambda: ["Uvicorn running on", "Application startup complete"],
+        description="Log lines signalling that the agent server is listening",
+    )
+
+
+class WarmPoolSettings(BaseModel):
+    min_warm: int = 0
+    max_idle_sec: int | None = None  # defaults to the provider auto_stop_timeout
+
+
+class WarmPoolConfiguration(BaseModel):
+    enabled: bool = True
+    period_sec: int = 30
+    usage_window_sec: int = Field(default=timedelta(minutes=15).total_seconds())
+    predictive_min_requests: int = 5
+    default: WarmPoolSettings = WarmPoolSettings()
+    providers: dict[str, WarmPoolSettings] = Field(
+        default_factory=dict, description="Settings per provider id, location or agent name"
+    )
+
+
+class ScalingSettings(BaseModel):
+    min_replicas: int = Field(default=1, ge=1)
+    max_replicas: int = Field(default=1, ge=1)
+    target_in_flight_per_replica: int = Field(default=4, ge=1)
+
+    @model_validator(mode="after")
+    def _check_replicas(self):
+        if self.max_replicas < self.min_replicas:
+            raise ValueError("max_replicas must be greater or equal to min_replicas")
+        return self
+
+
+class ScalingConfiguration(BaseModel):
+    period_sec: int = 5
+    default: ScalingSettings = ScalingSettings()
+    providers: dict[str, ScalingSettings] = Field(
+        default_factory=dict, description="Settings per provider id, location or agent name"
+    )
+
+
+class AdmissionSettings(BaseModel):
+    max_concurrent_runs: int | None = Field(default=32, ge=1, description="None disables the limit")
+    max_queue_depth: int = Field(default=100, ge=0)
+
+
+class AdmissionControlConfiguration(BaseModel):
+    enabled: bool = True
+    max_concurrent_runs: int | None = Field(default=256, ge=1, description="Global limit, None disables it")
+    max_queue_depth: int = Field(default=1000, ge=0)
+    queue_timeout_sec: float = 30
+    retry_after_sec: int = 5
+    default: AdmissionSettings = AdmissionSettings()
+    providers: dict[str, AdmissionSettings] = Field(
+        default_factory=dict, description="Settings per provider id, location or agent name"
+    )
+
+
 class Configuration(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", env_nested_delimiter="__", extra="ignore"
@@ -74,6 +248,20 @@ class Configuration(BaseSettings):
     logging: LoggingConfiguration = LoggingConfiguration()
     agent_registry: AgentRegistryConfiguration = AgentRegistryConfiguration()
     oci_registry: dict[str, OCIRegistryConfiguration] = Field(default_factory=dict)
+    provider_proxy: ProviderProxyConfiguration = ProviderProxyConfiguration()
+    provider_health: ProviderHealthConfiguration = ProviderHealthConfiguration()
+    run_registry: RunRegistryConfiguration = RunRegistryConfiguration()
+    storage: StorageConfiguration = StorageConfiguration()
+    warm_pool: WarmPoolConfiguration = WarmPoolConfiguration()
+    docker_client: DockerClientConfiguration = DockerClientConfiguration()
+    image_pull: ImagePullConfiguration = ImagePullConfiguration()
+    github_build_cache: GithubBuildCacheConfiguration = GithubBuildCacheConfiguration()
+    container_readiness: ContainerReadinessConfiguration = ContainerReadinessConfiguration()
+    container_lifecycle: ContainerLifecycleConfiguration = ContainerLifecycleConfiguration()
+    resources: ResourcesConfiguration = ResourcesConfiguration()
+    provider_logs: ProviderLogsConfiguration = ProviderLogsConfiguration()
+    scaling: ScalingConfiguration = ScalingConfiguration()
+    admission_control: AdmissionControlConfiguration = AdmissionControlConfiguration()
 
     provider_config_path: Path = Path.home() / ".beeai" / "providers.yaml"
     telemetry_config_dir: Path = Path.home() / ".beeai" / "telemetry"
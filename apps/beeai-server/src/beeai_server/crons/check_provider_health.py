@@ -0,0 +1,29 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import timedelta
+
+from beeai_server.configuration import Configuration
+from beeai_server.domain.provider.container import ProviderContainer
+from beeai_server.utils.periodic import periodic
+from kink import inject, di
+
+
+@periodic(period=timedelta(seconds=di[Configuration].provider_health.check_period_sec))
+@inject
+async def check_provider_health(configuration: Configuration, provider_container: ProviderContainer):
+    # Providers that answered a proxied request within the last period are already known to be healthy
+    await provider_container.check_health(
+        skip_if_healthy_within=timedelta(seconds=configuration.provider_health.check_period_sec)
+    )
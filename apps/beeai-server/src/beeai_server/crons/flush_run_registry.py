@@ -0,0 +1,26 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import timedelta
+
+from beeai_server.configuration import Configuration
+from beeai_server.domain.provider.container import ProviderContainer
+from beeai_server.utils.periodic import periodic
+from kink import inject, di
+
+
+@periodic(period=timedelta(seconds=di[Configuration].run_registry.flush_period_sec))
+@inject
+async def flush_run_registry(provider_container: ProviderContainer):
+    await provider_container.run_registry.flush()
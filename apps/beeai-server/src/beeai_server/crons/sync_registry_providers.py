@@ -17,11 +17,13 @@ import logging
 from asyncio import Task
 from datetime import timedelta
 from functools import partial
+from typing import Awaitable, Callable
 
 
 from beeai_server.configuration import Configuration
 from beeai_server.domain.provider.model import ProviderStatus
 from beeai_server.services.provider import ProviderService
+from beeai_server.utils.docker import PullPriority, pull_priority
 from beeai_server.utils.periodic import periodic
 from kink import inject, di
 
@@ -30,6 +32,11 @@ logger = logging.getLogger(__name__)
 preinstall_background_tasks: dict[str, Task] = {}
 
 
+async def preinstall(install: Callable[[], Awaitable[None]]):
+    pull_priority.set(PullPriority.background)  # user installs take precedence, the task has its own context
+    await install()
+
+
 @periodic(period=timedelta(seconds=di[Configuration].agent_registry.sync_period_sec))
 @inject
 async def check_registry(configuration: Configuration, provider_service: ProviderService):
@@ -79,7 +86,7 @@ async def check_registry(configuration: Configuration, provider_service: Provide
                 if provider_id in preinstall_background_tasks:
                     continue
                 install = await provider_service.install_provider(id=provider_id)
-                task = asyncio.create_task(install())
+                task = asyncio.create_task(preinstall(install))
                 preinstall_background_tasks[provider_id] = task
                 task.add_done_callback(partial(preinstall_background_tasks.pop, provider_id))
             except Exception as ex:
@@ -0,0 +1,145 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from typing import AsyncIterator
+
+from beeai_server.configuration import AdmissionControlConfiguration, AdmissionSettings
+from beeai_server.exceptions import AdmissionRejectedError
+from beeai_server.telemetry import INSTRUMENTATION_NAME
+from opentelemetry.metrics import get_meter
+from starlette.status import HTTP_429_TOO_MANY_REQUESTS, HTTP_503_SERVICE_UNAVAILABLE
+
+meter = get_meter(INSTRUMENTATION_NAME)
+queue_depth_histogram = meter.create_histogram(
+    "admission_queue_depth", description="Requests already waiting in the queue when a request arrives"
+)
+queue_wait_histogram = meter.create_histogram(
+    "admission_queue_wait_time", unit="s", description="Time spent waiting for a concurrency slot"
+)
+rejection_counter = meter.create_counter("admission_rejections", description="Requests rejected by admission control")
+
+
+class QueueFullError(Exception): ...
+
+
+class FairLimiter:
+    """Semaphore with a bounded FIFO wait queue, freed slots are handed over to waiters in arrival order."""
+
+    def __init__(self, limit: int | None, max_queue_depth: int):
+        self.limit = limit
+        self.max_queue_depth = max_queue_depth
+        self.active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _has_capacity(self) -> bool:
+        return self.limit is None or self.active < self.limit
+
+    def resize(self, limit: int | None, max_queue_depth: int) -> None:
+        self.limit, self.max_queue_depth = limit, max_queue_depth
+        while self._waiters and self._has_capacity():
+            if not (waiter := self._waiters.popleft()).done():
+                self.active += 1
+                waiter.set_result(None)
+
+    async def acquire(self, timeout: float) -> None:
+        """:raises QueueFullError, TimeoutError"""
+        if not self._waiters and self._has_capacity():
+            self.active += 1
+            return
+        if len(self._waiters) >= self.max_queue_depth:
+            raise QueueFullError()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=timeout)
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot was handed over in the meantime
+            else:
+                with suppress(ValueError):
+                    self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            if not (waiter := self._waiters.popleft()).done():
+                waiter.set_result(None)  # active count stays the same, the slot moves to the waiter
+                return
+        self.active -= 1
+
+
+class AdmissionController:
+    """
+    Bounds concurrent runs per provider and globally. Requests over the limit wait in a fair queue, requests
+    which do not fit in the queue or wait longer than the queue timeout are rejected:
+      - 429 when the provider queue is full
+      - 503 when the global queue is full or the queue timeout expires
+    """
+
+    def __init__(self, configuration: AdmissionControlConfiguration | None = None):
+        self._configuration = configuration = configuration or AdmissionControlConfiguration()
+        self.global_limiter = FairLimiter(configuration.max_concurrent_runs, configuration.max_queue_depth)
+        self.provider_limiters: dict[str, FairLimiter] = {}
+
+    def _provider_limiter(self, provider_id: str, settings: AdmissionSettings) -> FairLimiter:
+        if limiter := self.provider_limiters.get(provider_id, None):
+            if (limiter.limit, limiter.max_queue_depth) != (settings.max_concurrent_runs, settings.max_queue_depth):
+                limiter.resize(settings.max_concurrent_runs, settings.max_queue_depth)
+            return limiter
+        limiter = FairLimiter(settings.max_concurrent_runs, settings.max_queue_depth)
+        self.provider_limiters[provider_id] = limiter
+        return limiter
+
+    def forget(self, provider_id: str) -> None:
+        self.provider_limiters.pop(provider_id, None)
+
+    def _reject(self, provider_id: str, reason: str, status_code: int, message: str) -> AdmissionRejectedError:
+        rejection_counter.add(1, {"provider": provider_id, "reason": reason})
+        return AdmissionRejectedError(message, status_code=status_code, retry_after=self._configuration.retry_after_sec)
+
+    @asynccontextmanager
+    async def admit(self, provider_id: str, settings: AdmissionSettings) -> AsyncIterator[None]:
+        """Hold a concurrency slot of the provider and a global one until the context exits."""
+        if not self._configuration.enabled:
+            yield
+            return
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._configuration.queue_timeout_sec
+        start = time.perf_counter()
+        limiters = [
+            (self._provider_limiter(provider_id, settings), HTTP_429_TOO_MANY_REQUESTS, f"provider {provider_id}"),
+            (self.global_limiter, HTTP_503_SERVICE_UNAVAILABLE, "server"),
+        ]
+        async with AsyncExitStack() as exit_stack:
+            for limiter, queue_full_status, scope in limiters:
+                queue_depth_histogram.record(limiter.queued, {"provider": provider_id})
+                try:
+                    await limiter.acquire(timeout=max(deadline - loop.time(), 0))
+                except QueueFullError:
+                    raise self._reject(provider_id, "queue_full", queue_full_status, f"Too many runs for {scope}")
+                except TimeoutError:
+                    raise self._reject(
+                        provider_id, "timeout", HTTP_503_SERVICE_UNAVAILABLE, f"Timed out waiting for {scope}"
+                    )
+                exit_stack.callback(limiter.release)
+            queue_wait_histogram.record(time.perf_counter() - start, {"provider": provider_id})
+            yield
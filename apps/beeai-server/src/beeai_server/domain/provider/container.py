@@ -15,26 +15,64 @@
 import asyncio
 import functools
 import logging
-import math
-from asyncio import TimerHandle, create_task
-from collections import ChainMap
-from contextlib import asynccontextmanager
+import time
+from asyncio import create_task
+from collections import deque
+from itertools import count, islice, takewhile
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, nullcontext, suppress
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import AsyncIterator, Callable, Final, TypeVar, Mapping, Self
+from typing import AsyncIterator, Callable, Final, TypeVar, MutableMapping
 
 import httpx
-from cachetools import TTLCache
 from httpx import Response
 
-from beeai_server.adapters.interface import IEnvVariableRepository
-from beeai_server.domain.provider.model import BaseProvider, EnvVar, Agent, ProviderStatus, ProviderErrorMessage
-from beeai_server.exceptions import ProviderNotInstalledError
-from beeai_server.utils.logs_container import LogsContainer
+from beeai_server.adapters.interface import ContainerUsage, IContainerBackend, IEnvVariableRepository
+from beeai_server.configuration import (
+    AdmissionControlConfiguration,
+    ContainerResources,
+    ProviderLogsConfiguration,
+    ProviderProxyConfiguration,
+    ResourcesConfiguration,
+    ScalingConfiguration,
+    ScalingSettings,
+    WarmPoolConfiguration,
+    WarmPoolSettings,
+)
+from beeai_server.domain.provider.admission import AdmissionController
+from beeai_server.domain.provider.events import ProviderEvent, ProviderEventBus, ProviderEventType
+from beeai_server.domain.provider.log_store import ProviderLogStore
+from beeai_server.domain.provider.model import (
+    BaseProvider,
+    EnvVar,
+    Agent,
+    ManagedProvider,
+    ProviderStatus,
+    ProviderErrorMessage,
+    ProviderHealth,
+)
+from beeai_server.domain.provider.resources import ResourceScheduler
+from beeai_server.domain.provider.runs import RunRegistry, RunRoute
+from beeai_server.exceptions import ProviderNotInstalledError, ProviderUnavailableError
+from beeai_server.telemetry import INSTRUMENTATION_NAME
+from beeai_server.utils.logs_container import LogsContainer, TokenBucket
 from beeai_server.utils.utils import cancel_task, extract_messages
+from opentelemetry.metrics import get_meter
 from pydantic import BaseModel
 from structlog.contextvars import bind_contextvars, unbind_contextvars
 
 logger = logging.getLogger(__name__)
+meter = get_meter(INSTRUMENTATION_NAME)
+
+cold_start_counter = meter.create_counter(
+    "provider_cold_starts", description="Proxied requests that had to wait for a provider to start"
+)
+cold_start_duration = meter.create_histogram(
+    "provider_cold_start_duration", unit="s", description="Time proxied requests waited for a provider to start"
+)
+warm_start_counter = meter.create_counter(
+    "provider_warm_starts", description="Providers started ahead of demand by the warm pool scheduler"
+)
 
 BaseModelT = TypeVar("BaseModelT", bound=BaseModel)
 
@@ -51,26 +89,89 @@ def bind_logging_context(method: Callable) -> Callable:
     return _fn
 
 
+class _ChangeTracked:
+    """Attribute of LoadedProvider which publishes an event when its value changes."""
+
+    def __init__(self, default, event_type: ProviderEventType):
+        self._default = default
+        self._event_type = event_type
+
+    def __set_name__(self, owner, name: str):
+        self._attribute = f"_{name}"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance, self._attribute, self._default)
+
+    def __set__(self, instance: "LoadedProvider", value):
+        if getattr(instance, self._attribute, self._default) != value:
+            setattr(instance, self._attribute, value)
+            instance.publish_event(self._event_type)
+
+
+@dataclass
+class ProviderReplica:
+    index: int
+    base_url: str
+    client: httpx.AsyncClient
+    in_flight: int = 0
+    healthy: bool = True  # cleared by transport errors, replicas which are not healthy get no new requests
+
+
 class LoadedProvider:
     INITIALIZE_TIMEOUT = timedelta(seconds=30)
-    status: ProviderStatus = ProviderStatus.not_installed
-    last_error: ProviderErrorMessage | None = None
+    HEALTH_CHECK_TIMEOUT = timedelta(seconds=5)
+    USAGE_HISTORY_SIZE = 1000
+    status: ProviderStatus = _ChangeTracked(ProviderStatus.not_installed, ProviderEventType.status)
+    health: ProviderHealth = ProviderHealth.unknown
+    last_healthy_at: float | None = None
+    last_error: ProviderErrorMessage | None = _ChangeTracked(None, ProviderEventType.error)
     provider: BaseProvider
     id: str
-    missing_configuration: list[EnvVar] = []
-    runs: Mapping[str, Self]
+    missing_configuration: list[EnvVar] = _ChangeTracked([], ProviderEventType.configuration)
+    runs: MutableMapping[str, RunRoute]
 
-    def __init__(self, provider: BaseProvider, env: dict[str, str], autostart=True) -> None:
+    def __init__(
+        self,
+        provider: BaseProvider,
+        env: dict[str, str],
+        autostart=True,
+        client_limits: httpx.Limits | None = None,
+        runs: MutableMapping[str, RunRoute] | None = None,
+        logs_configuration: ProviderLogsConfiguration | None = None,
+        resource_scheduler: ResourceScheduler | None = None,
+        event_bus: ProviderEventBus | None = None,
+    ) -> None:
+        self.event_bus = event_bus
         self.provider = provider
         self.env = env
         self.id = provider.id
-        self.logs_container = LogsContainer()
+        logs_configuration = logs_configuration or ProviderLogsConfiguration()
+        self.logs_container = LogsContainer(
+            rate_limit=(
+                TokenBucket(rate=logs_configuration.max_lines_per_sec, burst=logs_configuration.burst_lines)
+                if logs_configuration.max_lines_per_sec
+                else None
+            ),
+            metric_attributes={"provider": provider.id},
+        )
         self.requests = {}
-        self._start_task = None
-        self.runs = TTLCache(maxsize=math.inf, ttl=timedelta(minutes=30).total_seconds())
+        self._start_flight: asyncio.Task | None = None
+        self._lifecycle_lock = asyncio.Lock()
+        self.runs = runs if runs is not None else RunRegistry()
         self._autostart = autostart
-        self._base_url: str | None = None
-        self._auto_stop_timeout: TimerHandle | None = None
+        self._replicas: dict[int, ProviderReplica] = {}
+        self._client_limits = client_limits or httpx.Limits()
+        self._auto_stop_task: asyncio.Task | None = None
+        self._in_flight = 0
+        self._scale_lock = asyncio.Lock()
+        self.usage: deque[float] = deque(maxlen=self.USAGE_HISTORY_SIZE)
+        self.keep_warm = False
+        self.idle_timeout: timedelta | None = provider.auto_stop_timeout
+        self.resources: ContainerResources = provider.resources
+        self.resource_usage: ContainerUsage | None = None
+        self._resource_scheduler = resource_scheduler
         self.agents = [
             Agent.model_validate(
                 {
@@ -82,6 +183,17 @@ class LoadedProvider:
             for agent in self.provider.manifest.agents
         ]
 
+    def publish_event(self, type: ProviderEventType) -> None:
+        if not self.event_bus:
+            return
+        if type == ProviderEventType.status:
+            self.event_bus.publish(type, self.id, status=self.status)
+        elif type == ProviderEventType.error:
+            self.event_bus.publish(type, self.id, message=self.last_error.message if self.last_error else None)
+        elif type == ProviderEventType.configuration:
+            missing = [var.name for var in self.missing_configuration if var.required]
+            self.event_bus.publish(type, self.id, missing_configuration=missing)
+
     # @bind_logging_context
     async def handle_reload_env(self, env: dict[str, str]) -> None:
         self.env = env
@@ -91,7 +203,12 @@ class LoadedProvider:
             await self.start()
 
     @asynccontextmanager
-    async def client(self) -> AsyncIterator[httpx.AsyncClient]:
+    async def client(self, run_id: str | None = None) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Client for a provider replica, the provider is started if necessary.
+
+        :param run_id: route the request to the replica which created the run
+        """
         bind_contextvars(provider=self.id)
         if self.status in {
             ProviderStatus.not_installed,
@@ -103,43 +220,220 @@ class LoadedProvider:
                 message = f"Cannot install agent (retry using 'beeai install <name>'): {self.last_error.message}"
             raise ProviderNotInstalledError(message)
 
-        async def _on_response(response: Response):
-            if "Run-ID" in response.headers:
-                self.runs[response.headers["Run-ID"]] = self
-            return response
-
-        if self.status not in {ProviderStatus.running, ProviderStatus.starting}:
-            await self.start()
+        self.usage.append(time.monotonic())
+        self._in_flight += 1
+        self.cancel_auto_stop()
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, timeout=5) as client:
-                await client.get("agents")
-        except BaseException as ex:
-            message = f"Restoring broken session for provider {self.id}: {extract_messages(ex)}"
-            logger.warning(message)
+            # Liveness is tracked by the health monitor, the request path only reads the cached state
+            if self.status != ProviderStatus.running:
+                await self.start(cold_start=True)
+            replica = self._select_replica(run_id)
+            replica.in_flight += 1
+            try:
+                yield replica.client
+            except httpx.TransportError as ex:
+                # a single failed request (e.g. a client disconnect) must not restart the replicas serving other runs
+                self._mark_replica_unhealthy(replica, ex)
+                raise
+            finally:
+                replica.in_flight -= 1
+        finally:
+            self._in_flight -= 1
+            self.schedule_auto_stop()
+            unbind_contextvars("provider")
+
+    def cancel_auto_stop(self):
+        if self._auto_stop_task:
+            self._auto_stop_task.cancel()
+            self._auto_stop_task = None
+
+    def schedule_auto_stop(self):
+        """Stop the provider after it was idle for idle_timeout, unless the warm pool keeps it running."""
+        if self._autostart or self.keep_warm or self._in_flight or not self.idle_timeout:
+            return
+        if self.status != ProviderStatus.running or self._auto_stop_task:
+            return
+
+        async def stop_callback():
+            await asyncio.sleep(self.idle_timeout.total_seconds())
+            self._auto_stop_task = None
+            logger.info("Stopping provider after timeout")
+            await self.stop()
+
+        self._auto_stop_task = asyncio.create_task(stop_callback())
+
+    def recent_usage(self, window: timedelta) -> int:
+        """Number of proxied requests within the last window."""
+        since = time.monotonic() - window.total_seconds()
+        return sum(1 for _ in takewhile(lambda timestamp: timestamp >= since, reversed(self.usage)))
+
+    @property
+    def replicas(self) -> list[ProviderReplica]:
+        return list(self._replicas.values())
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def _on_response(self, replica: int, response: Response) -> Response:
+        if response.status_code < 500:
+            if provider_replica := self._replicas.get(replica, None):
+                provider_replica.healthy = True
+            self.mark_healthy()
+        if "Run-ID" in response.headers:
+            self.runs[response.headers["Run-ID"]] = RunRoute(provider_id=self.id, replica=replica)
+        return response
+
+    def mark_healthy(self) -> None:
+        self.last_healthy_at = time.monotonic()
+        if self.health == ProviderHealth.healthy:
+            return
+        logger.info(f"Provider {self.id} is healthy")
+        self.health = ProviderHealth.healthy
+        if self.status == ProviderStatus.error and self._replicas:
+            self.status = ProviderStatus.running
+            self.last_error = None
+
+    def _mark_replica_unhealthy(self, replica: ProviderReplica, ex: BaseException) -> None:
+        if replica.healthy:
+            logger.warning(f"Replica {replica.index} of provider {self.id} is not responding: {extract_messages(ex)}")
+            replica.healthy = False
+
+    def mark_unhealthy(self, ex: BaseException) -> None:
+        if self.health == ProviderHealth.unhealthy:
+            return
+        message = f"Provider {self.id} is not responding: {extract_messages(ex)}"
+        logger.warning(message)
+        self.health = ProviderHealth.unhealthy
+        if self.status == ProviderStatus.running:
             self.status = ProviderStatus.error
             self.last_error = ProviderErrorMessage(message=message)
-            await self.start()
+
+    async def collect_resource_usage(self, container_backend: IContainerBackend) -> ContainerUsage | None:
+        """Sum the current resource usage of all replica containers."""
+        if not isinstance(self.provider, ManagedProvider) or not (container_ids := self.provider.container_ids):
+            self.resource_usage = None
+            return None
+        usages = await asyncio.gather(
+            *(
+                container_backend.get_container_usage(container_id=container_id)
+                for container_id in container_ids.values()
+            )
+        )
+        usages = [usage for usage in usages if usage]
+        self.resource_usage = ContainerUsage(
+            cpus=sum(usage.cpus for usage in usages), memory_bytes=sum(usage.memory_bytes for usage in usages)
+        )
+        return self.resource_usage
+
+    async def check_health(self, skip_if_healthy_within: timedelta | None = None) -> ProviderHealth:
+        """Probe the provider unless a proxied response recently confirmed it is alive."""
+        if self.status not in {ProviderStatus.running, ProviderStatus.error} or not self._replicas:
+            return self.health
+        if (
+            skip_if_healthy_within
+            and self.health == ProviderHealth.healthy
+            and self.last_healthy_at
+            and time.monotonic() - self.last_healthy_at < skip_if_healthy_within.total_seconds()
+        ):
+            return self.health
+        replicas = self.replicas
+        errors = await asyncio.gather(*(self._probe_replica(replica) for replica in replicas))
+        if all(errors):
+            self.mark_unhealthy(errors[0])
+            return self.health
+        self.mark_healthy()
+        # the provider keeps serving from the healthy replicas, idle broken replicas are replaced
+        broken = [replica.index for replica, error in zip(replicas, errors) if error and replica.index != 0]
+        if broken:
+            async with self._scale_lock:
+                for index in broken:
+                    if (replica := self._replicas.get(index, None)) and not replica.healthy and not replica.in_flight:
+                        await self._stop_replica(index)
+                        await self._start_replica(index)
+        return self.health
+
+    async def _probe_replica(self, replica: ProviderReplica) -> Exception | None:
         try:
-            async with httpx.AsyncClient(
-                base_url=self._base_url, event_hooks={"response": [_on_response]}, timeout=None
-            ) as client:
-                yield client
-        finally:
-            if not self._autostart:
-                if self._auto_stop_timeout:
-                    self._auto_stop_timeout.cancel()
+            response = await replica.client.get("agents", timeout=self.HEALTH_CHECK_TIMEOUT.total_seconds())
+            response.raise_for_status()
+        except Exception as ex:
+            self._mark_replica_unhealthy(replica, ex)
+            return ex
+        replica.healthy = True
+        return None
+
+    def _select_replica(self, run_id: str | None = None) -> ProviderReplica:
+        """Route to the replica owning the run, otherwise balance by the least outstanding requests."""
+        if not self._replicas:
+            raise ProviderUnavailableError(self.id, self.last_error.message if self.last_error else None)
+        if run_id and (route := self.runs.get(run_id, None)) and (replica := self._replicas.get(route.replica, None)):
+            return replica
+        replicas = [replica for replica in self._replicas.values() if replica.healthy] or self.replicas
+        return min(replicas, key=lambda replica: replica.in_flight)
+
+    def _add_replica(self, index: int, base_url: str) -> ProviderReplica:
+        # Pooled upstream client, connections are reused across proxied requests until the replica is stopped
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            limits=self._client_limits,
+            event_hooks={"response": [functools.partial(self._on_response, index)]},
+            timeout=None,
+        )
+        self._replicas[index] = replica = ProviderReplica(index=index, base_url=base_url, client=client)
+        return replica
 
-                # stop after timeout
-                if self.provider.auto_stop_timeout and not self._autostart:
+    async def _remove_replica(self, index: int) -> None:
+        if replica := self._replicas.pop(index, None):
+            with suppress(Exception):
+                await replica.client.aclose()
 
-                    async def stop_callback():
-                        await asyncio.sleep(self.provider.auto_stop_timeout.total_seconds())
-                        logger.info("Stopping provider after timeout")
-                        await self.stop()
+    def _reserve_resources(self, index: int) -> None:
+        if self._resource_scheduler and isinstance(self.provider, ManagedProvider):
+            self._resource_scheduler.reserve(self.id, index, self.resources)
 
-                    self._auto_stop_timeout = asyncio.create_task(stop_callback())
-                    self._auto_stop_timeout.add_done_callback(lambda task: task.cancel())
-            unbind_contextvars("provider")
+    def _release_resources(self, index: int | None = None) -> None:
+        if self._resource_scheduler:
+            self._resource_scheduler.release(self.id, index)
+
+    async def _start_replica(self, index: int) -> None:
+        try:
+            self._reserve_resources(index)
+            base_url = await self.provider.start(
+                env=self.env, logs_container=self.logs_container, replica=index, resources=self.resources
+            )
+        except Exception as ex:
+            self._release_resources(index)
+            logger.warning(f"Failed to start replica {index} of provider {self.id}: {extract_messages(ex)}")
+            return
+        if self.status != ProviderStatus.running:  # provider was stopped in the meantime
+            await self.provider.stop(replica=index)
+            self._release_resources(index)
+            return
+        self._add_replica(index, base_url)
+        logger.info(f"Started replica {index} of provider {self.id}")
+
+    async def _stop_replica(self, index: int) -> None:
+        await self._remove_replica(index)
+        await self.provider.stop(replica=index)
+        self._release_resources(index)
+        logger.info(f"Stopped replica {index} of provider {self.id}")
+
+    @bind_logging_context
+    async def scale(self, replicas: int) -> None:
+        """Start or stop additional replicas, replica 0 lives as long as the provider is running."""
+        if self.status != ProviderStatus.running or not self.provider.supports_replicas:
+            return
+        async with self._scale_lock:
+            current = len(self._replicas)
+            if replicas > current:
+                free_indexes = (index for index in count(1) if index not in self._replicas)
+                new_indexes = list(islice(free_indexes, replicas - current))
+                await asyncio.gather(*(self._start_replica(index) for index in new_indexes))
+            elif replicas < current:
+                idle = [r.index for r in self._replicas.values() if r.index != 0 and not r.in_flight]
+                for index in sorted(idle, reverse=True)[: current - max(replicas, 1)]:
+                    await self._stop_replica(index)
 
     def _with_id(self, objects: list[BaseModelT]) -> list[BaseModelT]:
         for obj in objects:
@@ -154,7 +448,9 @@ class LoadedProvider:
             self.status = ProviderStatus.installing
             logger.info(f"Installing provider {self.id}")
             self.logs_container.clear()
-            await self.provider.install(logs_container=logs_container or self.logs_container)
+            logs_container = logs_container or self.logs_container
+            with self.event_bus.forward_install_logs(self.id, logs_container) if self.event_bus else nullcontext():
+                await self.provider.install(logs_container=logs_container)
             self.logs_container.clear()
             self.status = ProviderStatus.ready
         except Exception as ex:
@@ -168,48 +464,89 @@ class LoadedProvider:
         self.status = ProviderStatus.not_installed
 
     @bind_logging_context
-    async def start(self):
-        if self.status == ProviderStatus.starting:
-            logger.warning("Provider is already starting")
-            await self._start_task
-            return
-
-        if self.status not in {ProviderStatus.ready, ProviderStatus.error}:
-            logger.warning(f"Attempting to start provider that is not in a ready state: {self.status}")
-            return
-        if not await self.provider.is_installed():
-            logger.warning("Provider was uninstalled externally. Resetting state to 'not_installed'")
-            self.status = ProviderStatus.not_installed
+    async def start(self, cold_start: bool = False):
+        """
+        Start the provider, concurrent calls are coalesced into a single start which all callers share.
+
+        The start runs in its own task, so a caller which gets cancelled does not abort it for the others,
+        only stop() does.
+        """
+        if self.status == ProviderStatus.running:
             return
-        await self.stop()
+        if not (flight := self._start_flight):
+            flight = self._start_flight = asyncio.create_task(self._start(cold_start=cold_start))
+            flight.add_done_callback(self._clear_start_flight)
+        else:
+            logger.debug("Provider is already starting")
         try:
-            self.status = ProviderStatus.starting
-            self.missing_configuration = self.provider.check_env(env=self.env)
-            self._start_task = asyncio.create_task(
-                self.provider.start(env=self.env, logs_container=self.logs_container)
-            )
-            self._base_url = await self._start_task
-            self.status = ProviderStatus.running
-        except BaseException as ex:
-            self.last_error = ProviderErrorMessage(message=f"Error connecting to provider: {extract_messages(ex)}")
-            self.status = ProviderStatus.error
+            await asyncio.shield(flight)
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling() or not flight.cancelled():
+                raise
+            # the start was aborted by stop(), the status tells the caller the outcome
+
+    def _clear_start_flight(self, flight: asyncio.Task) -> None:
+        if self._start_flight is flight:
+            self._start_flight = None
+
+    async def _start(self, cold_start: bool = False):
+        async with self._lifecycle_lock:
+            if self.status not in {ProviderStatus.ready, ProviderStatus.error}:
+                logger.warning(f"Attempting to start provider that is not in a ready state: {self.status}")
+                return
+            if not await self.provider.is_installed():
+                logger.warning("Provider was uninstalled externally. Resetting state to 'not_installed'")
+                self.status = ProviderStatus.not_installed
+                return
+            await self._stop()
+            start_time = time.perf_counter()
+            try:
+                self.status = ProviderStatus.starting
+                self.missing_configuration = self.provider.check_env(env=self.env)
+                self._reserve_resources(0)
+                base_url = await self.provider.start(
+                    env=self.env, logs_container=self.logs_container, resources=self.resources
+                )
+                self._add_replica(0, base_url)
+                self.status = ProviderStatus.running
+                self.mark_healthy()
+            except asyncio.CancelledError:
+                await self._stop()
+                self.status = ProviderStatus.ready
+                raise
+            except Exception as ex:
+                self.last_error = ProviderErrorMessage(message=f"Error connecting to provider: {extract_messages(ex)}")
+                self.status = ProviderStatus.error
+                await self._stop()
+                return
+            if cold_start:
+                cold_start_counter.add(1, {"provider": self.id})
+                cold_start_duration.record(time.perf_counter() - start_time, {"provider": self.id})
 
     @bind_logging_context
     async def stop(self):
+        """Stop the provider, a start in progress is aborted."""
+        self.cancel_auto_stop()
+        if flight := self._start_flight:
+            await cancel_task(flight)
+        async with self._lifecycle_lock:
+            await self._stop()
+
+    async def _stop(self):
+        self.cancel_auto_stop()
         try:
-            if self._start_task:
-                if self.status == ProviderStatus.starting:
-                    await cancel_task(self._start_task)
-                else:
-                    await self._start_task
             await self.provider.stop()
         except BaseException as ex:
             logger.warning(f"Exception occurred when stopping session: {ex!r}")
+        self._release_resources()
+        self.resource_usage = None
 
-        if self.status == self.status.running:
+        if self.status in {ProviderStatus.running, ProviderStatus.starting}:
             self.status = ProviderStatus.ready
 
-        self._start_task = None
+        self.health = ProviderHealth.unknown
+        for index in list(self._replicas):
+            await self._remove_replica(index)
 
     @bind_logging_context
     async def initialize(self):
@@ -238,53 +575,238 @@ class ProviderContainer:
     """
 
     RELOAD_PERIOD: Final = timedelta(minutes=1)
+    CHANGE_LOG_SIZE: Final = 1000
 
     def __init__(
         self,
         env_repository: IEnvVariableRepository,
         autostart_providers: bool = True,
+        proxy_configuration: ProviderProxyConfiguration | None = None,
+        run_registry: RunRegistry | None = None,
+        warm_pool_configuration: WarmPoolConfiguration | None = None,
+        scaling_configuration: ScalingConfiguration | None = None,
+        admission_configuration: AdmissionControlConfiguration | None = None,
+        logs_configuration: ProviderLogsConfiguration | None = None,
+        log_store: ProviderLogStore | None = None,
+        resources_configuration: ResourcesConfiguration | None = None,
     ):
         self.loaded_providers: dict[str, LoadedProvider] = {}
+        self._agent_index: dict[str, LoadedProvider] = {}
+        # Incremented on every change visible in provider listings (status, error, env, added or removed provider)
+        self.version = 0
+        self._changes: deque[tuple[int, str | None]] = deque(maxlen=self.CHANGE_LOG_SIZE)
+        self._changed = asyncio.Event()
+        self.events = ProviderEventBus()
+        self.events.subscribe(self._on_event)
+        self.run_registry = run_registry or RunRegistry()
+        self._warm_pool = warm_pool_configuration or WarmPoolConfiguration()
+        self._scaling = scaling_configuration or ScalingConfiguration()
+        self._admission = admission_configuration or AdmissionControlConfiguration()
+        self.admission = AdmissionController(self._admission)
+        self._logs_configuration = logs_configuration or ProviderLogsConfiguration()
+        self.log_store = log_store
+        self._resources = resources_configuration or ResourcesConfiguration()
+        self.resource_scheduler = ResourceScheduler(self._resources)
         self._env_repository = env_repository
         self._env: dict[str, str] | None = None
         self._autostart = autostart_providers
+        proxy_configuration = proxy_configuration or ProviderProxyConfiguration()
+        self._client_limits = httpx.Limits(
+            max_connections=proxy_configuration.max_connections,
+            max_keepalive_connections=proxy_configuration.max_keepalive_connections,
+            keepalive_expiry=proxy_configuration.keepalive_expiry_sec,
+        )
+
+    def notify_change(self, provider_id: str | None = None) -> None:
+        """Record a change of the provider, None marks a change affecting all providers."""
+        self.version += 1
+        self._changes.append((self.version, provider_id))
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def changes_since(self, version: int, until: int | None = None) -> set[str] | None:
+        """
+        Ids of providers changed after the version (up to and including until) or None if the change log does not
+        cover all changes.
+        """
+        if version > self.version or (version < self.version and self._changes[0][0] > version + 1):
+            return None
+        changed = set()
+        for change_version, provider_id in reversed(self._changes):
+            if change_version <= version:
+                break
+            if until is not None and change_version > until:
+                continue
+            if provider_id is None:
+                return None
+            changed.add(provider_id)
+        return changed
+
+    async def wait_for_change(self, version: int) -> None:
+        while self.version == version:
+            await self._changed.wait()
+
+    def _on_event(self, event: ProviderEvent) -> None:
+        if event.type != ProviderEventType.install_progress:
+            self.notify_change(event.provider_id)
 
     def get_provider_by_agent(self, agent_name: str) -> LoadedProvider:
-        providers = [
-            loaded_provider
-            for loaded_provider in self.loaded_providers.values()
-            if agent_name in {a.name for a in loaded_provider.agents}
-        ]
-        if not providers:
-            raise ValueError(f"Agent {agent_name} not found")
-        return providers[0]
+        if provider := self._agent_index.get(agent_name, None):
+            return provider
+        raise ValueError(f"Agent {agent_name} not found")
 
     def get_provider_by_run(self, run_id: str) -> LoadedProvider:
-        provider = ChainMap(*(provider.runs for provider in self.loaded_providers.values())).get(run_id, None)
-        if provider:
+        route = self.run_registry.get(run_id, None)
+        if route and (provider := self.loaded_providers.get(route.provider_id, None)):
             return provider
         raise ValueError(f"Run {run_id} not found")
 
+    def _index_agents(self, provider: LoadedProvider):
+        # the first registered provider serving an agent name keeps routing it
+        for agent in provider.agents:
+            self._agent_index.setdefault(agent.name, provider)
+
+    def _unindex_agents(self, provider: LoadedProvider):
+        for agent in provider.agents:
+            if self._agent_index.get(agent.name, None) is not provider:
+                continue
+            # Fall back to the next registered provider serving the same agent name
+            fallback = next(
+                (p for p in self.loaded_providers.values() if agent.name in {a.name for a in p.agents}),
+                None,
+            )
+            if fallback:
+                self._agent_index[agent.name] = fallback
+            else:
+                del self._agent_index[agent.name]
+
     async def add(self, provider: BaseProvider):
         env = await self._env_repository.get_all()
-        self.loaded_providers[provider.id] = LoadedProvider(
+        loaded_provider = LoadedProvider(
             provider,
             env=provider.extract_env(env),
             autostart=self._autostart,
+            client_limits=self._client_limits,
+            runs=self.run_registry,
+            logs_configuration=self._logs_configuration,
+            resource_scheduler=self.resource_scheduler,
+            event_bus=self.events,
         )
-        await self.loaded_providers[provider.id].initialize()
+        # configured overrides take precedence over the manifest, defaults apply to values set by neither
+        override = self._provider_settings(loaded_provider, self._resources.providers, None)
+        loaded_provider.resources = self._resources.default.merge(provider.resources).merge(override)
+        self.loaded_providers[provider.id] = loaded_provider
+        self.events.publish(ProviderEventType.added, provider.id)
+        if self.log_store:
+            self.log_store.attach(provider.id, loaded_provider.logs_container)
+        self._index_agents(loaded_provider)
+        self._apply_warm_pool_settings(loaded_provider)
+        await loaded_provider.initialize()
 
     async def remove(self, provider: BaseProvider):
         provider = self.loaded_providers.pop(provider.id)
+        provider.event_bus = None  # changes during close belong to a provider which is no longer listed
+        self.events.publish(ProviderEventType.removed, provider.id)
+        self._unindex_agents(provider)
+        self.admission.forget(provider.id)
         await provider.close()
+        if self.log_store:
+            self.log_store.detach(provider.id, provider.logs_container)
 
     async def add_or_replace(self, provider: BaseProvider):
         if provider.id in self.loaded_providers:
             await self.remove(provider)
         await self.add(provider)
 
+    @staticmethod
+    def _provider_settings(
+        provider: LoadedProvider, settings: dict[str, BaseModelT], default: BaseModelT
+    ) -> BaseModelT:
+        for key in (provider.id, provider.provider.location, *(agent.name for agent in provider.agents)):
+            if provider_settings := settings.get(key, None):
+                return provider_settings
+        return default
+
+    def _apply_warm_pool_settings(self, provider: LoadedProvider) -> WarmPoolSettings:
+        settings = self._provider_settings(provider, self._warm_pool.providers, self._warm_pool.default)
+        if settings.max_idle_sec is not None:
+            provider.idle_timeout = timedelta(seconds=settings.max_idle_sec)
+        return settings
+
+    async def schedule_warm_pool(self):
+        """
+        Keep providers running ahead of demand:
+          - providers configured with min_warm > 0 are always kept running
+          - providers with at least `predictive_min_requests` requests in the last `usage_window_sec` are predicted
+            to be used again and kept running as well
+          - all other providers are stopped after being idle for their max_idle_sec (auto_stop_timeout by default)
+        """
+        if self._autostart or not self._warm_pool.enabled:
+            return
+        window = timedelta(seconds=self._warm_pool.usage_window_sec)
+        to_start = []
+        for provider in list(self.loaded_providers.values()):
+            settings = self._apply_warm_pool_settings(provider)
+            predicted = provider.recent_usage(window) >= self._warm_pool.predictive_min_requests
+            was_warm, provider.keep_warm = provider.keep_warm, settings.min_warm > 0 or predicted
+            if provider.keep_warm:
+                provider.cancel_auto_stop()
+                if provider.status in {ProviderStatus.ready, ProviderStatus.error}:
+                    to_start.append(provider)
+            elif was_warm:
+                logger.info(f"Provider {provider.id} is no longer kept warm")
+                provider.schedule_auto_stop()
+
+        async def prewarm(provider: LoadedProvider):
+            logger.info(f"Pre-starting provider {provider.id}")
+            await provider.start()
+            warm_start_counter.add(1, {"provider": provider.id})
+
+        await asyncio.gather(*(prewarm(provider) for provider in to_start))
+
+    def admit(self, provider: LoadedProvider) -> AbstractAsyncContextManager[None]:
+        """Admission control for a new or resumed run, the slot is held until the context exits."""
+        settings = self._provider_settings(provider, self._admission.providers, self._admission.default)
+        return self.admission.admit(provider.id, settings)
+
+    async def autoscale(self):
+        """
+        Scale running providers between min_replicas and max_replicas, targeting
+        target_in_flight_per_replica in-flight requests for each replica. Only idle replicas are scaled down.
+        """
+        to_scale = []
+        for provider in list(self.loaded_providers.values()):
+            if provider.status != ProviderStatus.running or not provider.provider.supports_replicas:
+                continue
+            settings: ScalingSettings = self._provider_settings(
+                provider, self._scaling.providers, self._scaling.default
+            )
+            desired = -(-provider.in_flight // settings.target_in_flight_per_replica)
+            desired = max(settings.min_replicas, min(settings.max_replicas, desired))
+            if desired != len(provider.replicas):
+                to_scale.append(provider.scale(desired))
+        await asyncio.gather(*to_scale)
+
+    async def collect_resource_usage(self, container_backend: IContainerBackend):
+        await asyncio.gather(
+            *(
+                loaded_provider.collect_resource_usage(container_backend)
+                for loaded_provider in list(self.loaded_providers.values())
+            ),
+            return_exceptions=True,
+        )
+
+    async def check_health(self, skip_if_healthy_within: timedelta | None = None):
+        await asyncio.gather(
+            *(
+                loaded_provider.check_health(skip_if_healthy_within=skip_if_healthy_within)
+                for loaded_provider in list(self.loaded_providers.values())
+            )
+        )
+
     async def handle_reload_on_env_update(self):
         self._env = await self._env_repository.get_all()
+        self.notify_change()  # missing configuration of providers which are not loaded depends on the env
         await asyncio.gather(
             *(
                 loaded_provider.handle_reload_env(env=loaded_provider.provider.extract_env(self._env))
@@ -293,6 +815,8 @@ class ProviderContainer:
         )
 
     async def __aenter__(self):
+        if self.log_store:
+            await self.log_store.__aenter__()
         for provider in self.loaded_providers.values():
             await provider.initialize()
         return self
@@ -301,5 +825,11 @@ class ProviderContainer:
         try:
             await asyncio.gather(*(provider.stop() for provider in self.loaded_providers.values()))
             self.loaded_providers = {}
+            self._agent_index = {}
+            self.notify_change()
+            await self.run_registry.flush()
+            self.run_registry.close()
+            if self.log_store:
+                await self.log_store.__aexit__(exc_type, exc_val, exc_tb)
         except Exception as ex:
             logger.critical(f"Exception occurred during provider container cleanup: {ex}")
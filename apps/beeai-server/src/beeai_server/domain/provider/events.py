@@ -0,0 +1,138 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from enum import StrEnum
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Collection, Iterator, Sequence
+
+from pydantic import BaseModel, Field
+
+from beeai_server.custom_types import ID
+from beeai_server.utils.logs_container import LogRecord, LogsContainer
+
+
+class ProviderEventType(StrEnum):
+    added = "added"
+    removed = "removed"
+    status = "status"
+    error = "error"
+    configuration = "configuration"
+    install_progress = "install_progress"
+    # events were dropped before the subscriber read them or the resumed stream is unknown (e.g. after a server
+    # restart, data has "reset": true), the client should re-read the providers
+    gap = "gap"
+
+
+class ProviderEvent(BaseModel):
+    seq: int
+    type: ProviderEventType
+    provider_id: ID | None = None
+    time: float = Field(default_factory=time.time)
+    data: dict[str, Any] = Field(default_factory=dict)
+
+
+ProviderEventHandler = Callable[[ProviderEvent], None]
+
+
+class ProviderEventBus:
+    """
+    In-memory bus of provider events. Handlers are called synchronously on publish, streams read the events from a
+    ring buffer of recent events, so a subscriber can resume after a reconnect using the id of the last event it
+    received. Event ids are prefixed with the bus instance, sequence numbers restart with the server.
+    """
+
+    def __init__(self, max_events: int = 1000):
+        self._events: deque[ProviderEvent] = deque(maxlen=max_events)
+        self._next_seq = 0
+        self._instance_id = uuid.uuid4().hex[:8]
+        self._new_events = asyncio.Event()
+        self._handlers: list[ProviderEventHandler] = []
+
+    def event_id(self, seq: int) -> str:
+        return f"{self._instance_id}-{seq}"
+
+    def parse_event_id(self, event_id: str | None) -> int | None:
+        """Sequence number of the event id or None if it was issued by another bus instance."""
+        prefix, _, seq = (event_id or "").rpartition("-")
+        return int(seq) if prefix == self._instance_id and seq.isdigit() else None
+
+    def subscribe(self, handler: ProviderEventHandler) -> None:
+        self._handlers.append(handler)
+
+    def unsubscribe(self, handler: ProviderEventHandler) -> None:
+        self._handlers.remove(handler)
+
+    def publish(self, type: ProviderEventType, provider_id: ID | None = None, **data) -> ProviderEvent:
+        event = ProviderEvent(seq=self._next_seq, type=type, provider_id=provider_id, data=data)
+        self._next_seq += 1
+        self._events.append(event)
+        for handler in self._handlers:
+            handler(event)
+        self._new_events.set()
+        self._new_events = asyncio.Event()
+        return event
+
+    @contextmanager
+    def forward_install_logs(self, provider_id: ID, logs_container: LogsContainer) -> Iterator[None]:
+        """Publish install_progress events with the lines added to the logs container."""
+
+        def handle_batch(batch: Sequence[LogRecord]):
+            self.publish(
+                ProviderEventType.install_progress,
+                provider_id,
+                lines=[{"stream": record.stream, "message": record.message} for record in batch],
+            )
+
+        logs_container.subscribe(handle_batch)
+        try:
+            yield
+        finally:
+            logs_container.unsubscribe(handle_batch)
+
+    async def stream(
+        self,
+        provider_ids: Collection[ID] | None = None,
+        last_seq: int | None = None,
+        last_event_id: str | None = None,
+    ) -> AsyncIterator[ProviderEvent]:
+        """
+        Stream new events (or events after last_seq / last_event_id) of the given providers, events of all providers
+        if None. A gap event with "reset": true is sent first when the stream to resume is unknown.
+        """
+        if last_event_id is not None:
+            last_seq = self.parse_event_id(last_event_id)
+            reset = last_seq is None
+        else:
+            reset = False
+        reset = reset or (last_seq is not None and last_seq >= self._next_seq)
+        cursor = self._next_seq if last_seq is None or reset else last_seq + 1
+        if reset:
+            yield ProviderEvent(seq=cursor - 1, type=ProviderEventType.gap, data={"reset": True})
+        while True:
+            while cursor >= self._next_seq:
+                await self._new_events.wait()
+            first_seq = self._next_seq - len(self._events)
+            if cursor < first_seq:
+                yield ProviderEvent(seq=first_seq - 1, type=ProviderEventType.gap, data={"missed": first_seq - cursor})
+                cursor = first_seq
+            # copy the batch, the buffer can change while the consumer processes yielded events
+            for event in list(islice(self._events, cursor - first_seq, None)):
+                cursor = event.seq + 1
+                if provider_ids is None or event.provider_id is None or event.provider_id in provider_ids:
+                    yield event
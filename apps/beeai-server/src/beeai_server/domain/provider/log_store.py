@@ -0,0 +1,216 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import bisect
+import itertools
+import logging
+import re
+import struct
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Sequence
+
+import anyio
+import anyio.to_thread
+
+from beeai_server.configuration import LogStoreConfiguration
+from beeai_server.custom_types import ID
+from beeai_server.utils.logs_container import LogRecord, LogsContainer, LogSubscriber, ProcessLogType
+from beeai_server.utils.utils import cancel_task
+
+logger = logging.getLogger(__name__)
+
+# Sparse index entry: timestamp of the first record of a written batch and its byte offset in the segment
+_INDEX_ENTRY = struct.Struct("<dQ")
+
+
+@dataclass
+class _Segment:
+    path: Path
+    size: int
+    indexed_at: int | None = None  # offset of the last index entry
+
+
+def _escape(message: str) -> str:
+    return message.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _unescape(message: str) -> str:
+    return re.sub(r"\\(.)", lambda match: "\n" if match.group(1) == "n" else match.group(1), message)
+
+
+class ProviderLogStore:
+    """
+    Append-only on-disk store of provider logs.
+
+    Every provider has a directory of segments named by the timestamp of their first record. A segment holds one
+    record per line (`time seq stream message` separated by tabs) and is rotated once it reaches
+    segment_max_bytes, the oldest segments are deleted above max_bytes_per_provider. Each segment has a sparse
+    index of (timestamp, offset) pairs, so time-range queries seek close to the first matching record and stream
+    the rest of the range without loading it into memory.
+
+    Records of attached logs containers are buffered in memory and written in batches by a background task.
+    """
+
+    SEGMENT_SUFFIX = ".log"
+    INDEX_SUFFIX = ".idx"
+    QUERY_BATCH_SIZE = 500
+
+    def __init__(self, directory: Path, configuration: LogStoreConfiguration | None = None):
+        self.directory = directory
+        self.configuration = configuration or LogStoreConfiguration()
+        self._pending: dict[ID, list[LogRecord]] = defaultdict(list)
+        self._handlers: dict[tuple[ID, int], LogSubscriber] = {}
+        self._segments: dict[ID, _Segment] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "ProviderLogStore":
+        self._flush_task = asyncio.create_task(self._flush_periodically())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await cancel_task(self._flush_task)
+        self._flush_task = None
+        await self.flush()
+
+    def attach(self, provider_id: ID, logs_container: LogsContainer):
+        def handle_batch(batch: Sequence[LogRecord]):
+            self._pending[provider_id].extend(batch)
+
+        self._handlers[provider_id, id(logs_container)] = handle_batch
+        logs_container.subscribe(handle_batch)
+
+    def detach(self, provider_id: ID, logs_container: LogsContainer):
+        if handler := self._handlers.pop((provider_id, id(logs_container)), None):
+            logs_container.unsubscribe(handler)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.configuration.flush_interval_sec)
+            try:
+                await self.flush()
+            except Exception as ex:
+                logger.warning(f"Failed to write provider logs: {ex!r}")
+
+    async def flush(self):
+        async with self._flush_lock:
+            pending, self._pending = self._pending, defaultdict(list)
+            if pending:
+                await anyio.to_thread.run_sync(self._write, pending)
+
+    def _provider_dir(self, provider_id: ID) -> Path:
+        return self.directory / re.sub(r"[^\w.-]", "_", str(provider_id))
+
+    def _list_segments(self, provider_dir: Path) -> list[Path]:
+        return sorted(provider_dir.glob(f"*{self.SEGMENT_SUFFIX}"))
+
+    def _write(self, pending: dict[ID, list[LogRecord]]):
+        for provider_id, records in pending.items():
+            segment = self._segments.get(provider_id) or self._open_segment(provider_id, records[0].time)
+            if segment.size >= self.configuration.segment_max_bytes:
+                segment = self._open_segment(provider_id, records[0].time, rotate=True)
+            data = "".join(
+                f"{record.time:.6f}\t{record.seq}\t{record.stream}\t{_escape(record.message)}\n" for record in records
+            ).encode()
+            if (
+                segment.indexed_at is None
+                or segment.size - segment.indexed_at >= self.configuration.index_interval_bytes
+            ):
+                with open(segment.path.with_suffix(self.INDEX_SUFFIX), "ab") as index:
+                    index.write(_INDEX_ENTRY.pack(records[0].time, segment.size))
+                segment.indexed_at = segment.size
+            with open(segment.path, "ab") as file:
+                file.write(data)
+            segment.size += len(data)
+
+    def _open_segment(self, provider_id: ID, timestamp: float, rotate: bool = False) -> _Segment:
+        provider_dir = self._provider_dir(provider_id)
+        provider_dir.mkdir(parents=True, exist_ok=True)
+        segments = self._list_segments(provider_dir)
+        if segments and not rotate:
+            # continue the last segment after restart, the next write adds an index entry
+            segment = _Segment(path=segments[-1], size=segments[-1].stat().st_size)
+        else:
+            path = provider_dir / f"{int(timestamp * 1_000_000):020d}{self.SEGMENT_SUFFIX}"
+            segment = _Segment(path=path, size=0)
+            self._enforce_retention([*segments, path])
+        self._segments[provider_id] = segment
+        return segment
+
+    def _enforce_retention(self, segments: list[Path]):
+        total = 0
+        for path in reversed(segments):
+            if path.exists():
+                total += path.stat().st_size
+            if total > self.configuration.max_bytes_per_provider:
+                path.unlink(missing_ok=True)
+                path.with_suffix(self.INDEX_SUFFIX).unlink(missing_ok=True)
+
+    def _seek_offset(self, segment: Path, since: float | None) -> int:
+        index_path = segment.with_suffix(self.INDEX_SUFFIX)
+        if since is None or not index_path.exists():
+            return 0
+        data = index_path.read_bytes()
+        entries = list(_INDEX_ENTRY.iter_unpack(data[: len(data) - len(data) % _INDEX_ENTRY.size]))
+        position = bisect.bisect_right([timestamp for timestamp, _ in entries], since) - 1
+        return entries[position][1] if position >= 0 else 0
+
+    def _scan(
+        self, provider_id: ID, since: float | None, until: float | None, pattern: re.Pattern | None
+    ) -> Iterator[LogRecord]:
+        segments = self._list_segments(self._provider_dir(provider_id))
+        starts = [int(segment.stem) / 1_000_000 for segment in segments]
+        for i, segment in enumerate(segments):
+            if until is not None and starts[i] > until:
+                return
+            if since is not None and i + 1 < len(segments) and starts[i + 1] < since:
+                continue  # the whole segment is older than the range
+            try:
+                file = open(segment, "rb")
+            except FileNotFoundError:
+                continue  # removed by retention
+            with file:
+                file.seek(self._seek_offset(segment, since))
+                for line in file:
+                    try:
+                        timestamp, seq, stream, message = line.decode(errors="replace").rstrip("\n").split("\t", 3)
+                        timestamp = float(timestamp)
+                    except ValueError:
+                        continue  # incomplete line written before a crash
+                    if since is not None and timestamp < since:
+                        continue
+                    if until is not None and timestamp > until:
+                        return
+                    message = _unescape(message)
+                    if pattern and not pattern.search(message):
+                        continue
+                    yield LogRecord(stream=ProcessLogType(stream), message=message, time=timestamp, seq=int(seq))
+
+    async def query(
+        self,
+        provider_id: ID,
+        *,
+        since: float | None = None,
+        until: float | None = None,
+        grep: re.Pattern | None = None,
+    ) -> AsyncIterator[LogRecord]:
+        """Stream stored records of the provider in the time range, optionally filtered by a regex."""
+        await self.flush()
+        records = self._scan(provider_id, since, until, grep)
+        while batch := await anyio.to_thread.run_sync(list, itertools.islice(records, self.QUERY_BATCH_SIZE)):
+            for record in batch:
+                yield record
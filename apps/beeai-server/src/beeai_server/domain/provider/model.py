@@ -20,33 +20,38 @@ from abc import abstractmethod
 from contextlib import suppress, AsyncExitStack
 from datetime import timedelta
 from enum import StrEnum
-from typing import Any, Optional, Self
+from typing import Any, ClassVar, Optional, Self
 
 from acp_sdk.models import Agent as AcpAgent, Metadata as AcpMetadata
-from functools import cached_property
+from functools import cached_property, lru_cache
 
 import yaml
 from aiodocker import DockerError
 
 from beeai_server.adapters.interface import IContainerBackend
-from beeai_server.configuration import Configuration
+from beeai_server.configuration import Configuration, ContainerLifecycleMode, ContainerResources
 from beeai_server.custom_types import ID
 from beeai_server.domain.constants import DOCKER_MANIFEST_LABEL_NAME, LOCAL_IMAGE_REGISTRY
 from beeai_server.domain.registry import RegistryLocation
-from beeai_server.exceptions import MissingConfigurationError, retry_if_exception_grp_type
+from beeai_server.exceptions import MissingConfigurationError
 from beeai_server.telemetry import OTEL_HTTP_ENDPOINT
 from beeai_server.utils.docker import DockerImageID, get_registry_image_config_and_labels, replace_localhost_url
 from beeai_server.utils.github import ResolvedGithubUrl, GithubUrl
 from beeai_server.utils.logs_container import LogsContainer
 from beeai_server.utils.process import find_free_port
-from httpx import HTTPError, AsyncClient
+from httpx import AsyncClient
 from kink import inject
 from pydantic import AnyUrl, BaseModel, Field, PrivateAttr, computed_field, RootModel, AnyHttpUrl
-from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def decode_manifest_label(label: str) -> dict[str, Any]:
+    """Decode the base64 yaml manifest label, labels of the same image are decoded only once."""
+    return yaml.safe_load(base64.b64decode(label))
+
+
 class EnvVar(BaseModel):
     name: str
     description: str | None = None
@@ -57,6 +62,9 @@ class Metadata(AcpMetadata):
     env: list[EnvVar] = Field(default_factory=list, description="For configuration -- passed to the process")
     ui: dict[str, Any] | None = None
     provider: str | None = None
+    resources: ContainerResources | None = Field(
+        default=None, description="Resource requests and limits of the provider container"
+    )
 
 
 class Agent(AcpAgent, extra="allow"):
@@ -122,7 +130,7 @@ class GithubProviderSource(BaseProviderSource):
         labels = await container_backend.extract_labels(image=self.image_id)
         if DOCKER_MANIFEST_LABEL_NAME not in labels:
             raise ValueError(f"Docker image labels must contain 'beeai.dev.agent.yaml': {self.location}")
-        return ProviderManifest.model_validate(yaml.safe_load(base64.b64decode(labels[DOCKER_MANIFEST_LABEL_NAME])))
+        return ProviderManifest.model_validate(decode_manifest_label(labels[DOCKER_MANIFEST_LABEL_NAME]))
 
 
 class DockerImageProviderSource(BaseProviderSource):
@@ -140,7 +148,7 @@ class DockerImageProviderSource(BaseProviderSource):
             _, labels = await get_registry_image_config_and_labels(self.location)
         if DOCKER_MANIFEST_LABEL_NAME not in labels:
             raise ValueError(f"Docker image labels must contain 'beeai.dev.agent.yaml': {self.location}")
-        return ProviderManifest.model_validate(yaml.safe_load(base64.b64decode(labels[DOCKER_MANIFEST_LABEL_NAME])))
+        return ProviderManifest.model_validate(decode_manifest_label(labels[DOCKER_MANIFEST_LABEL_NAME]))
 
     @inject
     async def install(self, container_backend: IContainerBackend, logs_container: LogsContainer | None = None):
@@ -175,6 +183,7 @@ class BaseProvider(BaseModel, abc.ABC):
     source: UnmanagedProviderSource | ManagedProviderSource
     registry: RegistryLocation | None = None
     persistent: bool = True
+    supports_replicas: ClassVar[bool] = False
 
     @computed_field()
     @cached_property
@@ -200,6 +209,17 @@ class BaseProvider(BaseModel, abc.ABC):
     def env(self):
         return [EnvVar.model_validate(env) for agent in self.manifest.agents for env in agent.metadata.env]
 
+    @cached_property
+    def resources(self) -> ContainerResources:
+        """Resources declared by the agents, agents share the container so the largest values apply."""
+        values = {}
+        for agent in self.manifest.agents:
+            for field, value in (
+                (agent.metadata.resources or ContainerResources()).model_dump(exclude_none=True).items()
+            ):
+                values[field] = value if isinstance(value, str) else max(value, values.get(field, value))
+        return ContainerResources(**values)
+
     def check_env(self, env: dict[str, str] | None = None, raise_error: bool = True) -> list[EnvVar]:
         required_env = {var.name for var in self.env if var.required}
         all_env = {var.name for var in self.env}
@@ -230,15 +250,19 @@ class BaseProvider(BaseModel, abc.ABC):
         env: dict[str, str] | None = None,
         with_dummy_env: bool = True,
         logs_container: Optional["LogsContainer"] = None,
+        replica: int = 0,
+        resources: ContainerResources | None = None,
     ) -> str:
         """
         :param env: environment values passed to the process
         :param with_dummy_env: substitute all unfilled required variables from manifest by "dummy" value
         :param logs_container: capture logs of the provider process (if managed)
+        :param replica: index of the replica to start (if replicas are supported)
+        :param resources: resource limits of the provider process (if managed)
         """
 
-    async def stop(self):
-        pass
+    async def stop(self, replica: int | None = None):
+        """:param replica: index of the replica to stop, all replicas are stopped by default"""
 
     async def __aenter__(self):
         return await self.start()
@@ -250,7 +274,10 @@ class BaseProvider(BaseModel, abc.ABC):
 class ManagedProvider(BaseProvider, extra="allow"):
     source: ManagedProviderSource
     auto_stop_timeout: timedelta | None = Field(timedelta(minutes=5), exclude=True)
-    _container_exit_stack: AsyncExitStack = PrivateAttr(default_factory=AsyncExitStack)
+    supports_replicas: ClassVar[bool] = True
+    _container_exit_stacks: dict[int, AsyncExitStack] = PrivateAttr(default_factory=dict)
+    _container_ports: dict[int, str] = PrivateAttr(default_factory=dict)
+    _container_ids: dict[int, str] = PrivateAttr(default_factory=dict)
 
     @computed_field
     @property
@@ -276,8 +303,22 @@ class ManagedProvider(BaseProvider, extra="allow"):
             "PLATFORM_URL": "http://host.docker.internal:8333",
         }
 
-    async def stop(self):
-        await self._container_exit_stack.aclose()
+    def _container_name(self, replica: int) -> str | None:
+        if not replica:
+            return None  # keep the default container name of the backend
+        return f"{self.image_id.repository.replace('/', '-')}-replica-{replica}"
+
+    @property
+    def container_ids(self) -> dict[int, str]:
+        """Ids of running containers by replica"""
+        return dict(self._container_ids)
+
+    async def stop(self, replica: int | None = None):
+        replicas = list(self._container_exit_stacks) if replica is None else [replica]
+        for replica in replicas:
+            self._container_ids.pop(replica, None)
+            if exit_stack := self._container_exit_stacks.pop(replica, None):
+                await exit_stack.aclose()
 
     @inject
     async def start(
@@ -288,6 +329,8 @@ class ManagedProvider(BaseProvider, extra="allow"):
         env: dict[str, str] | None = None,
         with_dummy_env: bool = True,
         logs_container: LogsContainer | None = None,
+        replica: int = 0,
+        resources: ContainerResources | None = None,
     ) -> str:
         if not with_dummy_env:
             self.check_env(env)
@@ -298,30 +341,37 @@ class ManagedProvider(BaseProvider, extra="allow"):
             **({var: "dummy" for var in required_env_vars} if with_dummy_env else {}),
             **(self.extract_env(env=env)),
         }
-        port = str(await find_free_port())
-
+        lifecycle_mode = configuration.container_lifecycle.mode
+        if lifecycle_mode == ContainerLifecycleMode.remove or replica not in self._container_ports:
+            # retained containers are resumed only with an unchanged configuration, including the port
+            self._container_ports[replica] = str(await find_free_port())
+        port = self._container_ports[replica]
+
+        await self.stop(replica=replica)
+        self._container_exit_stacks[replica] = exit_stack = AsyncExitStack()
         try:
-            await self._container_exit_stack.enter_async_context(
+            container_id = await exit_stack.enter_async_context(
                 container_backend.open_container(
                     image=self.image_id,
+                    name=self._container_name(replica),
                     port_mappings={port: "8000"},
                     env={"PORT": "8000", "HOST": "0.0.0.0", **env},
                     logs_container=logs_container,
+                    lifecycle_mode=lifecycle_mode,
+                    resources=resources or self.resources,
                 )
             )
-            async for attempt in AsyncRetrying(
-                stop=stop_after_attempt(8),
-                wait=wait_exponential(multiplier=1, max=3),
-                retry=retry_if_exception_grp_type(HTTPError),
-                reraise=True,
-            ):
-                with attempt:
-                    async with AsyncClient() as client:
-                        base_url = f"http://localhost:{port}/"
-                        await client.get(f"{base_url}agents", timeout=1)
-            return base_url
-        except BaseException:
-            await self._container_exit_stack.aclose()
+            self._container_ids[replica] = container_id
+            await container_backend.wait_for_ready(
+                container_id=container_id, host_port=int(port), image=str(self.image_id)
+            )
+            return f"http://localhost:{port}/"
+        except BaseException as ex:
+            # exit with the exception, a container which failed to start is removed instead of retained
+            self._container_ports.pop(replica, None)
+            self._container_ids.pop(replica, None)
+            if exit_stack := self._container_exit_stacks.pop(replica, None):
+                await exit_stack.__aexit__(type(ex), ex, ex.__traceback__)
             raise
 
 
@@ -396,5 +446,11 @@ class ProviderStatus(StrEnum):
     error = "error"
 
 
+class ProviderHealth(StrEnum):
+    unknown = "unknown"
+    healthy = "healthy"
+    unhealthy = "unhealthy"
+
+
 class ProviderErrorMessage(BaseModel):
     message: str
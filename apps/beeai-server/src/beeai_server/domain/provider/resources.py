@@ -0,0 +1,67 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+import psutil
+
+from beeai_server.configuration import ContainerResources, ResourcesConfiguration
+from beeai_server.custom_types import ID
+from beeai_server.exceptions import InsufficientCapacityError
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceScheduler:
+    """
+    Account resources requested by running provider replicas against the host capacity.
+
+    A replica without an explicit request reserves its limit. Replicas are refused to start when their request
+    does not fit into the capacity left by the other replicas.
+    """
+
+    def __init__(self, configuration: ResourcesConfiguration | None = None):
+        self.configuration = configuration = configuration or ResourcesConfiguration()
+        cpus = configuration.capacity_cpus or psutil.cpu_count() or 1
+        memory_mb = configuration.capacity_memory_mb or psutil.virtual_memory().total // 2**20
+        self.capacity_cpus = max(0.0, cpus - configuration.reserved_cpus)
+        self.capacity_memory_mb = max(0, memory_mb - configuration.reserved_memory_mb)
+        self.reservations: dict[tuple[ID, int], ContainerResources] = {}
+
+    @property
+    def requested_cpus(self) -> float:
+        return sum(resources.requested_cpus for resources in self.reservations.values())
+
+    @property
+    def requested_memory_mb(self) -> int:
+        return sum(resources.requested_memory_mb for resources in self.reservations.values())
+
+    def reserve(self, provider_id: ID, replica: int, resources: ContainerResources):
+        """:raises InsufficientCapacityError: the request does not fit into the remaining capacity"""
+        self.release(provider_id, replica)
+        if self.configuration.check_capacity:
+            free_cpus = self.capacity_cpus - self.requested_cpus
+            free_memory_mb = self.capacity_memory_mb - self.requested_memory_mb
+            if resources.requested_cpus > free_cpus or resources.requested_memory_mb > free_memory_mb:
+                raise InsufficientCapacityError(
+                    f"Insufficient host capacity to start provider {provider_id}: requested "
+                    f"{resources.requested_cpus} CPUs and {resources.requested_memory_mb} MB, available "
+                    f"{max(free_cpus, 0):g} CPUs and {max(free_memory_mb, 0)} MB"
+                )
+        self.reservations[provider_id, replica] = resources
+
+    def release(self, provider_id: ID, replica: int | None = None):
+        """Release the reservation of the replica, all replicas of the provider by default."""
+        for key in [key for key in self.reservations if key[0] == provider_id and replica in (None, key[1])]:
+            del self.reservations[key]
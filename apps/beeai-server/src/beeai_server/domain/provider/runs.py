@@ -0,0 +1,236 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Iterator, MutableMapping, NamedTuple
+
+import anyio.to_thread
+
+from beeai_server.custom_types import ID
+
+logger = logging.getLogger(__name__)
+
+
+class RunRoute(NamedTuple):
+    provider_id: ID
+    replica: int = 0
+
+
+# Rough per-entry cost of the OrderedDict node, the (route, last_access) tuple and the route itself
+_ENTRY_OVERHEAD_BYTES = sys.getsizeof(("", 0.0)) + sys.getsizeof(0.0) + sys.getsizeof(RunRoute("")) + 100
+
+
+class RunRegistry(MutableMapping[str, RunRoute]):
+    """
+    Bounded run id -> provider replica mapping used to route follow-up requests of a run.
+
+    Entries are evicted in LRU order when max_size is reached and expire after ttl without access. When
+    persistence_path is set, entries are also stored in a local SQLite database, so runs keep routing after
+    a server restart. Changes and accesses (which refresh the persisted expiration) are batched in memory and
+    written by flush() in a worker thread, the event loop only reads the database for runs missing in memory.
+    """
+
+    DB_PRUNE_INTERVAL = 1000
+
+    def __init__(
+        self,
+        *,
+        max_size: int = 100_000,
+        ttl: timedelta = timedelta(minutes=30),
+        persistence_path: Path | None = None,
+        timer: Callable[[], float] = time.time,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evictions = 0
+        self.expirations = 0
+        self._timer = timer
+        self._entries: OrderedDict[str, tuple[RunRoute, float]] = OrderedDict()
+        self._memory_bytes = 0
+        self._writes = 0
+        # run id -> (route, last access) to store or None to delete on the next flush
+        self._pending: dict[str, tuple[RunRoute, float] | None] = {}
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        if persistence_path:
+            self._db = self._open_db(persistence_path)
+            self._prune_db()
+
+    @staticmethod
+    def _open_db(path: Path) -> sqlite3.Connection:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS runs "
+            "(run_id TEXT PRIMARY KEY, provider_id TEXT, replica INTEGER NOT NULL DEFAULT 0, expires_at REAL)"
+        )
+        if "replica" not in {column[1] for column in db.execute("PRAGMA table_info(runs)")}:
+            db.execute("ALTER TABLE runs ADD COLUMN replica INTEGER NOT NULL DEFAULT 0")
+        db.execute("CREATE INDEX IF NOT EXISTS runs_expires_at ON runs (expires_at)")
+        return db
+
+    @staticmethod
+    def _entry_size(run_id: str, route: RunRoute) -> int:
+        return sys.getsizeof(run_id) + sys.getsizeof(route.provider_id) + _ENTRY_OVERHEAD_BYTES
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate memory held by in-memory entries."""
+        return self._memory_bytes
+
+    @property
+    def occupancy(self) -> float:
+        return len(self._entries) / self.max_size if self.max_size else 0.0
+
+    def _pop_entry(self, run_id: str) -> RunRoute:
+        route, _ = self._entries.pop(run_id)
+        self._memory_bytes -= self._entry_size(run_id, route)
+        return route
+
+    def expire(self) -> None:
+        # Access refreshes the entry and moves it to the end, so the oldest entries are always in front
+        deadline = self._timer() - self.ttl.total_seconds()
+        while self._entries:
+            run_id, (_, last_access) = next(iter(self._entries.items()))
+            if last_access > deadline:
+                break
+            self._pop_entry(run_id)
+            self.expirations += 1
+
+    def _prune_db(self) -> None:
+        if self._db:
+            self._db.execute("DELETE FROM runs WHERE expires_at <= ?", (self._timer(),))
+
+    def _load(self, run_id: str) -> RunRoute | None:
+        if run_id in self._pending:
+            entry = self._pending[run_id]
+            return entry[0] if entry and entry[1] > self._timer() - self.ttl.total_seconds() else None
+        if not self._db:
+            return None
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT provider_id, replica FROM runs WHERE run_id = ? AND expires_at > ?", (run_id, self._timer())
+            ).fetchone()
+        return RunRoute(*row) if row else None
+
+    def _store(self, run_id: str, route: RunRoute, now: float) -> None:
+        if self._db:
+            self._pending[run_id] = (route, now)
+
+    def _write_pending(self, pending: dict[str, tuple[RunRoute, float] | None]) -> None:
+        ttl = self.ttl.total_seconds()
+        with self._db_lock:
+            if not self._db or not pending:
+                return
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO runs (run_id, provider_id, replica, expires_at) VALUES (?, ?, ?, ?)",
+                    [
+                        (run_id, entry[0].provider_id, entry[0].replica, entry[1] + ttl)
+                        for run_id, entry in pending.items()
+                        if entry
+                    ],
+                )
+                self._db.executemany(
+                    "DELETE FROM runs WHERE run_id = ?", [(run_id,) for run_id, entry in pending.items() if not entry]
+                )
+                self._writes += len(pending)
+                if self._writes >= self.DB_PRUNE_INTERVAL:
+                    self._writes = 0
+                    self._prune_db()
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    async def flush(self) -> None:
+        """Write the batched changes to the database."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        await anyio.to_thread.run_sync(self._write_pending, pending)
+
+    def _insert(self, run_id: str, route: RunRoute, now: float) -> None:
+        if run_id in self._entries:
+            self._pop_entry(run_id)
+        self._entries[run_id] = (route, now)
+        self._memory_bytes += self._entry_size(run_id, route)
+        while len(self._entries) > self.max_size:
+            self._pop_entry(next(iter(self._entries)))
+            self.evictions += 1
+
+    def __getitem__(self, run_id: str) -> RunRoute:
+        now = self._timer()
+        entry = self._entries.get(run_id, None)
+        if entry and entry[1] > now - self.ttl.total_seconds():
+            route = entry[0]
+            self._entries[run_id] = (route, now)
+            self._entries.move_to_end(run_id)
+            self._store(run_id, route, now)
+            return route
+        if entry:
+            self._pop_entry(run_id)
+            self.expirations += 1
+        if route := self._load(run_id):
+            self._insert(run_id, route, now)
+            self._store(run_id, route, now)
+            return route
+        raise KeyError(run_id)
+
+    def __setitem__(self, run_id: str, route: RunRoute) -> None:
+        now = self._timer()
+        self.expire()
+        self._insert(run_id, route, now)
+        self._store(run_id, route, now)
+
+    def __delitem__(self, run_id: str) -> None:
+        found = run_id in self._entries
+        if found:
+            self._pop_entry(run_id)
+        elif self._load(run_id) is None:
+            raise KeyError(run_id)
+        if self._db:
+            self._pending[run_id] = None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, run_id: object) -> bool:
+        try:
+            self[run_id]
+            return True
+        except KeyError:
+            return False
+
+    def close(self) -> None:
+        """Write the remaining batched changes and close the database."""
+        pending, self._pending = self._pending, {}
+        self._write_pending(pending)
+        with self._db_lock:
+            if self._db:
+                self._db.close()
+                self._db = None
@@ -16,13 +16,13 @@ import asyncio
 import logging
 from asyncio import CancelledError
 from contextlib import AsyncExitStack, asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Sequence
 
 from beeai_server.configuration import Configuration
 from beeai_server.adapters.interface import IContainerBackend, ITelemetryRepository, TelemetryConfig
 from beeai_server.telemetry import OTEL_HTTP_PORT
 from beeai_server.utils.docker import DockerImageID
-from beeai_server.utils.logs_container import LogsContainer, ProcessLogMessage
+from beeai_server.utils.logs_container import LogRecord, LogsContainer
 from kink import inject
 from pydantic import BaseModel
 
@@ -42,11 +42,12 @@ class TelemetryCollector(BaseModel, extra="allow"):
         logs_container = LogsContainer()
         config_dir = configuration.telemetry_config_dir
 
-        def handle_log(message: ProcessLogMessage):
-            logger.info(message.message, extra={"container_name": "beeai-otelcol-contrib"})
+        def handle_logs(batch: Sequence[LogRecord]):
+            for record in batch:
+                logger.info(record.message, extra={"container_name": "beeai-otelcol-contrib"})
 
         try:
-            logs_container.subscribe(handle_log)
+            logs_container.subscribe(handle_logs)
 
             image = DockerImageID(root="otel/opentelemetry-collector-contrib:0.122.1")
             await container_backend.pull_image(image=image, logs_container=logs_container)
@@ -67,7 +68,7 @@ class TelemetryCollector(BaseModel, extra="allow"):
             ) as container_id:
                 yield container_id
         finally:
-            logs_container.unsubscribe(handle_log)
+            logs_container.unsubscribe(handle_logs)
 
 
 @inject
@@ -14,7 +14,7 @@
 
 from typing import TYPE_CHECKING
 
-from starlette.status import HTTP_404_NOT_FOUND
+from starlette.status import HTTP_404_NOT_FOUND, HTTP_503_SERVICE_UNAVAILABLE
 from tenacity import retry_if_exception, retry_base
 
 if TYPE_CHECKING:
@@ -39,6 +39,31 @@ class MissingConfigurationError(Exception):
 class ProviderNotInstalledError(Exception): ...
 
 
+class ProviderUnavailableError(Exception):
+    status_code: int = HTTP_503_SERVICE_UNAVAILABLE
+    last_error: str | None
+
+    def __init__(self, provider_id: str, last_error: str | None = None):
+        self.last_error = last_error
+        super().__init__(f"Provider {provider_id} is not running" + (f": {last_error}" if last_error else ""))
+
+
+class ContainerNotReadyError(Exception): ...
+
+
+class InsufficientCapacityError(Exception): ...
+
+
+class AdmissionRejectedError(Exception):
+    status_code: int
+    retry_after: int
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        self.status_code = status_code
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
 def retry_if_exception_grp_type(*exception_types: type[BaseException]) -> retry_base:
     """Handle also exception groups"""
 
@@ -16,7 +16,6 @@ from contextlib import AsyncExitStack, AbstractAsyncContextManager
 from typing import Any
 
 import fastapi
-import fastapi.responses
 import httpx
 from acp_sdk.models import (
     AgentName,
@@ -32,6 +31,7 @@ from acp_sdk.models import (
 
 from beeai_server.domain.provider.model import Agent
 from beeai_server.routes.dependencies import ProviderServiceDependency
+from beeai_server.utils.fastapi import ProxyResponse
 
 router = fastapi.APIRouter()
 
@@ -61,38 +61,17 @@ async def send_request(
     method: str,
     url: str,
     json: dict[str, Any] | None = None,
-) -> fastapi.responses.Response:
+    admission: AbstractAsyncContextManager[None] | None = None,
+) -> ProxyResponse:
     exit_stack = AsyncExitStack()
 
     try:
+        if admission:
+            await exit_stack.enter_async_context(admission)
         client = await exit_stack.enter_async_context(client_factory)
         response: httpx.Response = await exit_stack.enter_async_context(client.stream(method, url, json=json))
-
-        async def stream_fn():
-            try:
-                async for event in response.stream:
-                    yield event
-            finally:
-                await exit_stack.pop_all().aclose()
-
-        if response.headers["content-type"].startswith("text/event-stream"):
-            return fastapi.responses.StreamingResponse(
-                stream_fn(),
-                status_code=response.status_code,
-                headers=response.headers,
-                media_type=response.headers["content-type"],
-            )
-        else:
-            try:
-                await response.aread()
-                return fastapi.responses.Response(
-                    content=response.content,
-                    status_code=response.status_code,
-                    headers=response.headers,
-                    media_type=response.headers["content-type"],
-                )
-            finally:
-                await exit_stack.pop_all().aclose()
+        # Ownership of the upstream connection moves to the response, it is released once the body is forwarded
+        return ProxyResponse(response, exit_stack=exit_stack.pop_all())
     except BaseException:
         await exit_stack.pop_all().aclose()
         raise
@@ -101,13 +80,19 @@ async def send_request(
 @router.post("/runs")
 async def create_run(request: RunCreateRequest, provider_service: ProviderServiceDependency) -> RunCreateResponse:
     provider = await provider_service.get_provider_by_agent_name(agent_name=request.agent_name)
-    return await send_request(provider.client(), "POST", "/runs", request.model_dump(mode="json"))
+    return await send_request(
+        provider.client(),
+        "POST",
+        "/runs",
+        request.model_dump(mode="json"),
+        admission=provider_service.admit(provider),
+    )
 
 
 @router.get("/runs/{run_id}")
 async def read_run(run_id: RunId, provider_service: ProviderServiceDependency) -> RunReadResponse:
     provider = await provider_service.get_provider_by_run_id(run_id=str(run_id))
-    return await send_request(provider.client(), "GET", f"/runs/{run_id}")
+    return await send_request(provider.client(run_id=str(run_id)), "GET", f"/runs/{run_id}")
 
 
 @router.post("/runs/{run_id}")
@@ -115,10 +100,16 @@ async def resume_run(
     run_id: RunId, request: RunResumeRequest, provider_service: ProviderServiceDependency
 ) -> RunResumeResponse:
     provider = await provider_service.get_provider_by_run_id(run_id=str(run_id))
-    return await send_request(provider.client(), "POST", f"/runs/{run_id}", request.model_dump(mode="json"))
+    return await send_request(
+        provider.client(run_id=str(run_id)),
+        "POST",
+        f"/runs/{run_id}",
+        request.model_dump(mode="json"),
+        admission=provider_service.admit(provider),
+    )
 
 
 @router.post("/runs/{run_id}/cancel")
 async def cancel_run(run_id: RunId, provider_service: ProviderServiceDependency) -> RunCancelResponse:
     provider = await provider_service.get_provider_by_run_id(run_id=str(run_id))
-    return await send_request(provider.client(), "POST", f"/runs/{run_id}/cancel")
+    return await send_request(provider.client(run_id=str(run_id)), "POST", f"/runs/{run_id}/cancel")
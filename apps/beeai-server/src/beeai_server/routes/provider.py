@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from datetime import datetime
+
 import fastapi
-from starlette.status import HTTP_202_ACCEPTED
+from starlette.status import HTTP_202_ACCEPTED, HTTP_304_NOT_MODIFIED
 
 from beeai_server.custom_types import ID
 from beeai_server.domain.provider.model import GithubProviderLocation
@@ -24,11 +26,11 @@ from beeai_server.schema import (
     ProviderWithStatus,
     RegisterUnmanagedProviderRequest,
 )
-from fastapi import Query, BackgroundTasks, HTTPException
+from fastapi import Header, Query, BackgroundTasks, HTTPException
 from fastapi.responses import Response
 from starlette.responses import StreamingResponse
 
-from beeai_server.utils.fastapi import streaming_response
+from beeai_server.utils.fastapi import etag_matches, streaming_response
 
 router = fastapi.APIRouter()
 
@@ -84,10 +86,33 @@ async def preview_provider(
     return await provider_service.preview_provider(location=request.location)
 
 
-@router.get("")
-async def list_providers(provider_service: ProviderServiceDependency) -> PaginatedResponse[ProviderWithStatus]:
-    providers = await provider_service.list_providers()
-    return PaginatedResponse(items=providers, total_count=len(providers))
+@router.get("", response_model=PaginatedResponse[ProviderWithStatus])
+async def list_providers(
+    provider_service: ProviderServiceDependency, if_none_match: str | None = Header(None)
+) -> Response:
+    snapshot = await provider_service.get_providers_snapshot()
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if etag_matches(snapshot.etag, if_none_match):
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+@router.get("/watch")
+async def watch_providers(
+    provider_service: ProviderServiceDependency, last_event_id: str | None = Header(None)
+) -> StreamingResponse:
+    watch_iterator = await provider_service.watch_providers(last_event_id=last_event_id)
+    return streaming_response(watch_iterator())
+
+
+@router.get("/events")
+async def stream_events(
+    provider_service: ProviderServiceDependency,
+    provider_id: list[ID] | None = Query(None, description="Stream only events of these providers"),
+    last_event_id: str | None = Header(None),
+) -> StreamingResponse:
+    events_iterator = await provider_service.stream_events(provider_ids=provider_id, last_event_id=last_event_id)
+    return streaming_response(events_iterator())
 
 
 @router.get("/{id}")
@@ -101,6 +126,16 @@ async def delete_provider(id: ID, provider_service: ProviderServiceDependency) -
 
 
 @router.get("/{id}/logs", status_code=fastapi.status.HTTP_204_NO_CONTENT)
-async def stream_logs(id: ID, provider_service: ProviderServiceDependency) -> StreamingResponse:
-    logs_iterator = await provider_service.stream_logs(id=id)
+async def stream_logs(
+    id: ID,
+    provider_service: ProviderServiceDependency,
+    last_event_id: int | None = Header(None),
+    since: datetime | None = Query(None, description="Return stored logs from this time"),
+    until: datetime | None = Query(None, description="Return stored logs until this time"),
+    grep: str | None = Query(None, description="Return only stored logs matching the regular expression"),
+) -> StreamingResponse:
+    if since or until or grep:
+        logs_iterator = await provider_service.query_logs(id=id, since=since, until=until, grep=grep)
+        return streaming_response(logs_iterator())
+    logs_iterator = await provider_service.stream_logs(id=id, last_seq=last_event_id)
     return streaming_response(logs_iterator())
@@ -28,6 +28,7 @@ class EnvService:
 
     async def update_env(self, *, env: dict[str, str | None]) -> Callable[..., Coroutine[None, None, None]]:
         await self._repository.update(env)
+        self._loaded_provider_container.notify_change()
         return self._loaded_provider_container.handle_reload_on_env_update
 
     async def list_env(self) -> dict[str, str]:
@@ -16,8 +16,11 @@ from __future__ import annotations
 
 import json
 import logging
-from contextlib import suppress
-from typing import AsyncIterator, Callable, Coroutine, overload
+import re
+import uuid
+from contextlib import AbstractAsyncContextManager, suppress
+from datetime import datetime
+from typing import AsyncIterator, Callable, Coroutine, NamedTuple, overload
 
 import anyio
 from fastapi import HTTPException
@@ -40,11 +43,19 @@ from beeai_server.domain.provider.container import (
 from beeai_server.domain.registry import RegistryLocation
 from beeai_server.schema import ProviderWithStatus
 from beeai_server.exceptions import ManifestLoadError
+from beeai_server.utils.fastapi import StreamEvent
 from beeai_server.utils.logs_container import LogsContainer
 
 logger = logging.getLogger(__name__)
 
 
+class ProvidersSnapshot(NamedTuple):
+    version: int
+    etag: str
+    providers: list[ProviderWithStatus]
+    body: bytes  # serialized PaginatedResponse[ProviderWithStatus]
+
+
 @inject
 class ProviderService:
     def __init__(
@@ -56,6 +67,9 @@ class ProviderService:
         self._repository = provider_repository
         self._loaded_provider_container = loaded_provider_container
         self._env_repository = env_repository
+        self._etag_prefix = uuid.uuid4().hex[:8]  # snapshot versions restart with the server
+        self._snapshot: ProvidersSnapshot | None = None
+        self._snapshot_items: dict[ID, tuple[ProviderWithStatus, bytes]] = {}
 
     async def register_provider(
         self, *, location: ProviderLocation, registry: RegistryLocation | None = None, persist: bool = True
@@ -91,32 +105,29 @@ class ProviderService:
         except Exception as ex:
             raise ManifestLoadError(location=location, message=str(ex)) from ex
 
+    def _get_provider_with_status(self, provider: BaseProvider, env: dict[str, str]) -> ProviderWithStatus:
+        # the manifest is passed as the model instance, dumping and validating it again is the most expensive part
+        provider_fields = provider.model_dump(exclude={"manifest"})
+        if loaded_provider := self._loaded_provider_container.loaded_providers.get(provider.id, None):
+            return ProviderWithStatus(
+                **provider_fields,
+                manifest=provider.manifest,
+                status=loaded_provider.status,
+                last_error=loaded_provider.last_error,
+                missing_configuration=[var for var in loaded_provider.missing_configuration if var.required],
+            )
+        return ProviderWithStatus(
+            **provider_fields,
+            manifest=provider.manifest,
+            status=ProviderStatus.not_loaded,
+            missing_configuration=[var for var in provider.check_env(env, raise_error=False) if var.required],
+            last_error=ProviderErrorMessage(message="Provider not yet initialized"),
+        )
+
     def _get_providers_with_status(
         self, providers: list[BaseProvider], env: dict[str, str]
     ) -> list[ProviderWithStatus]:
-        result_providers = []
-        for provider in providers:
-            if loaded_provider := self._loaded_provider_container.loaded_providers.get(provider.id, None):
-                result_providers.append(
-                    ProviderWithStatus(
-                        **provider.model_dump(),
-                        status=loaded_provider.status,
-                        last_error=loaded_provider.last_error,
-                        missing_configuration=[var for var in loaded_provider.missing_configuration if var.required],
-                    )
-                )
-            else:
-                result_providers.append(
-                    ProviderWithStatus(
-                        **provider.model_dump(),
-                        status=ProviderStatus.not_loaded,
-                        missing_configuration=[
-                            var for var in provider.check_env(env, raise_error=False) if var.required
-                        ],
-                        last_error=ProviderErrorMessage(message="Provider not yet initialized"),
-                    )
-                )
-        return result_providers
+        return [self._get_provider_with_status(provider, env) for provider in providers]
 
     @overload
     async def install_provider(
@@ -136,7 +147,7 @@ class ProviderService:
 
         logs_container = LogsContainer()
         if id:
-            provider = await self.get_provider(id=id)
+            provider = await self._find_provider(id=id)
             if provider.id not in self._loaded_provider_container.loaded_providers:
                 raise ValueError("Provider is not loaded")
 
@@ -146,7 +157,8 @@ class ProviderService:
             source = await location.get_source()
 
             async def _install():
-                await source.install(logs_container=logs_container)
+                with self._loaded_provider_container.events.forward_install_logs(source.id, logs_container):
+                    await source.install(logs_container=logs_container)
                 await self.register_provider(location=location)
 
         if stream:
@@ -161,15 +173,15 @@ class ProviderService:
                     task_group.start_soon(cancel_on_finish, _install())
 
                     async with logs_container.stream() as stream:
-                        async for message in stream:
-                            yield json.dumps(message.model_dump(mode="json"))
+                        async for record in stream:
+                            yield json.dumps(record.to_message().model_dump(mode="json"))
 
             return logs_iterator
 
         return _install
 
     async def delete_provider(self, *, id: ID, force: bool = False):
-        provider = await self.get_provider(id=id)
+        provider = await self._find_provider(id=id)
         provider = self._loaded_provider_container.loaded_providers[provider.id]
 
         if getattr(provider.provider, "registry", None) and not force:
@@ -185,31 +197,146 @@ class ProviderService:
         loaded_providers = {p_id: p.provider for p_id, p in self._loaded_provider_container.loaded_providers.items()}
         return list((persisted_providers | loaded_providers).values())
 
-    async def list_providers(self) -> list[ProviderWithStatus]:
-        return self._get_providers_with_status(
-            providers=await self._get_all_providers(),
-            env=await self._env_repository.get_all(),
+    async def get_providers_snapshot(self) -> ProvidersSnapshot:
+        """
+        Providers with status, cached until the provider container reports a change. Only the providers changed since
+        the previous snapshot are materialized and serialized again.
+        """
+        container = self._loaded_provider_container
+        if self._snapshot and self._snapshot.version == container.version:
+            return self._snapshot
+
+        version = container.version
+        changed = container.changes_since(self._snapshot.version, until=version) if self._snapshot else None
+        env = await self._env_repository.get_all()
+        if changed is None:
+            providers = {provider.id: provider for provider in await self._get_all_providers()}
+            items = {}
+        else:
+            providers = {id: provider for id in changed if (provider := await self._lookup_provider(id))}
+            items = {id: item for id, item in self._snapshot_items.items() if id in providers or id not in changed}
+        for id, provider in providers.items():
+            provider_with_status = self._get_provider_with_status(provider, env)
+            items[id] = (provider_with_status, provider_with_status.model_dump_json(by_alias=True).encode())
+
+        self._snapshot_items = items
+        self._snapshot = ProvidersSnapshot(
+            version=version,
+            etag=f'"{self._version_tag(version)}"',
+            providers=[provider for provider, _ in items.values()],
+            body=b'{"items":[%s],"total_count":%d}' % (b",".join(body for _, body in items.values()), len(items)),
         )
+        return self._snapshot
 
-    async def get_provider(self, id: ID) -> ProviderWithStatus:
-        providers = [provider for provider in await self.list_providers() if provider.id == id]
-        if not providers:
+    async def list_providers(self) -> list[ProviderWithStatus]:
+        return list((await self.get_providers_snapshot()).providers)
+
+    def _version_tag(self, version: int) -> str:
+        return f"{self._etag_prefix}-{version}"
+
+    def _parse_version_tag(self, tag: str | None) -> int | None:
+        """Snapshot version of the tag or None if it was issued by another server instance."""
+        prefix, _, version = (tag or "").rpartition("-")
+        return int(version) if prefix == self._etag_prefix and version.isdigit() else None
+
+    async def watch_providers(self, last_event_id: str | None = None) -> Callable[..., AsyncIterator[StreamEvent]]:
+        """
+        Stream changes of the provider list as events identified by the snapshot version tag:
+          - {"reset": true, "updated": [...all providers], "removed": []} if last_event_id is unknown or too old
+          - {"reset": false, "updated": [...changed providers], "removed": [...ids]} otherwise
+        """
+        container = self._loaded_provider_container
+
+        async def watch_iterator() -> AsyncIterator[StreamEvent]:
+            version = self._parse_version_tag(last_event_id)
+            while True:
+                snapshot = await self.get_providers_snapshot()
+                # changes after the snapshot are not in it yet, they are sent after the next snapshot
+                changed = container.changes_since(version, until=snapshot.version) if version is not None else None
+                if changed is None:
+                    updated, removed = self._snapshot_items.keys(), []
+                else:
+                    updated = [id for id in changed if id in self._snapshot_items]
+                    removed = [id for id in changed if id not in self._snapshot_items]
+                if changed is None or updated or removed:
+                    data = b'{"reset":%s,"updated":[%s],"removed":%s}' % (
+                        b"true" if changed is None else b"false",
+                        b",".join(self._snapshot_items[id][1] for id in updated),
+                        json.dumps(removed).encode(),
+                    )
+                    yield StreamEvent(data=data.decode(), id=self._version_tag(snapshot.version))
+                version = snapshot.version
+                await container.wait_for_change(version)
+
+        return watch_iterator
+
+    async def stream_events(
+        self, provider_ids: list[ID] | None = None, last_event_id: str | None = None
+    ) -> Callable[..., AsyncIterator[StreamEvent]]:
+        events = self._loaded_provider_container.events
+
+        async def events_iterator() -> AsyncIterator[StreamEvent]:
+            async for event in events.stream(
+                provider_ids=set(provider_ids) if provider_ids else None, last_event_id=last_event_id
+            ):
+                yield StreamEvent(data=event.model_dump_json(), id=events.event_id(event.seq))
+
+        return events_iterator
+
+    async def _lookup_provider(self, id: ID) -> BaseProvider | None:
+        if loaded_provider := self._loaded_provider_container.loaded_providers.get(id, None):
+            return loaded_provider.provider
+        with suppress(ValueError):
+            return await self._repository.get(provider_id=id)
+        return None
+
+    async def _find_provider(self, id: ID) -> BaseProvider:
+        """Look up a single provider by id without materializing the others, loaded providers take precedence."""
+        if not (provider := await self._lookup_provider(id)):
             raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=f"Provider with ID: {str(id)} not found")
-        return providers[0]
+        return provider
+
+    async def get_provider(self, id: ID) -> ProviderWithStatus:
+        provider = await self._find_provider(id=id)
+        return self._get_provider_with_status(provider, env=await self._env_repository.get_all())
 
     async def list_agents(self) -> list[Agent]:
         return [
             agent for provider in self._loaded_provider_container.loaded_providers.values() for agent in provider.agents
         ]
 
-    async def stream_logs(self, id: ID) -> Callable[..., AsyncIterator[str]]:
+    async def stream_logs(self, id: ID, last_seq: int | None = None) -> Callable[..., AsyncIterator[StreamEvent]]:
         if not (provider := self._loaded_provider_container.loaded_providers.get(id, None)):
             raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Provider not found")
 
+        async def logs_iterator() -> AsyncIterator[StreamEvent]:
+            async with provider.logs_container.stream(last_seq=last_seq) as stream:
+                async for record in stream:
+                    yield StreamEvent(data=json.dumps(record.to_message().model_dump(mode="json")), id=str(record.seq))
+
+        return logs_iterator
+
+    async def query_logs(
+        self, id: ID, *, since: datetime | None = None, until: datetime | None = None, grep: str | None = None
+    ) -> Callable[..., AsyncIterator[str]]:
+        if not (log_store := self._loaded_provider_container.log_store):
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="Persistent log store is disabled")
+        if id not in self._loaded_provider_container.loaded_providers:
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Provider not found")
+        try:
+            pattern = re.compile(grep) if grep else None
+        except re.error as ex:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=f"Invalid grep pattern: {ex}") from ex
+
         async def logs_iterator() -> AsyncIterator[str]:
-            async with provider.logs_container.stream() as stream:
-                async for message in stream:
-                    yield json.dumps(message.model_dump(mode="json"))
+            records = log_store.query(
+                id,
+                since=since.timestamp() if since else None,
+                until=until.timestamp() if until else None,
+                grep=pattern,
+            )
+            async for record in records:
+                yield json.dumps(record.to_message().model_dump(mode="json"))
 
         return logs_iterator
 
@@ -219,6 +346,9 @@ class ProviderService:
         except ValueError as ex:
             raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=f"Agent {agent_name} not found") from ex
 
+    def admit(self, provider: LoadedProvider) -> AbstractAsyncContextManager[None]:
+        return self._loaded_provider_container.admit(provider)
+
     async def get_provider_by_run_id(self, *, run_id: str) -> LoadedProvider:
         try:
             return self._loaded_provider_container.get_provider_by_run(run_id=run_id)
@@ -13,6 +13,8 @@
 # limitations under the License.
 
 import re
+from contextvars import ContextVar
+from enum import IntEnum
 from typing import Any
 
 import httpx
@@ -22,6 +24,15 @@ from pydantic import ModelWrapValidatorHandler, RootModel, model_validator, Priv
 from beeai_server.configuration import Configuration
 
 
+class PullPriority(IntEnum):
+    user = 0
+    background = 1
+
+
+# Priority of image pulls started from the current context, background tasks lower it
+pull_priority: ContextVar[PullPriority] = ContextVar("pull_priority", default=PullPriority.user)
+
+
 class DockerImageID(RootModel):
     root: str
 
@@ -12,13 +12,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from contextlib import AsyncExitStack
+from typing import Final, NamedTuple
+
+import anyio
+import httpx
 from fastapi.staticfiles import StaticFiles
-from starlette.responses import StreamingResponse, AsyncContentStream
+from starlette.responses import Response, StreamingResponse, AsyncContentStream
 from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
+from starlette.types import Receive, Scope, Send
 
 from beeai_server.schema import ErrorStreamResponse, ErrorStreamResponseError
 from beeai_server.utils.utils import extract_messages
 
+HOP_BY_HOP_HEADERS: Final = frozenset(
+    {
+        b"connection",
+        b"keep-alive",
+        b"proxy-authenticate",
+        b"proxy-authorization",
+        b"proxy-connection",
+        b"te",
+        b"trailer",
+        b"trailers",
+        b"transfer-encoding",
+        b"upgrade",
+    }
+)
+
 
 class NoCacheStaticFiles(StaticFiles):
     async def get_response(self, path: str, scope):
@@ -29,7 +50,23 @@ class NoCacheStaticFiles(StaticFiles):
         return response
 
 
-def encode_stream(chunk: str) -> str:
+class StreamEvent(NamedTuple):
+    data: str
+    id: str | None = None
+
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    """Weak comparison of the ETag with an If-None-Match header."""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def encode_stream(chunk: str | StreamEvent) -> str:
+    if isinstance(chunk, StreamEvent):
+        event_id = f"id: {chunk.id}\n" if chunk.id is not None else ""
+        return f"{event_id}data: {chunk.data}\n\n"
     return f"data: {chunk}\n\n"
 
 
@@ -61,3 +98,67 @@ def streaming_response(content: AsyncContentStream):
             "Connection": "keep-alive",
         },
     )
+
+
+def filter_hop_by_hop_headers(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    """Drop headers that apply only to a single transport-level connection (RFC 9110, section 7.6.1)."""
+    connection_headers = {
+        token.strip().lower() for name, value in headers if name.lower() == b"connection" for token in value.split(b",")
+    }
+    excluded = HOP_BY_HOP_HEADERS | connection_headers
+    return [(name.lower(), value) for name, value in headers if name.lower() not in excluded]
+
+
+class ProxyResponse(Response):
+    """
+    Raw ASGI passthrough of an upstream httpx response.
+
+    The body is forwarded exactly as received from the upstream socket (still content-encoded, so content-length
+    and content-encoding stay valid) chunk by chunk. Each chunk is sent before the next one is read, so a slow
+    client applies backpressure to the upstream connection. The exit stack owning the upstream response is closed
+    when the response is finished or the client disconnects.
+    """
+
+    def __init__(self, upstream: httpx.Response, exit_stack: AsyncExitStack):
+        self.upstream = upstream
+        self.status_code = upstream.status_code
+        self.background = None
+        self.raw_headers = filter_hop_by_hop_headers(upstream.headers.raw)
+        self._exit_stack = exit_stack
+
+    @property
+    def media_type(self) -> str | None:
+        return self.upstream.headers.get("content-type", None)
+
+    async def _stream_body(self, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        async for chunk in self.upstream.aiter_raw():
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    @staticmethod
+    async def _listen_for_disconnect(receive: Receive) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async with self._exit_stack:
+            error: Exception | None = None
+            async with anyio.create_task_group() as task_group:
+
+                async def stream_body():
+                    nonlocal error
+                    try:
+                        await self._stream_body(send)
+                    except Exception as ex:
+                        error = ex  # re-raised outside of the task group to avoid wrapping it in an ExceptionGroup
+                    finally:
+                        task_group.cancel_scope.cancel()
+
+                task_group.start_soon(stream_body)
+                await self._listen_for_disconnect(receive)
+                task_group.cancel_scope.cancel()
+            if error:
+                raise error
@@ -46,11 +46,11 @@ class ResolvedGithubUrl(BaseModel):
     path: str | None = None
 
     def get_tgz_link(self) -> AnyUrl:
-        version_type = "heads" if self._version_type == GithubVersionType.head else "tags"
+        # Archive of the resolved commit, the content does not change when a branch or tag moves
         return AnyUrl.build(
             scheme="https",
             host="github.com",
-            path=f"{self.org}/{self.repo}/archive/refs/{version_type}/{self.version}.tar.gz",
+            path=f"{self.org}/{self.repo}/archive/{self.commit_hash}.tar.gz",
         )
 
     def get_raw_url(self, path: str | None = None) -> AnyUrl:
@@ -193,11 +193,31 @@ def extract_targz_safe(tar_path: PathLike | Path, extract_path: PathLike | Path)
         tar.extractall(path=extract_path, members=members, filter="data")
 
 
+def create_tar_reproducible(source_dir: PathLike | Path, tar_path: PathLike | Path):
+    """
+    Create an uncompressed tar of the directory with normalized metadata.
+
+    Files are added in a sorted order with zeroed mtime and ownership, the same content always produces the same
+    archive, so the docker layer cache is reused for every file that did not change between two commits.
+    """
+
+    def _normalize(member: tarfile.TarInfo) -> tarfile.TarInfo:
+        member.mtime = 0
+        member.uid = member.gid = 0
+        member.uname = member.gname = ""
+        return member
+
+    source_dir = pathlib.Path(source_dir)
+    with tarfile.open(tar_path, "w", format=tarfile.PAX_FORMAT) as tar:
+        for path in sorted(source_dir.rglob("*")):
+            tar.add(path, arcname=str(path.relative_to(source_dir)), recursive=False, filter=_normalize)
+
+
 _repo_download_locks: dict[str, anyio.Lock] = defaultdict(anyio.Lock)
 
 
 async def download_repo(directory: Path | pathlib.Path, github_url: ResolvedGithubUrl) -> Path:
-    repo_id = f"{github_url.org}_{github_url.repo}_{github_url.version}"
+    repo_id = f"{github_url.org}_{github_url.repo}_{github_url.commit_hash}"
     repo_path = Path(directory) / repo_id
 
     async with _repo_download_locks[repo_id]:
@@ -211,7 +231,6 @@ async def download_repo(directory: Path | pathlib.Path, github_url: ResolvedGith
             await tmp_path.mkdir(parents=True)
             download_link = str(github_url.get_tgz_link())
             tar_path = tmp_path / "repo.tar.gz"
-            await github_url.resolve_version()
             async with httpx.AsyncClient(follow_redirects=True) as client:
                 async with client.stream("GET", download_link) as response:
                     response.raise_for_status()
@@ -13,18 +13,29 @@
 # limitations under the License.
 
 import logging
-from collections import deque
+import time
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from enum import StrEnum
-from typing import Callable, Iterable, AsyncIterator
+from typing import Callable, AsyncIterator, Sequence
 
 import anyio
-from anyio import WouldBlock
+from opentelemetry.metrics import get_meter
 from pydantic import BaseModel, Field
 
+from beeai_server.telemetry import INSTRUMENTATION_NAME
+
 logger = logging.getLogger(__name__)
 
+meter = get_meter(INSTRUMENTATION_NAME)
+ingested_lines_counter = meter.create_counter(
+    "provider_log_lines", description="Log lines ingested from provider processes"
+)
+dropped_lines_counter = meter.create_counter(
+    "provider_log_lines_dropped", description="Log lines from provider processes dropped by the rate limit"
+)
+
 
 class ProcessLogType(StrEnum):
     stdout = "stdout"
@@ -37,66 +48,199 @@ class ProcessLogMessage(BaseModel, extra="allow"):
     time: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
 
+@dataclass(slots=True)
+class LogRecord:
+    stream: ProcessLogType
+    message: str
+    time: float  # unix timestamp, converted to datetime only when the record is serialized
+    seq: int = -1  # assigned by the logs container
+
+    def to_message(self) -> ProcessLogMessage:
+        return ProcessLogMessage.model_construct(
+            stream=self.stream, message=self.message, time=datetime.fromtimestamp(self.time, UTC), seq=self.seq
+        )
+
+
+@dataclass(slots=True)
+class LogGap:
+    """Marker of records overwritten in the buffer before the subscriber read them."""
+
+    seq: int  # sequence number of the last missed record
+    missed: int
+
+    def to_message(self) -> ProcessLogMessage:
+        return ProcessLogMessage.model_construct(
+            stream=ProcessLogType.stderr,
+            message=f"⚠️ {self.missed} log lines were skipped, the client is reading logs too slowly",
+            time=datetime.now(UTC),
+            seq=self.seq,
+            gap=self.missed,
+        )
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+
+    def take(self, count: int) -> int:
+        """Consume up to count tokens, return how many were available."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        taken = min(count, int(self._tokens))
+        self._tokens -= taken
+        return taken
+
+
+LogSubscriber = Callable[[Sequence[LogRecord]], None]
+
+
 class LogsContainer:
-    def __init__(self, max_lines: int = 500):
-        self._logs: deque[ProcessLogMessage] = deque(maxlen=max_lines)
-        self._subscribers: set[Callable[[ProcessLogMessage], None]] = set()
-        self._max_lines = max_lines
+    """
+    Fixed-capacity ring buffer of log records.
+
+    Records get monotonically increasing sequence numbers. Stream subscribers keep their own cursor into the
+    buffer, a subscriber falling behind by more than the buffer capacity receives a LogGap marker for the
+    overwritten records. Callback subscribers receive every added batch synchronously.
+    """
+
+    def __init__(
+        self,
+        max_lines: int = 500,
+        rate_limit: TokenBucket | None = None,
+        metric_attributes: dict[str, str] | None = None,
+    ):
+        self._capacity = max_lines
+        self._ring: list[LogRecord | None] = [None] * max_lines
+        self._first_seq = 0
+        self._next_seq = 0
+        self._cleared_seq = 0
+        self._new_records: anyio.Event | None = None
+        self._subscribers: set[LogSubscriber] = set()
+        self._rate_limit = rate_limit
+        self._metric_attributes = metric_attributes or {}
+        self._dropped = 0
+
+    @property
+    def first_seq(self) -> int:
+        return self._first_seq
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
 
     def clear(self):
-        self._logs.clear()
+        """Drop buffered records, sequence numbers continue so that existing cursors stay valid."""
+        self._ring = [None] * self._capacity
+        self._first_seq = self._cleared_seq = self._next_seq
 
-    def _notify_subscribers(self, log: ProcessLogMessage):
+    def _notify_subscribers(self, batch: Sequence[LogRecord]):
         for subscriber in self._subscribers:
-            subscriber(log)
-
-    def _add(self, log: ProcessLogMessage):
-        self._logs.append(log)
-        self._notify_subscribers(log)
+            subscriber(batch)
+
+    def add_batch(self, batch: Sequence[LogRecord]):
+        if not batch:
+            return
+        ring, capacity = self._ring, self._capacity
+        for record in batch:
+            record.seq = self._next_seq
+            ring[self._next_seq % capacity] = record
+            self._next_seq += 1
+        self._first_seq = max(self._first_seq, self._next_seq - capacity)
+        self._notify_subscribers(batch)
+        if self._new_records:
+            self._new_records.set()
+            self._new_records = None
+
+    def ingest(self, batch: Sequence[LogRecord]):
+        """Add a batch of process output, applying the rate limit of the container."""
+        if not batch:
+            return
+        if self._rate_limit:
+            allowed = self._rate_limit.take(len(batch))
+            if allowed < len(batch):
+                dropped = len(batch) - allowed
+                self._dropped += dropped
+                dropped_lines_counter.add(dropped, self._metric_attributes)
+                batch = batch[:allowed]
+            if batch and self._dropped:
+                notice = f"⚠️ {self._dropped} log lines were dropped due to the rate limit"
+                batch = [LogRecord(stream=ProcessLogType.stderr, message=notice, time=batch[0].time), *batch]
+                self._dropped = 0
+        ingested_lines_counter.add(len(batch), self._metric_attributes)
+        self.add_batch(batch)
 
     def add_stdout(self, text: str):
-        self._add(ProcessLogMessage(stream=ProcessLogType.stdout, message=text.rstrip("\n\r")))
+        self.add_batch([LogRecord(stream=ProcessLogType.stdout, message=text.rstrip("\n\r"), time=time.time())])
 
     def add_stderr(self, text: str):
-        self._add(ProcessLogMessage(stream=ProcessLogType.stdout, message=text.rstrip("\n\r")))
+        self.add_batch([LogRecord(stream=ProcessLogType.stderr, message=text.rstrip("\n\r"), time=time.time())])
 
-    def subscribe(self, handler: Callable[[ProcessLogMessage], None]):
+    def subscribe(self, handler: LogSubscriber):
         self._subscribers.add(handler)
 
-    def unsubscribe(self, handler: Callable[[ProcessLogMessage], None]):
+    def unsubscribe(self, handler: LogSubscriber):
         self._subscribers.remove(handler)
 
+    def read(self, cursor: int, limit: int | None = None) -> tuple[int, list[LogRecord]]:
+        """Return the number of records missed by the cursor and the records available from it."""
+        cursor = max(cursor, self._cleared_seq)  # cleared records are not reported as missed
+        missed = max(0, self._first_seq - cursor)
+        start = cursor + missed
+        end = self._next_seq if limit is None else min(self._next_seq, start + limit)
+        ring, capacity = self._ring, self._capacity
+        return missed, [ring[seq % capacity] for seq in range(start, end)]
+
+    async def wait_for_records(self, cursor: int):
+        while self._next_seq <= cursor:
+            if not self._new_records:
+                self._new_records = anyio.Event()
+            await self._new_records.wait()
+
     @property
-    def logs(self) -> Iterable[ProcessLogMessage]:
-        return self._logs
+    def logs(self) -> list[LogRecord]:
+        return self.read(self._first_seq)[1]
 
     @property
     def stdout(self) -> list[str]:
-        return [log.message for log in self._logs if log.stream == ProcessLogType.stdout]
+        return [log.message for log in self.logs if log.stream == ProcessLogType.stdout]
 
     @property
     def stderr(self) -> list[str]:
-        return [log.message for log in self._logs if log.stream == ProcessLogType.stderr]
+        return [log.message for log in self.logs if log.stream == ProcessLogType.stderr]
 
     @asynccontextmanager
     async def stream(
-        self, include_old: bool = True, max_buffer_size: int | None = None
-    ) -> AsyncIterator[AsyncIterator[ProcessLogMessage]]:
-        max_buffer_size = max_buffer_size or self._max_lines * 2
-        stream_send, stream_receive = anyio.create_memory_object_stream(max_buffer_size=max_buffer_size)
-
-        def _handle_message(log: ProcessLogMessage):
-            try:
-                stream_send.send_nowait(log)
-            except WouldBlock:
-                logger.error("Unable to stream logs to client due to a full buffer")
-
-        if include_old:
-            for message in self.logs:
-                stream_send.send_nowait(message)
-
-        try:
-            self.subscribe(_handle_message)
-            yield stream_receive
-        finally:
-            self.unsubscribe(_handle_message)
+        self, include_old: bool = True, last_seq: int | None = None
+    ) -> AsyncIterator[AsyncIterator[LogRecord | LogGap]]:
+        """
+        Stream records from the buffer.
+
+        :param include_old: start from the oldest buffered record instead of new records only
+        :param last_seq: resume after the record with this sequence number (e.g. from Last-Event-ID)
+        """
+        if last_seq is not None:
+            cursor = min(last_seq + 1, self._next_seq)
+        else:
+            cursor = self._first_seq if include_old else self._next_seq
+
+        async def _iterate() -> AsyncIterator[LogRecord | LogGap]:
+            nonlocal cursor
+            while True:
+                # records are read from the ring one by one, a record overwritten meanwhile is reported as missed
+                cursor = max(cursor, self._cleared_seq)
+                if cursor >= self._next_seq:
+                    await self.wait_for_records(cursor)
+                    continue
+                if cursor < self._first_seq:
+                    missed, cursor = self._first_seq - cursor, self._first_seq
+                    yield LogGap(seq=cursor - 1, missed=missed)
+                    continue
+                record = self._ring[cursor % self._capacity]
+                cursor += 1
+                yield record
+
+        yield _iterate()
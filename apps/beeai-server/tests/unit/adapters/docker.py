@@ -0,0 +1,286 @@
+import asyncio
+import json
+import struct
+import time
+import uuid
+from contextlib import suppress
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from beeai_server.adapters.docker import DockerContainerBackend, DockerLogDecoder, PullScheduler, probe_http_port
+from beeai_server.configuration import Configuration, ContainerLifecycleMode
+from beeai_server.utils.docker import DockerImageID, PullPriority, pull_priority
+from beeai_server.utils.logs_container import LogsContainer, ProcessLogType, TokenBucket
+from beeai_server.utils.process import find_free_port
+
+
+async def serve(handler) -> tuple[asyncio.Server, int]:
+    port = await find_free_port()
+    return await asyncio.start_server(handler, "localhost", port), port
+
+
+@pytest.mark.asyncio
+async def test_probe_requires_response_from_server():
+    async def respond(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await reader.readline()
+        writer.write(b"HTTP/1.0 200 OK\r\n\r\n")
+        writer.close()
+
+    async def close_without_response(_reader, writer: asyncio.StreamWriter):
+        writer.close()  # userland proxy behaviour while the container is not listening yet
+
+    server, port = await serve(respond)
+    async with server:
+        assert await probe_http_port(port)
+
+    server, port = await serve(close_without_response)
+    async with server:
+        assert not await probe_http_port(port)
+
+    assert not await probe_http_port(port, timeout=0.1)
+
+
+class FakeDockerDaemon:
+    """Answers the version check, image inspection and streams image events on a unix socket."""
+
+    def __init__(self):
+        self.images = {"ghcr.io/i-am-bee/beeai/agents/chat:latest": "sha256:abc"}
+        self.inspect_calls = 0
+        self.inspect_connections: set[int] = set()
+        self.events: asyncio.Queue[dict] = asyncio.Queue()
+        self.events_connected = asyncio.Event()
+        self.containers: dict[str, dict] = {}
+        self.container_actions: list[str] = []
+
+    async def version(self, _request):
+        return web.json_response({"ApiVersion": "1.43"})
+
+    async def inspect_image(self, request):
+        self.inspect_calls += 1
+        self.inspect_connections.add(id(request.transport))
+        if not (image_id := self.images.get(request.match_info["name"], None)):
+            return web.json_response({"message": "No such image"}, status=404)
+        return web.json_response({"Id": image_id, "Config": {"Labels": {}}})
+
+    async def stream_events(self, request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        self.events_connected.set()
+        with suppress(ConnectionError):
+            while request.transport and not request.transport.is_closing():
+                with suppress(TimeoutError):
+                    event = await asyncio.wait_for(self.events.get(), timeout=0.05)
+                    await response.write(json.dumps(event).encode() + b"\n")
+        return response
+
+    def delete(self, name: str):
+        image_id = self.images.pop(name)
+        self.events.put_nowait({"Type": "image", "Action": "delete", "id": image_id})
+
+    def _find_container(self, request) -> dict | None:
+        key = request.match_info["id"]
+        return next((c for c in self.containers.values() if key in (c["Id"], c["Name"])), None)
+
+    async def create_container(self, request):
+        config = await request.json()
+        container_id = uuid.uuid4().hex
+        self.containers[container_id] = {
+            "Id": container_id,
+            "Name": request.query["name"],
+            "Config": {"Labels": config.get("Labels", {})},
+            "State": {"Running": False, "Paused": False},
+        }
+        self.container_actions.append("create")
+        return web.json_response({"Id": container_id}, status=201)
+
+    async def inspect_container(self, request):
+        if not (container := self._find_container(request)):
+            return web.json_response({"message": "No such container"}, status=404)
+        return web.json_response(container)
+
+    async def container_action(self, request):
+        container, action = self._find_container(request), request.match_info["action"]
+        self.container_actions.append(action)
+        container["State"]["Running"] = action in {"start", "pause", "unpause"}
+        container["State"]["Paused"] = action == "pause"
+        return web.Response(status=204)
+
+    async def delete_container(self, request):
+        self.containers.pop(self._find_container(request)["Id"])
+        self.container_actions.append("delete")
+        return web.Response(status=204)
+
+
+@pytest_asyncio.fixture
+async def docker_daemon(tmp_path):
+    daemon = FakeDockerDaemon()
+    app = web.Application()
+    app.router.add_get("/version", daemon.version)
+    app.router.add_get(r"/v1.43/images/{name:.+}/json", daemon.inspect_image)
+    app.router.add_get("/v1.43/events", daemon.stream_events)
+    app.router.add_post("/v1.43/containers/create", daemon.create_container)
+    app.router.add_get("/v1.43/containers/{id}/json", daemon.inspect_container)
+    app.router.add_post("/v1.43/containers/{id}/{action}", daemon.container_action)
+    app.router.add_delete("/v1.43/containers/{id}", daemon.delete_container)
+    runner = web.AppRunner(app, shutdown_timeout=0.1)
+    await runner.setup()
+    path = tmp_path / "docker.sock"
+    await web.UnixSite(runner, str(path)).start()
+    daemon.host = f"unix://{path}"
+    yield daemon
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_check_image_reuses_docker_session(docker_daemon):
+    images = [DockerImageID(root=f"example.com/agents/agent-{i}:latest") for i in range(20)]
+    docker_daemon.images.update({str(image): f"sha256:{i}" for i, image in enumerate(images)})
+
+    async with DockerContainerBackend(docker_host=docker_daemon.host, configuration=Configuration()) as backend:
+        assert not await backend.check_image(image=DockerImageID(root="missing/image:latest"))
+        for image in images:
+            assert await backend.check_image(image=image)
+
+    assert docker_daemon.inspect_calls == len(images) + 1
+    assert len(docker_daemon.inspect_connections) == 1
+
+
+@pytest.mark.asyncio
+async def test_image_metadata_is_cached_until_image_event(docker_daemon):
+    image = DockerImageID(root="ghcr.io/i-am-bee/beeai/agents/chat:latest")
+    async with DockerContainerBackend(docker_host=docker_daemon.host, configuration=Configuration()) as backend:
+        await backend.check_image(image=image)
+        await asyncio.wait_for(docker_daemon.events_connected.wait(), timeout=5)
+        await asyncio.sleep(0.05)
+        calls = docker_daemon.inspect_calls
+        for _ in range(100):
+            assert await backend.check_image(image=image)
+            assert await backend.extract_labels(image=image) == {}
+        assert docker_daemon.inspect_calls == calls + 1
+
+        docker_daemon.delete(str(image))
+        await asyncio.sleep(0.05)
+        assert not await backend.check_image(image=image)
+
+
+class FakePuller:
+    def __init__(self):
+        self.pulls: list[str] = []
+        self.release: dict[str, asyncio.Event] = {}
+
+    async def __call__(self, image: DockerImageID, add_progress):
+        self.pulls.append(image.repository)
+        add_progress(f"{image.repository}: Downloading")
+        await self.release.setdefault(image.repository, asyncio.Event()).wait()
+        add_progress(f"{image.repository}: Pull complete")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_pulls_of_same_image_share_one_pull_and_progress():
+    puller = FakePuller()
+    scheduler = PullScheduler(pull=puller, max_concurrent_pulls=2)
+    image = DockerImageID(root="agents/chat:latest")
+    logs = [LogsContainer() for _ in range(3)]
+
+    pulls = [asyncio.create_task(scheduler.pull(image, logs_container=logs_container)) for logs_container in logs]
+    await asyncio.sleep(0.01)
+    puller.release["agents/chat"].set()
+    await asyncio.gather(*pulls)
+
+    assert puller.pulls == ["agents/chat"]
+    assert all(log.stdout == ["agents/chat: Downloading", "agents/chat: Pull complete"] for log in logs)
+    assert not scheduler.jobs
+
+
+@pytest.mark.asyncio
+async def test_user_pulls_are_scheduled_before_background_pulls():
+    puller = FakePuller()
+    scheduler = PullScheduler(pull=puller, max_concurrent_pulls=1)
+
+    async def pull(name: str, priority: PullPriority):
+        pull_priority.set(priority)
+        await scheduler.pull(DockerImageID(root=f"agents/{name}:latest"))
+
+    tasks = [asyncio.create_task(pull("running", PullPriority.user))]
+    await asyncio.sleep(0.01)
+    tasks += [asyncio.create_task(pull(f"preinstall-{i}", PullPriority.background)) for i in range(2)]
+    await asyncio.sleep(0.01)
+    tasks.append(asyncio.create_task(pull("install", PullPriority.user)))
+    await asyncio.sleep(0.01)
+    assert scheduler.queued == 3
+
+    for name in ["running", "install", "preinstall-0", "preinstall-1"]:
+        puller.release.setdefault(f"agents/{name}", asyncio.Event()).set()
+        await asyncio.sleep(0.01)
+    await asyncio.gather(*tasks)
+
+    assert puller.pulls == ["agents/running", "agents/install", "agents/preinstall-0", "agents/preinstall-1"]
+    assert scheduler.active == 0
+
+
+def test_log_decoder_demultiplexes_chunked_stream():
+    def frame(stream: int, payload: bytes) -> bytes:
+        return struct.pack(">BxxxL", stream, len(payload)) + payload
+
+    data = frame(1, b"starting\nlistening on ") + frame(2, b"warning\n") + frame(1, b"8000\n") + frame(1, b"tail")
+    decoder = DockerLogDecoder()
+    records = [record for i in range(0, len(data), 5) for record in decoder.feed(data[i : i + 5])]
+    records += decoder.flush()
+    assert [(record.stream, record.message) for record in records] == [
+        (ProcessLogType.stdout, "starting"),
+        (ProcessLogType.stderr, "warning"),
+        (ProcessLogType.stdout, "listening on 8000"),
+        (ProcessLogType.stdout, "tail"),
+    ]
+
+
+def test_logs_rate_limit_drops_lines_and_reports_them():
+    logs_container = LogsContainer(rate_limit=TokenBucket(rate=1000, burst=3))
+    batches = []
+    logs_container.subscribe(batches.append)
+    decoder = DockerLogDecoder(multiplexed=False)
+    logs_container.ingest(decoder.feed(b"".join(f"line {i}\n".encode() for i in range(5))))
+    time.sleep(0.01)  # refill the bucket
+    logs_container.ingest(decoder.feed(b"line 5\n"))
+
+    assert len(batches) == 2
+    assert logs_container.stdout == ["line 0", "line 1", "line 2", "line 5"]
+    assert logs_container.stderr == ["⚠️ 2 log lines were dropped due to the rate limit"]
+
+
+@pytest.mark.asyncio
+async def test_paused_container_is_resumed_with_unchanged_configuration(docker_daemon):
+    backend = DockerContainerBackend(docker_host=docker_daemon.host, configuration=Configuration())
+    image = DockerImageID(root="ghcr.io/i-am-bee/beeai/agents/chat:latest")
+    container_ids = []
+    async with backend:
+        for env in [{"A": "1"}, {"A": "1"}, {"A": "2"}]:
+            async with backend.open_container(
+                image=image, name="chat", env=env, lifecycle_mode=ContainerLifecycleMode.pause
+            ) as container_id:
+                container_ids.append(container_id)
+
+    assert container_ids[0] == container_ids[1] != container_ids[2]
+    assert docker_daemon.container_actions == [
+        *("create", "start", "pause"),
+        *("unpause", "pause"),
+        *("stop", "delete", "create", "start", "pause"),  # configuration changed
+    ]
+
+
+@pytest.mark.asyncio
+async def test_build_context_locks_are_dropped_after_release():
+    backend = DockerContainerBackend(docker_host="unix:///var/run/docker.sock", configuration=Configuration())
+    holders = []
+
+    async def prepare(context_id: str):
+        async with backend._build_context_lock(context_id):
+            holders.append(context_id)
+            await asyncio.sleep(0.01)
+            assert holders.count(context_id) == 1
+            holders.remove(context_id)
+
+    await asyncio.gather(*(prepare(f"context-{i % 3}") for i in range(9)))
+    assert backend._build_context_locks == {}
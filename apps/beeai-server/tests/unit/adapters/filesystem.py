@@ -0,0 +1,22 @@
+import asyncio
+
+import pytest
+
+from beeai_server.adapters.filesystem import FilesystemProviderRepository
+
+NUM_PROVIDERS = 2_000
+
+
+@pytest.mark.asyncio
+async def test_register_providers(tmp_path, create_provider):
+    providers = [create_provider(i) for i in range(NUM_PROVIDERS)]
+    repository = FilesystemProviderRepository(tmp_path / "providers.yaml")
+
+    for provider in providers[: NUM_PROVIDERS // 2]:
+        await repository.create(provider=provider)
+    await asyncio.gather(*(repository.create(provider=provider) for provider in providers[NUM_PROVIDERS // 2 :]))
+    for provider in providers[::2]:
+        await repository.delete(provider_id=provider.id)
+
+    reloaded = FilesystemProviderRepository(tmp_path / "providers.yaml")
+    assert [provider.id for provider in await reloaded.list()] == [provider.id for provider in providers[1::2]]
@@ -0,0 +1,53 @@
+import sqlite3
+
+import pytest
+
+from beeai_server.adapters.interface import TelemetryConfig
+from beeai_server.adapters.sqlite import (
+    MIGRATIONS,
+    SqliteDatabase,
+    SqliteEnvVariableRepository,
+    SqliteProviderRepository,
+    SqliteTelemetryRepository,
+)
+
+
+@pytest.mark.asyncio
+async def test_processes_share_state(tmp_path, create_provider):
+    # two databases on the same file stand in for two server processes
+    first, second = SqliteDatabase(tmp_path / "beeai.db"), SqliteDatabase(tmp_path / "beeai.db")
+    providers = [create_provider(i) for i in range(3)]
+    for provider in providers:
+        await SqliteProviderRepository(first).create(provider=provider)
+    with pytest.raises(ValueError):
+        await SqliteProviderRepository(second).create(provider=providers[0])
+    await SqliteProviderRepository(second).delete(provider_id=providers[1].id)
+
+    assert [p.id for p in await SqliteProviderRepository(first).list()] == [providers[0].id, providers[2].id]
+    assert (await SqliteProviderRepository(second).get(provider_id=providers[2].id)).manifest == providers[2].manifest
+
+    await SqliteEnvVariableRepository(first).update({"A": "1", "B": "2"})
+    await SqliteEnvVariableRepository(second).update({"A": None, "C": "3"})
+    assert await SqliteEnvVariableRepository(first).get_all() == {"B": "2", "C": "3"}
+    assert await SqliteEnvVariableRepository(first).get("A", "default") == "default"
+
+    assert (await SqliteTelemetryRepository(first).get()).sharing_enabled
+    await SqliteTelemetryRepository(second).set(config=TelemetryConfig(sharing_enabled=False))
+    assert not (await SqliteTelemetryRepository(first).get()).sharing_enabled
+
+    version = await first.run(lambda db: db.execute("PRAGMA user_version").fetchone()[0])
+    assert version == len(MIGRATIONS)
+
+
+@pytest.mark.asyncio
+async def test_migrations_are_applied_atomically(tmp_path, monkeypatch):
+    migrations = [*MIGRATIONS, "INSERT INTO env (key, value) VALUES ('a;b', 'c;d')"]
+    monkeypatch.setattr("beeai_server.adapters.sqlite.MIGRATIONS", [*migrations, "CREATE TABLE runs (id); INVALID"])
+    with pytest.raises(sqlite3.OperationalError):
+        await SqliteDatabase(tmp_path / "beeai.db").run(lambda db: None)
+
+    monkeypatch.setattr("beeai_server.adapters.sqlite.MIGRATIONS", migrations)
+    database = SqliteDatabase(tmp_path / "beeai.db")
+    assert await SqliteEnvVariableRepository(database).get_all() == {"a;b": "c;d"}
+    assert await database.run(lambda db: db.execute("PRAGMA user_version").fetchone()[0]) == len(migrations)
+    database.close()
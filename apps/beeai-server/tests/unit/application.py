@@ -0,0 +1,19 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from beeai_server.application import register_global_exception_handlers
+from beeai_server.exceptions import AdmissionRejectedError
+
+
+def test_admission_rejection_is_not_reraised():
+    app = FastAPI()
+    register_global_exception_handlers(app)
+
+    @app.post("/api/v1/acp/runs")
+    async def create_run():
+        raise AdmissionRejectedError("Too many runs", status_code=429, retry_after=5)
+
+    # the test client re-raises exceptions which reach the server error middleware
+    response = TestClient(app, raise_server_exceptions=True).post("/api/v1/acp/runs")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "5"
@@ -0,0 +1,26 @@
+from typing import Callable
+
+import pytest
+
+from beeai_server.domain.provider.model import NetworkProviderSource, ProviderManifest, UnmanagedProvider
+
+
+class InMemoryEnvRepository:
+    async def get_all(self) -> dict[str, str]:
+        return {}
+
+
+@pytest.fixture
+def env_repository() -> InMemoryEnvRepository:
+    return InMemoryEnvRepository()
+
+
+@pytest.fixture
+def create_provider() -> Callable[[int], UnmanagedProvider]:
+    def create(i: int) -> UnmanagedProvider:
+        return UnmanagedProvider(
+            manifest=ProviderManifest(agents=[{"name": f"agent-{i}", "description": "test"}]),
+            source=NetworkProviderSource(location=f"http://provider-{i}.local:8000"),
+        )
+
+    return create
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from beeai_server.configuration import AdmissionControlConfiguration, AdmissionSettings
+from beeai_server.domain.provider.admission import AdmissionController
+from beeai_server.exceptions import AdmissionRejectedError
+
+
+@pytest.mark.asyncio
+async def test_queued_requests_are_admitted_in_arrival_order():
+    controller = AdmissionController(AdmissionControlConfiguration(queue_timeout_sec=5))
+    settings = AdmissionSettings(max_concurrent_runs=1)
+    admitted = []
+
+    async def run(name: str, release: asyncio.Event):
+        async with controller.admit("provider", settings):
+            admitted.append(name)
+            await release.wait()
+
+    releases = [asyncio.Event() for _ in range(3)]
+    tasks = []
+    for i, release in enumerate(releases):
+        tasks.append(asyncio.create_task(run(f"run-{i}", release)))
+        await asyncio.sleep(0)
+    assert admitted == ["run-0"]
+    assert controller.provider_limiters["provider"].queued == 2
+
+    for release in releases:
+        release.set()
+    await asyncio.gather(*tasks)
+    assert admitted == ["run-0", "run-1", "run-2"]
+    assert controller.provider_limiters["provider"].active == 0
+    assert controller.global_limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_overload_is_rejected_with_retry_after():
+    controller = AdmissionController(AdmissionControlConfiguration(queue_timeout_sec=0.05, retry_after_sec=7))
+    settings = AdmissionSettings(max_concurrent_runs=1, max_queue_depth=1)
+    async with controller.admit("provider", settings):
+        with pytest.raises(AdmissionRejectedError) as timeout:
+            async with controller.admit("provider", settings):
+                pass
+        assert (timeout.value.status_code, timeout.value.retry_after) == (503, 7)
+
+        waiting = asyncio.create_task(controller.admit("provider", settings).__aenter__())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejectedError) as queue_full:
+            async with controller.admit("provider", settings):
+                pass
+        assert queue_full.value.status_code == 429
+        with pytest.raises(AdmissionRejectedError):
+            await waiting
+    assert controller.provider_limiters["provider"].active == 0
@@ -0,0 +1,206 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import httpx
+import pytest
+from kink import di
+
+from beeai_server.adapters.interface import IContainerBackend
+from beeai_server.configuration import Configuration
+from beeai_server.domain.provider.container import LoadedProvider, ProviderContainer
+from beeai_server.domain.provider.model import (
+    DockerImageProviderSource,
+    ManagedProvider,
+    NetworkProviderSource,
+    ProviderErrorMessage,
+    ProviderHealth,
+    ProviderManifest,
+    ProviderStatus,
+    UnmanagedProvider,
+)
+from beeai_server.domain.provider.runs import RunRoute
+from beeai_server.exceptions import ProviderUnavailableError
+
+
+@pytest.fixture
+def create_container(env_repository):
+    async def create(num_providers: int, num_runs: int) -> tuple[ProviderContainer, list[str], list[str]]:
+        container = ProviderContainer(env_repository=env_repository, autostart_providers=False)
+        agent_names = []
+        for i in range(num_providers):
+            manifest = ProviderManifest(agents=[{"name": f"agent-{i}-{j}", "description": "test"} for j in range(3)])
+            provider = UnmanagedProvider(
+                manifest=manifest, source=NetworkProviderSource(location=f"http://provider-{i}.local:8000")
+            )
+            await container.add(provider)
+            agent_names.extend(agent.name for agent in provider.manifest.agents)
+
+        loaded_providers = list(container.loaded_providers.values())
+        run_ids = [str(uuid.uuid4()) for _ in range(num_runs)]
+        for i, run_id in enumerate(run_ids):
+            provider = loaded_providers[i % len(loaded_providers)]
+            provider.runs[run_id] = RunRoute(provider_id=provider.id)
+        return container, agent_names, run_ids
+
+    return create
+
+
+class NoScanDict(dict):
+    def __iter__(self):
+        raise AssertionError("lookup scanned all providers")
+
+    def values(self):
+        raise AssertionError("lookup scanned all providers")
+
+    def items(self):
+        raise AssertionError("lookup scanned all providers")
+
+
+@pytest.mark.asyncio
+async def test_routing_lookups_do_not_scan_providers(create_container):
+    container, agent_names, run_ids = await create_container(num_providers=5, num_runs=100)
+    loaded_providers = container.loaded_providers
+    container.loaded_providers = NoScanDict(loaded_providers)
+
+    for agent_name in agent_names:
+        assert agent_name in {agent.name for agent in container.get_provider_by_agent(agent_name).agents}
+    for run_id in run_ids:
+        assert run_id in container.get_provider_by_run(run_id).runs
+
+
+@pytest.mark.asyncio
+async def test_agent_index_keeps_first_registered_provider(create_container):
+    container, _, _ = await create_container(num_providers=1, num_runs=0)
+    [original] = container.loaded_providers.values()
+    override = UnmanagedProvider(
+        manifest=original.provider.manifest,
+        source=NetworkProviderSource(location="http://override.local:8000"),
+        persistent=False,
+    )
+    await container.add(override)
+    assert container.get_provider_by_agent("agent-0-0") is original
+
+    await container.remove(original.provider)
+    assert container.get_provider_by_agent("agent-0-0").id == override.id
+
+    await container.remove(override)
+    with pytest.raises(ValueError):
+        container.get_provider_by_agent("agent-0-0")
+
+
+@pytest.mark.asyncio
+async def test_replicas_are_balanced_by_outstanding_requests_and_pinned_by_run(create_container):
+    container, _, _ = await create_container(num_providers=1, num_runs=0)
+    [provider] = container.loaded_providers.values()
+    for index in range(3):
+        provider._add_replica(index, f"http://replica-{index}.local:8000/")
+
+    provider.replicas[0].in_flight = 2
+    provider.replicas[1].in_flight = 1
+    assert provider._select_replica().index == 2
+
+    provider.runs["run"] = RunRoute(provider_id=provider.id, replica=0)
+    assert provider._select_replica(run_id="run").index == 0
+
+    await provider._remove_replica(0)  # scaled down, fall back to balancing
+    assert provider._select_replica(run_id="run").index == 2
+
+
+@pytest.mark.asyncio
+async def test_transport_error_excludes_only_the_failing_replica(create_container):
+    container, _, _ = await create_container(num_providers=1, num_runs=0)
+    [provider] = container.loaded_providers.values()
+    for index in range(2):
+        provider._add_replica(index, f"http://replica-{index}.local:8000/")
+    provider._replicas[0].client = httpx.AsyncClient(
+        base_url="http://replica-0.local:8000/", transport=httpx.MockTransport(lambda request: httpx.Response(200))
+    )
+    provider.status = ProviderStatus.running
+
+    async with provider.client() as running:
+        with pytest.raises(httpx.ReadTimeout):
+            async with provider.client():  # balanced to the idle replica 1
+                raise httpx.ReadTimeout("timed out")
+
+        assert (await running.get("agents")).status_code == 200
+        assert provider.status == ProviderStatus.running
+        assert [replica.healthy for replica in provider.replicas] == [True, False]
+        assert provider._select_replica().index == 0
+
+
+class FakeContainerBackend:
+    def __init__(self):
+        self.open_container_calls = 0
+
+    async def check_image(self, *, image) -> bool:
+        await asyncio.sleep(0.01)  # yield to other requests, a real backend call would
+        return True
+
+    @asynccontextmanager
+    async def open_container(self, **kwargs):
+        self.open_container_calls += 1
+        await asyncio.sleep(0.05)
+        yield "container-id"
+
+    async def wait_for_ready(self, **kwargs) -> timedelta:
+        await asyncio.sleep(0.01)
+        return timedelta(seconds=0.01)
+
+
+@pytest.fixture
+def container_backend():
+    backend = FakeContainerBackend()
+    services = {Configuration: Configuration(), IContainerBackend: backend}
+    previous = {key: di._services.get(key, None) for key in services}
+    for key, service in services.items():
+        di[key] = service
+    yield backend
+    for key, service in previous.items():
+        if service is None:
+            di._services.pop(key, None)
+        else:
+            di[key] = service
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cold_requests_start_provider_once(container_backend):
+    provider = ManagedProvider(
+        manifest=ProviderManifest(agents=[{"name": "chat", "description": "test"}]),
+        source=DockerImageProviderSource(location="example.com/agents/chat:latest"),
+    )
+    loaded_provider = LoadedProvider(provider, env={}, autostart=False)
+    loaded_provider.status = ProviderStatus.ready
+
+    async def run():
+        async with loaded_provider.client() as client:
+            await asyncio.sleep(0.01)
+            return client
+
+    clients = await asyncio.gather(*(run() for _ in range(200)))
+
+    assert container_backend.open_container_calls == 1
+    assert loaded_provider.status == ProviderStatus.running
+    assert len(set(map(id, clients))) == 1
+    await loaded_provider.stop()
+
+
+@pytest.mark.asyncio
+async def test_server_errors_do_not_mark_provider_healthy():
+    provider = ManagedProvider(
+        manifest=ProviderManifest(agents=[{"name": "chat", "description": "test"}]),
+        source=DockerImageProviderSource(location="example.com/agents/chat:latest"),
+    )
+    loaded_provider = LoadedProvider(provider, env={}, autostart=False)
+    loaded_provider.mark_unhealthy(RuntimeError("connection refused"))
+
+    await loaded_provider._on_response(0, httpx.Response(502))
+    assert loaded_provider.health == ProviderHealth.unhealthy
+    await loaded_provider._on_response(0, httpx.Response(200))
+    assert loaded_provider.health == ProviderHealth.healthy
+
+    loaded_provider.last_error = ProviderErrorMessage(message="image not found")
+    with pytest.raises(ProviderUnavailableError) as exc_info:
+        loaded_provider._select_replica()
+    assert (exc_info.value.status_code, exc_info.value.last_error) == (503, "image not found")
@@ -0,0 +1,51 @@
+import pytest
+
+from beeai_server.domain.provider.container import ProviderContainer
+from beeai_server.domain.provider.events import ProviderEventBus, ProviderEventType
+
+
+@pytest.mark.asyncio
+async def test_stream_filters_events_by_provider(env_repository, create_provider):
+    container = ProviderContainer(env_repository=env_repository, autostart_providers=False)
+    for i in range(2):
+        await container.add(create_provider(i))
+    [_, provider_id] = container.loaded_providers
+    stream = container.events.stream(provider_ids={provider_id}, last_seq=-1)
+
+    added, status = await anext(stream), await anext(stream)
+    assert (added.type, added.provider_id) == (ProviderEventType.added, provider_id)
+    assert (status.type, status.data) == (ProviderEventType.status, {"status": "ready"})
+
+    container.loaded_providers[provider_id].status = "ready"  # unchanged values publish nothing
+    await container.remove(container.loaded_providers[provider_id].provider)
+    assert (await anext(stream)).type == ProviderEventType.removed
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_gap_event():
+    bus = ProviderEventBus(max_events=3)
+    stream = bus.stream(last_seq=-1)
+    for i in range(5):
+        bus.publish(ProviderEventType.status, "provider", status=str(i))
+
+    gap, *events = [await anext(stream) for _ in range(4)]
+    assert (gap.type, gap.data) == (ProviderEventType.gap, {"missed": 2})
+    assert [event.data["status"] for event in events] == ["2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_stream_of_another_instance_is_reset():
+    previous, bus = ProviderEventBus(), ProviderEventBus()
+    for i in range(3):
+        previous.publish(ProviderEventType.status, "provider", status=str(i))
+    bus.publish(ProviderEventType.status, "provider", status="restarted")
+
+    for last_event_id in (previous.event_id(2), bus.event_id(500)):
+        stream = bus.stream(last_event_id=last_event_id)
+        reset = await anext(stream)
+        assert (reset.type, reset.data) == (ProviderEventType.gap, {"reset": True})
+        bus.publish(ProviderEventType.status, "provider", status="new")
+        assert (await anext(stream)).data == {"status": "new"}
+
+    stream = bus.stream(last_event_id=bus.event_id(0))
+    assert [(await anext(stream)).data["status"] for _ in range(2)] == ["new", "new"]
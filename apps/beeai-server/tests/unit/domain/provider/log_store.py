@@ -0,0 +1,32 @@
+import re
+
+import pytest
+
+from beeai_server.configuration import LogStoreConfiguration
+from beeai_server.domain.provider.log_store import ProviderLogStore
+from beeai_server.utils.logs_container import LogRecord, LogsContainer, ProcessLogType
+
+
+@pytest.mark.asyncio
+async def test_query_time_range_across_segments(tmp_path):
+    configuration = LogStoreConfiguration(segment_max_bytes=1024, max_bytes_per_provider=1024 * 1024)
+    store = ProviderLogStore(directory=tmp_path, configuration=configuration)
+    logs_container = LogsContainer()
+    store.attach("provider", logs_container)
+    async with store:
+        for batch in range(20):
+            logs_container.add_batch(
+                [
+                    LogRecord(stream=ProcessLogType.stdout, message=f"line {i}\nwith\\escapes", time=1000.0 + i)
+                    for i in range(batch * 10, batch * 10 + 10)
+                ]
+            )
+            await store.flush()
+
+    assert len(list((tmp_path / "provider").glob("*.log"))) > 1
+
+    # a new store continues from the files written before a restart
+    store = ProviderLogStore(directory=tmp_path, configuration=configuration)
+    records = [record async for record in store.query("provider", since=1050, until=1150, grep=re.compile(r"[05]\n"))]
+    assert [record.message for record in records] == [f"line {i}\nwith\\escapes" for i in range(50, 151, 5)]
+    assert [record.seq for record in records] == list(range(50, 151, 5))
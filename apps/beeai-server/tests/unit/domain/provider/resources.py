@@ -0,0 +1,22 @@
+import pytest
+
+from beeai_server.configuration import ContainerResources, ResourcesConfiguration
+from beeai_server.domain.provider.resources import ResourceScheduler
+from beeai_server.exceptions import InsufficientCapacityError
+
+
+def test_scheduler_refuses_replicas_over_capacity():
+    scheduler = ResourceScheduler(
+        ResourcesConfiguration(capacity_cpus=5, capacity_memory_mb=9216, reserved_cpus=1, reserved_memory_mb=1024)
+    )
+    large = ContainerResources(cpus_limit=2, memory_request_mb=4096, memory_limit_mb=8192)
+
+    scheduler.reserve("aider", 0, large)
+    scheduler.reserve("aider", 0, large)  # restarting a replica replaces its reservation
+    scheduler.reserve("aider", 1, large)
+    with pytest.raises(InsufficientCapacityError):
+        scheduler.reserve("chat", 0, ContainerResources(cpus_request=0.5))
+
+    scheduler.release("aider", 1)
+    scheduler.reserve("chat", 0, ContainerResources(cpus_request=0.5))
+    assert (scheduler.requested_cpus, scheduler.requested_memory_mb) == (2.5, 4096)
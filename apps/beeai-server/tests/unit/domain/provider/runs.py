@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+import pytest
+
+from beeai_server.domain.provider.runs import RunRegistry, RunRoute
+
+ROUTE = RunRoute(provider_id="provider")
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_evicts_least_recently_used_runs():
+    registry = RunRegistry(max_size=2)
+    registry["run-1"] = ROUTE
+    registry["run-2"] = ROUTE
+    assert registry["run-1"] == ROUTE  # run-2 becomes least recently used
+    registry["run-3"] = ROUTE
+
+    assert set(registry) == {"run-1", "run-3"}
+    assert registry.evictions == 1
+    assert registry.occupancy == 1.0
+
+
+def test_expires_runs_after_ttl():
+    timer = FakeTimer()
+    registry = RunRegistry(ttl=timedelta(minutes=1), timer=timer)
+    registry["run-1"] = ROUTE
+    memory = registry.memory_bytes
+    timer.now += 30
+    registry["run-2"] = ROUTE
+    timer.now += 45
+
+    assert registry.get("run-1") is None
+    assert registry["run-2"] == ROUTE
+    assert registry.memory_bytes == memory
+
+
+def test_persists_runs_across_instances(tmp_path):
+    path = tmp_path / "runs.db"
+    registry = RunRegistry(persistence_path=path)
+    registry["run-1"] = RunRoute(provider_id="provider", replica=2)
+    registry.close()
+
+    registry = RunRegistry(persistence_path=path)
+    assert len(registry) == 0
+    assert registry["run-1"] == RunRoute(provider_id="provider", replica=2)
+    del registry["run-1"]
+    assert "run-1" not in registry
+    registry.close()
+
+
+@pytest.mark.asyncio
+async def test_batches_writes_and_refreshes_persisted_expiration(tmp_path):
+    path, timer = tmp_path / "runs.db", FakeTimer()
+    registry = RunRegistry(ttl=timedelta(minutes=1), persistence_path=path, timer=timer)
+    registry["run-1"] = ROUTE
+    assert RunRegistry(persistence_path=path, timer=timer).get("run-1") is None  # not flushed yet
+    await registry.flush()
+    timer.now += 50
+    assert registry["run-1"] == ROUTE
+    registry.close()
+
+    timer.now += 30  # expired if counted from creation
+    assert RunRegistry(ttl=timedelta(minutes=1), persistence_path=path, timer=timer)["run-1"] == ROUTE
@@ -0,0 +1,106 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import anyio
+import httpx
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from beeai_server.routes.acp import send_request
+from beeai_server.utils.fastapi import filter_hop_by_hop_headers
+
+NUM_EVENTS = 100
+
+
+@pytest_asyncio.fixture
+async def first_event_received():
+    return asyncio.Event()
+
+
+@pytest_asyncio.fixture
+async def upstream_url(first_event_received):
+    async def stream_events(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Connection": "keep-alive"})
+        await response.prepare(request)
+        await response.write(f"data: {json.dumps({'i': 0})}\n\n".encode())
+        # the rest of the stream is sent only once the proxy delivered the first event to the client
+        await asyncio.wait_for(first_event_received.wait(), timeout=5)
+        for i in range(1, NUM_EVENTS):
+            await response.write(f"data: {json.dumps({'i': i})}\n\n".encode())
+        await response.write_eof()
+        return response
+
+    async def large_body(request: web.Request) -> web.Response:
+        return web.json_response({"output": "x" * 5_000_000})
+
+    app = web.Application()
+    app.router.add_get("/events", stream_events)
+    app.router.add_get("/large", large_body)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    [port] = {sock.getsockname()[1] for sock in site._server.sockets}
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await runner.cleanup()
+
+
+@asynccontextmanager
+async def client_factory(base_url: str):
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        yield client
+
+
+async def run_asgi(response, on_chunk=None) -> tuple[dict, list[bytes]]:
+    chunks: list[bytes] = []
+    start_message = {}
+
+    async def receive():
+        await anyio.sleep_forever()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            start_message.update(message)
+        elif message.get("body"):
+            chunks.append(message["body"])
+            if on_chunk:
+                on_chunk(message["body"])
+
+    await response({"type": "http", "asgi": {"spec_version": "2.0"}}, receive, send)
+    return start_message, chunks
+
+
+@pytest.mark.asyncio
+async def test_sse_events_are_passed_through_as_they_arrive(upstream_url, first_event_received):
+    response = await send_request(client_factory(upstream_url), "GET", "/events")
+    _, chunks = await run_asgi(response, on_chunk=lambda chunk: first_event_received.set())
+
+    events = b"".join(chunks).split(b"\n\n")[:-1]
+    assert [json.loads(event.removeprefix(b"data: "))["i"] for event in events] == list(range(NUM_EVENTS))
+
+
+@pytest.mark.asyncio
+async def test_streams_large_body_without_hop_by_hop_headers(upstream_url):
+    response = await send_request(client_factory(upstream_url), "GET", "/large")
+    start_message, chunks = await run_asgi(response)
+
+    headers = dict(start_message["headers"])
+    body = b"".join(chunks)
+    assert len(chunks) > 1
+    assert int(headers[b"content-length"]) == len(body)
+    assert json.loads(body)["output"] == "x" * 5_000_000
+
+
+def test_filters_hop_by_hop_headers():
+    headers = [
+        (b"Content-Type", b"text/event-stream"),
+        (b"Transfer-Encoding", b"chunked"),
+        (b"Connection", b"keep-alive, X-Internal"),
+        (b"X-Internal", b"1"),
+        (b"Run-ID", b"123"),
+    ]
+    assert filter_hop_by_hop_headers(headers) == [(b"content-type", b"text/event-stream"), (b"run-id", b"123")]
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from beeai_server.adapters.filesystem import FilesystemProviderRepository, ProviderConfigFile
+from beeai_server.domain.provider.container import ProviderContainer
+from beeai_server.domain.provider.model import (
+    NetworkProviderSource,
+    ProviderManifest,
+    ProviderStatus,
+    UnmanagedProvider,
+)
+from beeai_server.schema import PaginatedResponse
+from beeai_server.services.provider import ProviderService
+
+
+@pytest.fixture
+def create_service(tmp_path, env_repository, create_provider):
+    async def create(num_providers: int) -> tuple[ProviderService, list[str]]:
+        providers = [create_provider(i) for i in range(num_providers)]
+        config_path = tmp_path / f"providers-{num_providers}.yaml"
+        # JSON is valid YAML and much faster to dump for a large config
+        config_path.write_text(json.dumps(ProviderConfigFile(providers=providers).model_dump(mode="json")))
+
+        container = ProviderContainer(env_repository=env_repository, autostart_providers=False)
+        for provider in providers[::10]:
+            await container.add(provider)
+        service = ProviderService(
+            provider_repository=FilesystemProviderRepository(config_path),
+            loaded_provider_container=container,
+            env_repository=env_repository,
+        )
+        return service, [provider.id for provider in providers]
+
+    return create
+
+
+@pytest.mark.asyncio
+async def test_get_provider_does_not_list_providers(create_service, monkeypatch):
+    service, ids = await create_service(num_providers=20)
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("get_provider listed all providers")
+
+    monkeypatch.setattr(service, "list_providers", fail)
+    monkeypatch.setattr(service._repository, "list", fail)
+
+    assert (await service.get_provider(ids[0])).status == "ready"  # unmanaged providers are ready once loaded
+    assert (await service.get_provider(ids[1])).status == "not_loaded"
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_updated_only_for_changed_providers(create_service):
+    service, ids = await create_service(num_providers=20)
+    container = service._loaded_provider_container
+    watch = (await service.watch_providers())()
+
+    first = await service.get_providers_snapshot()
+    reset = json.loads((await anext(watch)).data)
+    assert reset["reset"] and len(reset["updated"]) == 20
+    assert await service.get_providers_snapshot() is first
+
+    container.loaded_providers[ids[0]].status = ProviderStatus.error
+    second = await service.get_providers_snapshot()
+    assert second.etag != first.etag
+    assert second.providers[0].status == ProviderStatus.error
+    assert all(new is old for new, old in zip(second.providers[1:], first.providers[1:]))
+    assert json.loads(second.body) == PaginatedResponse(items=second.providers, total_count=20).model_dump(mode="json")
+
+    delta = await anext(watch)
+    assert delta.id == service._version_tag(second.version)
+    assert json.loads(delta.data) == {
+        "reset": False,
+        "updated": [second.providers[0].model_dump(mode="json")],
+        "removed": [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_watch_resets_clients_of_another_server_instance(create_service):
+    service, ids = await create_service(num_providers=3)
+    version = (await service.get_providers_snapshot()).version
+
+    # the same version issued by a previous server process must not be resumed with a partial delta
+    watch = (await service.watch_providers(last_event_id=f"previous-{version - 1}"))()
+    reset = json.loads((await anext(watch)).data)
+    assert reset["reset"] and [item["id"] for item in reset["updated"]] == ids
+
+
+@pytest.mark.asyncio
+async def test_watch_does_not_report_providers_added_after_the_snapshot_as_removed(create_service, monkeypatch):
+    service, _ = await create_service(num_providers=3)
+    container = service._loaded_provider_container
+    snapshot = await service.get_providers_snapshot()
+    new_provider = UnmanagedProvider(
+        manifest=ProviderManifest(agents=[{"name": "new-agent", "description": "test"}]),
+        source=NetworkProviderSource(location="http://new-provider.local:8000"),
+    )
+    get_snapshot = service.get_providers_snapshot
+
+    async def get_snapshot_and_add_provider():
+        result = await get_snapshot()
+        if new_provider.id not in container.loaded_providers:
+            await container.add(new_provider)  # the container moves past the snapshot before the delta is computed
+        return result
+
+    monkeypatch.setattr(service, "get_providers_snapshot", get_snapshot_and_add_provider)
+    watch = (await service.watch_providers(last_event_id=service._version_tag(snapshot.version)))()
+    delta = json.loads((await anext(watch)).data)
+    assert [item["id"] for item in delta["updated"]] == [new_provider.id]
+    assert delta["removed"] == []
@@ -1,7 +1,9 @@
+import os
+
 import pytest
 from pytest_httpx import HTTPXMock
 
-from beeai_server.utils.github import GithubUrl
+from beeai_server.utils.github import GithubUrl, create_tar_reproducible
 from beeai_server.utils.utils import filter_dict
 
 
@@ -64,3 +66,16 @@ async def test_resolve_version(httpx_mock: HTTPXMock):
 
     request = httpx_mock.get_request()
     assert str(request.url).startswith("https://github.com/my-org/my-repo/blob/-/")
+
+
+def test_create_tar_reproducible(tmp_path):
+    archives = []
+    for i, mtime in enumerate([1_000_000, 2_000_000]):
+        source = tmp_path / f"source-{i}"
+        (source / "agent").mkdir(parents=True)
+        for file in [source / "Dockerfile", source / "agent" / "main.py"]:
+            file.write_text(file.name)
+            os.utime(file, (mtime, mtime))
+        create_tar_reproducible(source, tmp_path / f"context-{i}.tar")
+        archives.append((tmp_path / f"context-{i}.tar").read_bytes())
+    assert archives[0] == archives[1]
@@ -0,0 +1,36 @@
+import pytest
+
+from beeai_server.utils.logs_container import LogGap, LogsContainer
+
+
+async def take(stream, count: int) -> list:
+    return [await anext(stream) for _ in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_gap_for_slow_subscriber():
+    logs_container = LogsContainer(max_lines=5)
+    for i in range(3):
+        logs_container.add_stdout(f"line {i}")
+
+    async with logs_container.stream() as stream:
+        [first] = await take(stream, 1)
+        assert (first.seq, first.message) == (0, "line 0")
+        for i in range(3, 12):
+            logs_container.add_stdout(f"line {i}")
+        gap, *records = await take(stream, 6)
+
+    assert gap == LogGap(seq=6, missed=6)
+    assert [record.message for record in records] == [f"line {i}" for i in range(7, 12)]
+
+
+@pytest.mark.asyncio
+async def test_stream_resumes_after_last_event_id():
+    logs_container = LogsContainer()
+    for i in range(5):
+        logs_container.add_stdout(f"line {i}")
+    logs_container.clear()
+    logs_container.add_stdout("line 5")
+
+    async with logs_container.stream(last_seq=2) as stream:
+        assert [record.message for record in await take(stream, 1)] == ["line 5"]